@@ -4,240 +4,94 @@ import streamlit as st
 import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
-import plotly.express as px
 import io
-from datetime import datetime
-import csv
-from io import StringIO
 import json
+from datetime import datetime
 
-# Executive Report Dependencies
-try:
-    from reportlab.lib import colors
-    from reportlab.lib.pagesizes import letter, A4
-    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak, Image
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import inch
-    from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT, TA_JUSTIFY
-    import matplotlib.pyplot as plt
-    from io import BytesIO
-    REPORT_DEPENDENCIES_AVAILABLE = True
-except ImportError:
-    REPORT_DEPENDENCIES_AVAILABLE = False
+from bva_cache import fingerprint
+from bva_config import (BENEFIT_INPUT_KEYS, CASH_FLOW_INPUT_KEYS, CURRENCY_SYMBOLS, INDUSTRY_TEMPLATES, INPUT_BOUNDS,
+                        INPUT_DESCRIPTIONS, INPUT_KEYS, MODEL_INPUT_KEYS, NPV_INPUT_KEYS, TIMELINE_INPUT_KEYS,
+                        YEARLY_INPUTS, YEARLY_SCHEDULE_KEYS, export_to_csv, export_to_json, get_default_value,
+                        parse_configuration_csv, parse_configuration_json, parse_yearly_schedule,
+                        validate_input_values)
+from bva_engine import (ASSESSMENT_CACHE, DEFAULT_SCENARIOS, benefit_realization_grid, define_scenarios,
+                        downside_scenario_name, format_payback, format_rate, reference_scenario_name, run_assessment_cached)
+from bva_goalseek import GOAL_SEEK_METRICS, solve_break_even, solve_break_even_columns
+from bva_portfolio import portfolio_table, portfolio_template_csv, score_portfolio
+from bva_profiler import RerunProfiler, activate, profiled_run, profiling_requested, stage
+from bva_report import REPORT_CACHE, REPORT_DEPENDENCIES_AVAILABLE, render_report_pdf
+from bva_sensitivity import SENSITIVITY_INPUTS, SWEEP_CACHE, run_parameter_sweep_cached, run_tornado, sweep_values
+from bva_simulation import DISTRIBUTIONS, SIMULATION_INPUTS, distribution_from_range, run_simulation, summarize_simulation
+from bva_store import SORT_ORDERS, AssessmentStore
 
 # Set page configuration
 st.set_page_config(page_title="Business Value Assessment Tool", layout="wide")
 
+# --- RERUN PROFILING (opt-in: open the app with ?profile=1 or set BVA_PROFILE=1) ---
+PROFILING = profiling_requested(st.query_params)
+
+def session_profiler():
+    """This session's rerun profiler, or None when profiling is off"""
+    return st.session_state.setdefault('rerun_profiler', RerunProfiler()) if PROFILING else None
+
+profiler = session_profiler()
+activate(profiler)
+if profiler:
+    profiler.start_run("rerun")
+    profiler.begin_stage("sidebar widgets", 'ui')
+
 # --- EXPORT/IMPORT FUNCTIONS ---
 
 def get_all_input_values():
     """Collect all input values from the current session state"""
     input_values = {}
     
-    # Get all the input keys from your existing inputs
-    input_keys = [
-        # Basic Configuration
-        'solution_name', 'industry_template', 'currency', 
-        
-        # Implementation Timeline
-        'implementation_delay', 'benefits_ramp_up',
-        
-        # Working Hours Configuration
-        'hours_per_day', 'days_per_week', 'weeks_per_year', 'holiday_sick_days',
-        
-        # Alert Management
-        'alert_volume', 'alert_ftes', 'avg_alert_triage_time', 'avg_alert_fte_salary',
-        'alert_reduction_pct', 'alert_triage_time_saved_pct',
-        
-        # Incident Management
-        'incident_volume', 'incident_ftes', 'avg_incident_triage_time', 'avg_incident_fte_salary',
-        'incident_reduction_pct', 'incident_triage_time_savings_pct',
-        
-        # Major Incidents
-        'major_incident_volume', 'avg_major_incident_cost', 'avg_mttr_hours', 'mttr_improvement_pct',
-        
-        # Additional Benefits
-        'tool_savings', 'people_efficiency', 'fte_avoidance', 'sla_penalty', 
-        'revenue_growth', 'capex_savings', 'opex_savings',
-        
-        # Costs
-        'platform_cost', 'services_cost',
-        
-        # Financial Settings
-        'evaluation_years', 'discount_rate'
-    ]
-    
     # Collect values from session state
-    for key in input_keys:
+    for key in INPUT_KEYS:
         if key in st.session_state:
             input_values[key] = st.session_state[key]
         else:
             # Fallback to default values if not in session state
             input_values[key] = get_default_value(key)
+
+    # An unreadable per-year schedule is ignored (the sidebar shows the error)
+    for key in YEARLY_SCHEDULE_KEYS:
+        try:
+            parse_yearly_schedule(input_values[key])
+        except ValueError:
+            input_values[key] = get_default_value(key)
     
     return input_values
 
-def get_default_value(key):
-    """Get default values for inputs"""
-    defaults = {
-        'solution_name': 'AIOPs',
-        'industry_template': 'Custom',
-        'currency': '$',
-        'implementation_delay': 6,
-        'benefits_ramp_up': 3,
-        'hours_per_day': 8.0,
-        'days_per_week': 5,
-        'weeks_per_year': 52,
-        'holiday_sick_days': 25,
-        'alert_volume': 0,
-        'alert_ftes': 0,
-        'avg_alert_triage_time': 0,
-        'avg_alert_fte_salary': 50000,
-        'alert_reduction_pct': 0,
-        'alert_triage_time_saved_pct': 0,
-        'incident_volume': 0,
-        'incident_ftes': 0,
-        'avg_incident_triage_time': 0,
-        'avg_incident_fte_salary': 50000,
-        'incident_reduction_pct': 0,
-        'incident_triage_time_savings_pct': 0,
-        'major_incident_volume': 0,
-        'avg_major_incident_cost': 0,
-        'avg_mttr_hours': 0.0,
-        'mttr_improvement_pct': 0,
-        'tool_savings': 0,
-        'people_efficiency': 0,
-        'fte_avoidance': 0,
-        'sla_penalty': 0,
-        'revenue_growth': 0,
-        'capex_savings': 0,
-        'opex_savings': 0,
-        'platform_cost': 0,
-        'services_cost': 0,
-        'evaluation_years': 3,
-        'discount_rate': 10
-    }
-    return defaults.get(key, 0)
+def apply_imported_values(imported_values):
+    """Validate an imported configuration against the input schema and apply it to the session in one update
 
-def export_to_csv(input_values):
-    """Export input values to CSV format"""
-    output = StringIO()
-    writer = csv.writer(output)
-    
-    # Write header
-    writer.writerow(['Parameter', 'Value', 'Description'])
-    
-    # Define parameter descriptions for better readability
-    descriptions = {
-        'solution_name': 'Solution Name',
-        'industry_template': 'Industry Template',
-        'currency': 'Currency Symbol',
-        'implementation_delay': 'Implementation Delay (months)',
-        'benefits_ramp_up': 'Benefits Ramp-up Period (months)',
-        'hours_per_day': 'Working Hours per Day',
-        'days_per_week': 'Working Days per Week',
-        'weeks_per_year': 'Working Weeks per Year',
-        'holiday_sick_days': 'Holiday + Sick Days per Year',
-        'alert_volume': 'Total Infrastructure Related Alerts per Year',
-        'alert_ftes': 'Total FTEs Managing Infrastructure Alerts',
-        'avg_alert_triage_time': 'Average Alert Triage Time (minutes)',
-        'avg_alert_fte_salary': 'Average Annual Salary per Alert Management FTE',
-        'alert_reduction_pct': '% Alert Reduction',
-        'alert_triage_time_saved_pct': '% Alert Triage Time Reduction',
-        'incident_volume': 'Total Infrastructure Related Incident Volumes per Year',
-        'incident_ftes': 'Total FTEs Managing Infrastructure Incidents',
-        'avg_incident_triage_time': 'Average Incident Triage Time (minutes)',
-        'avg_incident_fte_salary': 'Average Annual Salary per Incident Management FTE',
-        'incident_reduction_pct': '% Incident Reduction',
-        'incident_triage_time_savings_pct': '% Incident Triage Time Reduction',
-        'major_incident_volume': 'Total Infrastructure Related Major Incidents per Year (Sev1)',
-        'avg_major_incident_cost': 'Average Major Incident Cost per Hour',
-        'avg_mttr_hours': 'Average MTTR (hours)',
-        'mttr_improvement_pct': 'MTTR Improvement Percentage',
-        'tool_savings': 'Tool Consolidation Savings',
-        'people_efficiency': 'People Efficiency Gains',
-        'fte_avoidance': 'FTE Avoidance (annualized value)',
-        'sla_penalty': 'SLA Penalty Avoidance',
-        'revenue_growth': 'Revenue Growth',
-        'capex_savings': 'Capital Expenditure Savings',
-        'opex_savings': 'Operational Expenditure Savings',
-        'platform_cost': 'Annual Subscription Cost',
-        'services_cost': 'Implementation & Services (One-Time)',
-        'evaluation_years': 'Evaluation Period (Years)',
-        'discount_rate': 'NPV Discount Rate (%)'
-    }
-    
-    # Write data rows
-    for key, value in input_values.items():
-        description = descriptions.get(key, key.replace('_', ' ').title())
-        writer.writerow([key, value, description])
-    
-    return output.getvalue()
+    Nothing is applied when any field is invalid; keys outside the schema are ignored.
+    """
+    if not isinstance(imported_values, dict):
+        return False, "The file does not contain a configuration"
+    values, errors = validate_input_values(imported_values)
+    if errors:
+        return False, "Configuration not imported:\n" + "\n".join(f"- {message}" for message in errors.values())
+
+    st.session_state.update(values)
+    message = f"Successfully imported {len(set(imported_values) & set(values))} parameters"
+    ignored = sorted(set(imported_values) - set(values))
+    if ignored:
+        message += f" (ignored unknown parameters: {', '.join(map(str, ignored))})"
+    return True, message
 
 def import_from_csv(csv_content):
     """Import input values from CSV content and update session state"""
     try:
-        # Parse CSV content
-        reader = csv.DictReader(StringIO(csv_content))
-        imported_values = {}
-        
-        for row in reader:
-            key = row['Parameter']
-            value = row['Value']
-            
-            # Convert value to appropriate type
-            try:
-                # Try to convert to number first
-                if '.' in str(value):
-                    value = float(value)
-                else:
-                    value = int(value)
-            except (ValueError, TypeError):
-                # Keep as string if not a number
-                value = str(value)
-            
-            imported_values[key] = value
-        
-        # Update session state with imported values
-        for key, value in imported_values.items():
-            st.session_state[key] = value
-        
-        return True, f"Successfully imported {len(imported_values)} parameters"
-    
+        return apply_imported_values(parse_configuration_csv(csv_content))
     except Exception as e:
         return False, f"Error importing CSV: {str(e)}"
 
-def export_to_json(input_values):
-    """Export input values to JSON format"""
-    # Add metadata
-    export_data = {
-        'metadata': {
-            'export_date': datetime.now().isoformat(),
-            'version': '1.6',
-            'tool': 'BVA Business Value Assessment'
-        },
-        'configuration': input_values
-    }
-    return json.dumps(export_data, indent=2)
-
 def import_from_json(json_content):
     """Import input values from JSON content and update session state"""
     try:
-        data = json.loads(json_content)
-        
-        # Extract configuration data
-        if 'configuration' in data:
-            imported_values = data['configuration']
-        else:
-            # Assume the entire JSON is the configuration
-            imported_values = data
-        
-        # Update session state with imported values
-        for key, value in imported_values.items():
-            st.session_state[key] = value
-        
-        return True, f"Successfully imported {len(imported_values)} parameters"
-    
+        return apply_imported_values(parse_configuration_json(json_content))
     except Exception as e:
         return False, f"Error importing JSON: {str(e)}"
 
@@ -306,6 +160,69 @@ with st.sidebar.expander("📥 Import Configuration"):
         except Exception as e:
             st.error(f"Error reading file: {str(e)}")
 
+# Saved Assessments Section
+@st.cache_resource
+def assessment_store():
+    """Local SQLite store of saved assessments, shared by all sessions"""
+    return AssessmentStore()
+
+with st.sidebar.expander("💾 Saved Assessments"):
+    store = assessment_store()
+    st.write("Save the current inputs and results, or reopen a saved assessment.")
+    save_name = st.text_input("Assessment name", key="store_save_name")
+    save_customer = st.text_input("Customer", key="store_save_customer")
+    if st.button("Save Assessment"):
+        try:
+            store.save(save_name, save_customer, get_all_input_values())
+            st.success(f"Saved '{save_name.strip()}' for {save_customer.strip()}")
+        except ValueError as e:
+            st.error(str(e))
+
+    customers = store.distinct_values('customer')
+    if not customers:
+        st.caption("No saved assessments yet.")
+    else:
+        filter_customer = st.selectbox("Filter by customer", ["All"] + customers, key="store_filter_customer")
+        filter_template = st.selectbox("Filter by industry", ["All"] + store.distinct_values('industry_template'),
+                                       key="store_filter_template")
+        filter_currency = st.selectbox("Filter by currency", ["All"] + store.distinct_values('currency'),
+                                       key="store_filter_currency")
+        filter_since = st.date_input("Updated since", value=None, key="store_filter_since")
+        filter_search = st.text_input("Search names", key="store_filter_search")
+        sort_order = st.selectbox("Sort by", list(SORT_ORDERS), key="store_sort",
+                                  format_func=lambda order: order.replace('_', ' ').replace('npv', 'NPV').capitalize())
+        saved = store.list_assessments(
+            customer=None if filter_customer == "All" else filter_customer,
+            industry_template=None if filter_template == "All" else filter_template,
+            currency=None if filter_currency == "All" else filter_currency,
+            since=filter_since.isoformat() if filter_since else None,
+            search=filter_search or None,
+            order_by=sort_order
+        )
+        if not saved:
+            st.caption("No saved assessments match these filters.")
+        else:
+            st.dataframe(
+                pd.DataFrame(saved)[['customer', 'name', 'industry_template', 'expected_npv', 'updated_at']],
+                hide_index=True,
+                column_config={'expected_npv': st.column_config.NumberColumn("Expected NPV", format="localized")}
+            )
+            saved_by_id = {row['id']: row for row in saved}
+            selected_id = st.selectbox("Assessment", list(saved_by_id), key="store_selected",
+                                       format_func=lambda i: f"{saved_by_id[i]['customer']} - {saved_by_id[i]['name']}")
+            open_col, delete_col = st.columns(2)
+            if open_col.button("Open"):
+                loaded = store.load(selected_id)
+                success, message = apply_imported_values(loaded['inputs'])
+                if success:
+                    source = "recomputed for this model version" if loaded['recomputed'] else "saved results"
+                    st.success(f"Opened '{loaded['name']}' ({source})")
+                else:
+                    st.error(message)
+            if delete_col.button("Delete"):
+                store.delete(selected_id)
+                st.rerun()
+
 st.sidebar.markdown("---")
 
 # --- Sidebar Inputs ---
@@ -330,66 +247,12 @@ benefits_ramp_up_months = st.sidebar.slider(
 )
 
 # --- Industry Benchmark Templates ---
-industry_templates = {
-    "Custom": {},
-    "Financial Services": {
-        "alert_volume": 1_200_000,
-        "major_incident_volume": 140,
-        "avg_alert_triage_time": 25,
-        "alert_reduction_pct": 40,
-        "incident_volume": 400_000,
-        "avg_incident_triage_time": 30,
-        "incident_reduction_pct": 40,
-        "mttr_improvement_pct": 40
-    },
-    "Retail": {
-        "alert_volume": 600_000,
-        "major_incident_volume": 80,
-        "avg_alert_triage_time": 20,
-        "alert_reduction_pct": 30,
-        "incident_volume": 200_000,
-        "avg_incident_triage_time": 25,
-        "incident_reduction_pct": 30,
-        "mttr_improvement_pct": 30
-    },
-    "MSP": {
-        "alert_volume": 2_500_000,
-        "major_incident_volume": 200,
-        "avg_alert_triage_time": 35,
-        "alert_reduction_pct": 50,
-        "incident_volume": 800_000,
-        "avg_incident_triage_time": 35,
-        "incident_reduction_pct": 50,
-        "mttr_improvement_pct": 50
-    },
-    "Healthcare": {
-        "alert_volume": 800_000,
-        "major_incident_volume": 100,
-        "avg_alert_triage_time": 30,
-        "alert_reduction_pct": 35,
-        "incident_volume": 300_000,
-        "avg_incident_triage_time": 30,
-        "incident_reduction_pct": 35,
-        "mttr_improvement_pct": 35
-    },
-    "Telecom": {
-        "alert_volume": 1_800_000,
-        "major_incident_volume": 160,
-        "avg_alert_triage_time": 35,
-        "alert_reduction_pct": 45,
-        "incident_volume": 600_000,
-        "avg_incident_triage_time": 35,
-        "incident_reduction_pct": 40,
-        "mttr_improvement_pct": 45
-    }
-}
-
-selected_template = st.sidebar.selectbox("Select Industry Template", list(industry_templates.keys()), key="industry_template")
-template = industry_templates[selected_template]
+selected_template = st.sidebar.selectbox("Select Industry Template", list(INDUSTRY_TEMPLATES.keys()), key="industry_template")
+template = INDUSTRY_TEMPLATES[selected_template]
 st.sidebar.caption("📌 Industry templates provide baseline values for estimation only. Adjust any field as needed.")
 
 # --- Currency Selection ---
-currency_symbol = st.sidebar.selectbox("Currency", ["$", "€", "£", "Kč"], key="currency")
+currency_symbol = st.sidebar.selectbox("Currency", CURRENCY_SYMBOLS, key="currency")
 
 # --- Working Hours Configuration ---
 st.sidebar.subheader("⏰ Working Hours Configuration")
@@ -437,21 +300,25 @@ st.sidebar.subheader("🚨 Alert Management")
 alert_volume = st.sidebar.number_input(
     "Total Infrastructure Related Alerts Managed per Year", 
     value=template.get("alert_volume", 0),
+    min_value=0,
     key="alert_volume"
 )
 alert_ftes = st.sidebar.number_input(
     "Total FTEs Managing Infrastructure Alerts", 
     value=0,
+    min_value=0,
     key="alert_ftes"
 )
 avg_alert_triage_time = st.sidebar.number_input(
     "Average Alert Triage Time (minutes)", 
     value=template.get("avg_alert_triage_time", 0),
+    min_value=0,
     key="avg_alert_triage_time"
 )
 avg_alert_fte_salary = st.sidebar.number_input(
     "Average Annual Salary per Alert Management FTE", 
     value=50000,
+    min_value=0,
     key="avg_alert_fte_salary"
 )
 alert_reduction_pct = st.sidebar.slider(
@@ -471,21 +338,25 @@ st.sidebar.subheader("🔧 Incident Management")
 incident_volume = st.sidebar.number_input(
     "Total Infrastructure Related Incident Volumes Managed per Year", 
     value=template.get("incident_volume", 0),
+    min_value=0,
     key="incident_volume"
 )
 incident_ftes = st.sidebar.number_input(
     "Total FTEs Managing Infrastructure Incidents", 
     value=0,
+    min_value=0,
     key="incident_ftes"
 )
 avg_incident_triage_time = st.sidebar.number_input(
     "Average Incident Triage Time (minutes)", 
     value=template.get("avg_incident_triage_time", 0),
+    min_value=0,
     key="avg_incident_triage_time"
 )
 avg_incident_fte_salary = st.sidebar.number_input(
     "Average Annual Salary per Incident Management FTE", 
     value=50000,
+    min_value=0,
     key="avg_incident_fte_salary"
 )
 incident_reduction_pct = st.sidebar.slider(
@@ -505,16 +376,19 @@ st.sidebar.subheader("🚨 Major Incidents (Sev1)")
 major_incident_volume = st.sidebar.number_input(
     "Total Infrastructure Related Major Incidents per Year (Sev1)", 
     value=template.get("major_incident_volume", 0),
+    min_value=0,
     key="major_incident_volume"
 )
 avg_major_incident_cost = st.sidebar.number_input(
     "Average Major Incident Cost per Hour", 
     value=0,
+    min_value=0,
     key="avg_major_incident_cost"
 )
 avg_mttr_hours = st.sidebar.number_input(
     "Average MTTR (hours)", 
     value=0.0,
+    min_value=0.0,
     key="avg_mttr_hours"
 )
 mttr_improvement_pct = st.sidebar.slider(
@@ -529,36 +403,43 @@ st.sidebar.subheader("💰 Additional Benefits")
 tool_savings = st.sidebar.number_input(
     "Tool Consolidation Savings", 
     value=0,
+    min_value=0,
     key="tool_savings"
 )
 people_cost_per_year = st.sidebar.number_input(
     "People Efficiency Gains", 
     value=0,
+    min_value=0,
     key="people_efficiency"
 )
 fte_avoidance = st.sidebar.number_input(
     "FTE Avoidance (annualized value in local currency)", 
     value=0,
+    min_value=0,
     key="fte_avoidance"
 )
 sla_penalty_avoidance = st.sidebar.number_input(
     "SLA Penalty Avoidance (Service Providers)", 
     value=0,
+    min_value=0,
     key="sla_penalty"
 )
 revenue_growth = st.sidebar.number_input(
     "Revenue Growth (Service Providers)", 
     value=0,
+    min_value=0,
     key="revenue_growth"
 )
 capex_savings = st.sidebar.number_input(
     "Capital Expenditure Savings (Hardware)", 
     value=0,
+    min_value=0,
     key="capex_savings"
 )
 opex_savings = st.sidebar.number_input(
     "Operational Expenditure Savings (e.g. Storage Costs)", 
     value=0,
+    min_value=0,
     key="opex_savings"
 )
 
@@ -567,11 +448,13 @@ st.sidebar.subheader("💳 Solution Costs")
 platform_cost = st.sidebar.number_input(
     "Annual Subscription Cost (After discounts)", 
     value=0,
+    min_value=0,
     key="platform_cost"
 )
 services_cost = st.sidebar.number_input(
     "Implementation & Services (One-Time)", 
     value=0,
+    min_value=0,
     key="services_cost"
 )
 
@@ -579,7 +462,7 @@ services_cost = st.sidebar.number_input(
 st.sidebar.subheader("📊 Financial Analysis Settings")
 evaluation_years = st.sidebar.slider(
     "Evaluation Period (Years)", 
-    1, 5, 3,
+    1, 15, 3,
     key="evaluation_years"
 )
 discount_rate = st.sidebar.slider(
@@ -587,276 +470,155 @@ discount_rate = st.sidebar.slider(
     0, 20, 10,
     key="discount_rate"
 ) / 100
-
-# --- CORRECTED CALCULATIONS WITH CONFIGURABLE WORKING HOURS ---
-
-# Function to calculate alert costs based on FTE time allocation
-def calculate_alert_costs(alert_volume, alert_ftes, avg_alert_triage_time, avg_salary_per_year, 
-                         hours_per_day, days_per_week, weeks_per_year, holiday_sick_days):
-    """Calculate the true cost per alert based on FTE time allocation"""
-    if alert_volume == 0 or alert_ftes == 0:
-        return 0, 0, 0, 0
-    
-    total_alert_time_minutes_per_year = alert_volume * avg_alert_triage_time
-    total_alert_time_hours_per_year = total_alert_time_minutes_per_year / 60
-    
-    total_working_days = (weeks_per_year * days_per_week) - holiday_sick_days
-    working_hours_per_fte_per_year = total_working_days * hours_per_day
-    total_available_fte_hours = alert_ftes * working_hours_per_fte_per_year
-    
-    fte_time_percentage_on_alerts = total_alert_time_hours_per_year / total_available_fte_hours if total_available_fte_hours > 0 else 0
-    
-    total_fte_cost = alert_ftes * avg_salary_per_year
-    total_alert_handling_cost = total_fte_cost * fte_time_percentage_on_alerts
-    cost_per_alert = total_alert_handling_cost / alert_volume if alert_volume > 0 else 0
-    
-    return cost_per_alert, total_alert_handling_cost, fte_time_percentage_on_alerts, working_hours_per_fte_per_year
-
-# Function to calculate incident costs based on FTE time allocation
-def calculate_incident_costs(incident_volume, incident_ftes, avg_incident_triage_time, avg_salary_per_year,
-                           hours_per_day, days_per_week, weeks_per_year, holiday_sick_days):
-    """Calculate the true cost per incident based on FTE time allocation"""
-    if incident_volume == 0 or incident_ftes == 0:
-        return 0, 0, 0, 0
-    
-    total_incident_time_minutes_per_year = incident_volume * avg_incident_triage_time
-    total_incident_time_hours_per_year = total_incident_time_minutes_per_year / 60
-    
-    total_working_days = (weeks_per_year * days_per_week) - holiday_sick_days
-    working_hours_per_fte_per_year = total_working_days * hours_per_day
-    total_available_fte_hours = incident_ftes * working_hours_per_fte_per_year
-    
-    fte_time_percentage_on_incidents = total_incident_time_hours_per_year / total_available_fte_hours if total_available_fte_hours > 0 else 0
-    
-    total_fte_cost = incident_ftes * avg_salary_per_year
-    total_incident_handling_cost = total_fte_cost * fte_time_percentage_on_incidents
-    cost_per_incident = total_incident_handling_cost / incident_volume if incident_volume > 0 else 0
-    
-    return cost_per_incident, total_incident_handling_cost, fte_time_percentage_on_incidents, working_hours_per_fte_per_year
-
-# Calculate alert and incident costs
-cost_per_alert, total_alert_handling_cost, alert_fte_percentage, alert_working_hours = calculate_alert_costs(
-    alert_volume, alert_ftes, avg_alert_triage_time, avg_alert_fte_salary,
-    hours_per_day, days_per_week, weeks_per_year, holiday_sick_days
-)
-
-cost_per_incident, total_incident_handling_cost, incident_fte_percentage, incident_working_hours = calculate_incident_costs(
-    incident_volume, incident_ftes, avg_incident_triage_time, avg_incident_fte_salary,
-    hours_per_day, days_per_week, weeks_per_year, holiday_sick_days
+mid_period_discounting = st.sidebar.radio(
+    "NPV Cash Flow Timing",
+    [0, 1],
+    format_func=lambda value: ["End of month", "Mid-month"][value],
+    horizontal=True,
+    help="Monthly cash flows are discounted at the effective monthly rate, from the end or the middle of each month",
+    key="mid_period_discounting"
 )
 
-# Calculate baseline savings
-avoided_alerts = alert_volume * (alert_reduction_pct / 100)
-remaining_alerts = alert_volume - avoided_alerts
-alert_reduction_savings = avoided_alerts * cost_per_alert
-remaining_alert_handling_cost = remaining_alerts * cost_per_alert
-alert_triage_savings = remaining_alert_handling_cost * (alert_triage_time_saved_pct / 100)
-
-avoided_incidents = incident_volume * (incident_reduction_pct / 100)
-remaining_incidents = incident_volume - avoided_incidents
-incident_reduction_savings = avoided_incidents * cost_per_incident
-remaining_incident_handling_cost = remaining_incidents * cost_per_incident
-incident_triage_savings = remaining_incident_handling_cost * (incident_triage_time_savings_pct / 100)
-
-mttr_hours_saved_per_incident = (mttr_improvement_pct / 100) * avg_mttr_hours
-total_mttr_hours_saved = major_incident_volume * mttr_hours_saved_per_incident
-major_incident_savings = total_mttr_hours_saved * avg_major_incident_cost
-
-# Total Annual Benefits (baseline)
-total_annual_benefits = (
-    alert_reduction_savings + alert_triage_savings + incident_reduction_savings +
-    incident_triage_savings + major_incident_savings + tool_savings + people_cost_per_year +
-    fte_avoidance + sla_penalty_avoidance + revenue_growth + capex_savings + opex_savings
-)
-
-# --- Implementation Delay Functions ---
-def calculate_benefit_realization_factor(month, implementation_delay_months, ramp_up_months):
-    """Calculate what percentage of benefits are realized in a given month"""
-    if month <= implementation_delay_months:
-        return 0.0  # No benefits during implementation
-    elif month <= implementation_delay_months + ramp_up_months:
-        # Linear ramp-up during ramp-up period
-        months_since_golive = month - implementation_delay_months
-        return months_since_golive / ramp_up_months
-    else:
-        return 1.0  # Full benefits realized
-
-def calculate_scenario_results(benefits_multiplier, implementation_delay_multiplier, scenario_name):
-    """Calculate NPV, ROI, and payback for a given scenario"""
-    # Adjust benefits and timeline
-    scenario_benefits = total_annual_benefits * benefits_multiplier
-    scenario_impl_delay = max(0, int(implementation_delay_months * implementation_delay_multiplier)) # Ensure not negative
-    scenario_ramp_up = benefits_ramp_up_months
-    
-    # Calculate cash flows
-    scenario_cash_flows = []
-    for year in range(1, evaluation_years + 1):
-        year_start_month = (year - 1) * 12 + 1
-        year_end_month = year * 12
-        
-        monthly_factors = []
-        for month in range(year_start_month, year_end_month + 1):
-            factor = calculate_benefit_realization_factor(month, scenario_impl_delay, scenario_ramp_up)
-            monthly_factors.append(factor)
-        
-        avg_realization_factor = np.mean(monthly_factors)
-        year_benefits = scenario_benefits * avg_realization_factor
-        year_platform_cost = platform_cost
-        year_services_cost = services_cost if year == 1 else 0
-        year_net_cash_flow = year_benefits - year_platform_cost - year_services_cost
-        
-        scenario_cash_flows.append({
-            'year': year,
-            'benefits': year_benefits,
-            'platform_cost': year_platform_cost,
-            'services_cost': year_services_cost,
-            'net_cash_flow': year_net_cash_flow,
-            'realization_factor': avg_realization_factor
-        })
-    
-    # Calculate metrics
-    scenario_npv = sum([cf['net_cash_flow'] / ((1 + discount_rate) ** cf['year']) for cf in scenario_cash_flows])
-    scenario_tco = sum([cf['platform_cost'] + cf['services_cost'] for cf in scenario_cash_flows])
-    scenario_roi = scenario_npv / scenario_tco if scenario_tco != 0 else 0
-    
-    # Calculate payback
-    scenario_payback = "N/A"
-    cumulative_net_cash_flow = 0
-    for cf in scenario_cash_flows:
-        cumulative_net_cash_flow += cf['net_cash_flow']
-        if cumulative_net_cash_flow >= 0:
-            scenario_payback = f"{cf['year']} years"
-            break
-    
-    return {
-        'npv': scenario_npv,
-        'roi': scenario_roi,
-        'payback': scenario_payback,
-        'impl_delay': scenario_impl_delay,
-        'benefits_mult': benefits_multiplier,
-        'cash_flows': scenario_cash_flows,
-        'annual_benefits': scenario_benefits
-    }
-
-# Calculate scenarios
-scenarios = {
-    "Conservative": {
-        "benefits_multiplier": 0.7,  # 30% lower benefits
-        "implementation_delay_multiplier": 1.3,  # 30% longer implementation
-        "description": "Benefits 30% lower, implementation 30% longer",
-        "color": "#ff6b6b",
-        "icon": "🔴"
-    },
-    "Expected": {
-        "benefits_multiplier": 1.0,  # Baseline
-        "implementation_delay_multiplier": 1.0,  # Baseline
-        "description": "Baseline assumptions as entered",
-        "color": "#4ecdc4",
-        "icon": "🟢"
-    },
-    "Optimistic": {
-        "benefits_multiplier": 1.2,  # 20% higher benefits
-        "implementation_delay_multiplier": 0.8,  # 20% faster implementation
-        "description": "Benefits 20% higher, implementation 20% faster",
-        "color": "#45b7d1",
-        "icon": "🔵"
-    }
+# Multi-year assumptions: yearly growth rates, or explicit per-year values
+with st.sidebar.expander("📈 Multi-Year Assumptions"):
+    st.caption("Inputs above are year 1 values. Each grows by its yearly rate from year 2 on, "
+               "unless per-year values are given (the last value continues for later years).")
+    for growth_key in dict.fromkeys(growth_key for growth_key, _ in YEARLY_INPUTS.values()):
+        st.number_input(
+            INPUT_DESCRIPTIONS[growth_key],
+            min_value=INPUT_BOUNDS[growth_key][0],
+            max_value=INPUT_BOUNDS[growth_key][1],
+            value=0.0,
+            step=0.5,
+            key=growth_key
+        )
+    for schedule_key in YEARLY_SCHEDULE_KEYS:
+        schedule = st.text_input(
+            INPUT_DESCRIPTIONS[schedule_key],
+            value="",
+            placeholder="e.g. 100000, 120000, 150000",
+            key=schedule_key
+        )
+        try:
+            parse_yearly_schedule(schedule)
+        except ValueError as e:
+            st.error(f"{e} - ignored")
+
+# Scenario Definitions
+SCENARIO_EDITOR_COLUMNS = {
+    'name': st.column_config.TextColumn("Scenario", required=True),
+    'benefits_multiplier': st.column_config.NumberColumn("Benefits ×", min_value=0.0, step=0.05, required=True),
+    'implementation_delay_multiplier': st.column_config.NumberColumn("Implementation ×", min_value=0.0, step=0.05,
+                                                                     required=True),
+    'ramp_up_months': st.column_config.NumberColumn("Ramp-up (months)", min_value=0, step=1,
+                                                    help="Leave blank to use the Benefits Ramp-up input"),
+    'platform_cost': st.column_config.NumberColumn("Subscription Cost", min_value=0, format="localized",
+                                                   help="Leave blank to use the Annual Subscription Cost input"),
+    'services_cost': st.column_config.NumberColumn("Services Cost", min_value=0, format="localized",
+                                                   help="Leave blank to use the Professional Services Cost input"),
+    'description': st.column_config.TextColumn("Description")
 }
 
-scenario_results = {}
-for scenario_name, params in scenarios.items():
-    scenario_results[scenario_name] = calculate_scenario_results(
-        params["benefits_multiplier"], 
-        params["implementation_delay_multiplier"],
-        scenario_name
-    )
-    scenario_results[scenario_name].update({
-        "color": params["color"],
-        "description": params["description"],
-        "icon": params["icon"]
-    })
-
-# --- NEW FUNCTIONALITY ADDITIONS ---
-
-# 1. Calculate the total cost savings from alert and incident management
-total_operational_savings_from_time_saved = (
-    alert_reduction_savings + alert_triage_savings +
-    incident_reduction_savings + incident_triage_savings +
-    major_incident_savings
-)
-
-# 2. Determine the equivalent number of full-time employees (FTEs) from savings
-effective_avg_fte_salary = 0
-if avg_alert_fte_salary > 0 and avg_incident_fte_salary > 0:
-    effective_avg_fte_salary = (avg_alert_fte_salary + avg_incident_fte_salary) / 2
-elif avg_alert_fte_salary > 0:
-    effective_avg_fte_salary = avg_alert_fte_salary
-elif avg_incident_fte_salary > 0:
-    effective_avg_fte_salary = avg_incident_fte_salary
-
-equivalent_ftes_from_savings = 0
-if effective_avg_fte_salary > 0:
-    equivalent_ftes_from_savings = total_operational_savings_from_time_saved / effective_avg_fte_salary
-
-# 3. Payback Periods in Months (More granular calculation)
-
-def calculate_payback_months(annual_benefits, annual_platform_cost, one_time_services_cost, 
-                             implementation_delay_months, benefits_ramp_up_months, max_months_eval=60):
-    """Calculates the payback period in months."""
-    
-    cumulative_cash_flow = 0
-    payback_month = "N/A"
-    
-    # Initial investment (services cost) incurred at the beginning
-    cumulative_cash_flow -= one_time_services_cost
-
-    for month in range(1, max_months_eval + 1):
-        factor = calculate_benefit_realization_factor(month, implementation_delay_months, benefits_ramp_up_months)
-        
-        monthly_benefit = (annual_benefits / 12) * factor
-        monthly_platform_cost = annual_platform_cost / 12
-        
-        monthly_net_cash_flow = monthly_benefit - monthly_platform_cost
-        
-        cumulative_cash_flow += monthly_net_cash_flow
-        
-        if cumulative_cash_flow >= 0:
-            payback_month = f"{month} months"
-            break
-            
-    return payback_month
+def scenario_editor_rows(scenarios):
+    """One editor row per scenario (blank override cells use the sidebar inputs)"""
+    return pd.DataFrame([
+        {'name': name, 'description': params.get('description'),
+         **{key: params.get(key) for key in SCENARIO_EDITOR_COLUMNS if key not in ('name', 'description')}}
+        for name, params in scenarios.items()
+    ], columns=list(SCENARIO_EDITOR_COLUMNS))
+
+with st.sidebar.expander("🎯 Scenarios"):
+    st.caption("Add, remove or edit scenarios. Every scenario is evaluated in the same vectorized pass, "
+               "so many scenarios cost about as much as three.")
+    edited_scenarios = st.data_editor(scenario_editor_rows(DEFAULT_SCENARIOS), num_rows="dynamic", hide_index=True,
+                                      column_config=SCENARIO_EDITOR_COLUMNS, key="scenario_editor")
+    try:
+        scenarios = define_scenarios(
+            (row['name'], {key: None if pd.isna(value) else value for key, value in row.items()})
+            for row in edited_scenarios.to_dict('records')
+        )
+    except ValueError as e:
+        st.error(f"{e}. Using the default scenarios.")
+        scenarios = DEFAULT_SCENARIOS
+
+with st.sidebar.expander("⚙️ Cache Statistics"):
+    st.caption("Results, charts and reports are reused across reruns and sessions while their inputs are unchanged.")
+    cache_stats_placeholder = st.empty()
+
+if profiler:
+    with st.sidebar.expander("🛠️ Rerun Profile"):
+        st.caption("Time spent in each stage of the last full rerun. The trace also covers panel (fragment) reruns.")
+        profile_placeholder = st.empty()
+    profiler.end_stage("sidebar widgets")
+
+# --- CALCULATIONS (headless engine in bva_engine.py) ---
+current_input_values = get_all_input_values()
+
+# Served from the fingerprint-keyed model cache when the inputs are unchanged
+with stage("model: assessment", 'model'):
+    assessment = run_assessment_cached(current_input_values, scenarios)
+benefits = assessment['benefits']
+scenario_results = assessment['scenario_results']
+# Headline and downside cases: Expected and Conservative when defined (see bva_engine)
+reference_scenario = reference_scenario_name(scenario_results)
+downside_scenario = downside_scenario_name(scenario_results)
+
+cost_per_alert = benefits['cost_per_alert']
+total_alert_handling_cost = benefits['total_alert_handling_cost']
+alert_fte_percentage = benefits['alert_fte_percentage']
+cost_per_incident = benefits['cost_per_incident']
+total_incident_handling_cost = benefits['total_incident_handling_cost']
+alert_reduction_savings = benefits['alert_reduction_savings']
+alert_triage_savings = benefits['alert_triage_savings']
+incident_reduction_savings = benefits['incident_reduction_savings']
+incident_triage_savings = benefits['incident_triage_savings']
+major_incident_savings = benefits['major_incident_savings']
+total_annual_benefits = benefits['total_annual_benefits']
+total_operational_savings_from_time_saved = benefits['total_operational_savings_from_time_saved']
+effective_avg_fte_salary = benefits['effective_avg_fte_salary']
+equivalent_ftes_from_savings = benefits['equivalent_ftes_from_savings']
+
+# --- SECTION-SCOPED RERUNS ---
+# Each page section declares the inputs it reads. Its content (text, tables, figures) is kept per
+# session and rebuilt only when one of those inputs changed, so e.g. a discount rate change rebuilds
+# only the NPV-dependent sections. Panels with their own widgets run as fragments (st.fragment),
+# so using them reruns only that panel.
+SECTION_DEPENDENCIES = {
+    'key_metrics': NPV_INPUT_KEYS + ['currency'],
+    'value_reallocation': BENEFIT_INPUT_KEYS + ['currency'],
+    'scenario_tabs': NPV_INPUT_KEYS + ['currency'],
+    'monthly_cash_flow_chart': CASH_FLOW_INPUT_KEYS + ['currency'],
+    'timeline_chart': TIMELINE_INPUT_KEYS + BENEFIT_INPUT_KEYS + ['currency'],
+    'calculations': BENEFIT_INPUT_KEYS + ['currency'],
+    'stakeholders': NPV_INPUT_KEYS + ['currency', 'solution_name']
+}
 
-# Update scenario results with monthly payback for each scenario
-for scenario_name, params in scenarios.items():
-    s_result = scenario_results[scenario_name]
-    
-    scenario_annual_benefits_for_payback = total_annual_benefits * params["benefits_multiplier"]
-    scenario_impl_delay_for_payback = max(0, int(implementation_delay_months * params["implementation_delay_multiplier"]))
-    
-    s_result['payback_months'] = calculate_payback_months(
-        annual_benefits=scenario_annual_benefits_for_payback,
-        annual_platform_cost=platform_cost,
-        one_time_services_cost=services_cost,
-        implementation_delay_months=scenario_impl_delay_for_payback,
-        benefits_ramp_up_months=benefits_ramp_up_months,
-        max_months_eval=evaluation_years * 12
-    )
+rebuilt_sections = []
 
-# --- END OF NEW FUNCTIONALITY ADDITIONS ---
+def section_content(section, build):
+    """Return a section's content, calling build() only when one of its declared inputs changed"""
+    section_key = fingerprint({
+        'inputs': {key: current_input_values[key] for key in SECTION_DEPENDENCIES[section]},
+        'scenarios': scenarios
+    })
+    section_cache = st.session_state.setdefault('section_cache', {})
+    if section not in section_cache or section_cache[section][0] != section_key:
+        with stage(f"section: {section}", 'section'):
+            section_cache[section] = (section_key, build())
+        rebuilt_sections.append(section)
+    return section_cache[section][1]
 
 
-def create_implementation_timeline_chart(implementation_delay_months, ramp_up_months, evaluation_years, currency_symbol, total_annual_benefits):
+def create_implementation_timeline_chart(implementation_delay_months, ramp_up_months, evaluation_years, currency_symbol, total_annual_benefits,
+                                         realization_factors=None):
     """Create a visual timeline showing benefit realization over time"""
     
     total_months = evaluation_years * 12
-    months = list(range(1, total_months + 1))
-    realization_factors = []
-    monthly_benefits = []
-    
-    for month in months:
-        factor = calculate_benefit_realization_factor(month, implementation_delay_months, ramp_up_months)
-        realization_factors.append(factor * 100)
-        monthly_benefits.append(total_annual_benefits * factor / 12)
+    months = np.arange(1, total_months + 1)
+    if realization_factors is None:
+        realization_factors = benefit_realization_grid(implementation_delay_months, ramp_up_months, total_months)
+    monthly_benefits = total_annual_benefits * realization_factors / 12
+    realization_factors = realization_factors * 100
     
     fig = go.Figure()
     
@@ -868,7 +630,7 @@ def create_implementation_timeline_chart(implementation_delay_months, ramp_up_mo
     ))
     
     fig.add_trace(go.Scatter(
-        x=months, y=[b/1000 for b in monthly_benefits], mode='lines', name=f'Monthly Benefits ({currency_symbol}K)',
+        x=months, y=monthly_benefits / 1000, mode='lines', name=f'Monthly Benefits ({currency_symbol}K)',
         line=dict(color='#A23B72', width=2), fill='tonexty', fillcolor='rgba(162, 59, 114, 0.2)',
         hovertemplate='<b>Month %{x}</b><br>' + f'Monthly Benefit: {currency_symbol}' + '%{customdata:,.0f}<br><extra></extra>',
         customdata=monthly_benefits, yaxis='y2'
@@ -915,313 +677,6 @@ def create_implementation_timeline_chart(implementation_delay_months, ramp_up_mo
     
     return fig
 
-# --- EXECUTIVE REPORT GENERATOR FUNCTIONS ---
-
-def create_executive_summary_data(scenario_results, currency_symbol):
-    """Create data structure for executive summary"""
-    return {
-        'investment_summary': {
-            'conservative_npv': scenario_results['Conservative']['npv'],
-            'expected_npv': scenario_results['Expected']['npv'],
-            'optimistic_npv': scenario_results['Optimistic']['npv'],
-            'expected_roi': scenario_results['Expected']['roi'],
-            'payback_period': scenario_results['Expected']['payback'],
-            'currency': currency_symbol,
-            'expected_payback_months': scenario_results['Expected']['payback_months']
-        },
-        'key_benefits': {
-            'alert_reduction_savings': alert_reduction_savings,
-            'alert_triage_savings': alert_triage_savings,
-            'incident_reduction_savings': incident_reduction_savings,
-            'incident_triage_savings': incident_triage_savings,
-            'major_incident_savings': major_incident_savings,
-            'total_operational_savings': alert_reduction_savings + alert_triage_savings + incident_reduction_savings + incident_triage_savings + major_incident_savings,
-            'additional_benefits': tool_savings + people_cost_per_year + fte_avoidance + revenue_growth
-        },
-        'implementation': {
-            'delay_months': implementation_delay_months,
-            'ramp_up_months': benefits_ramp_up_months,
-            'full_benefits_month': implementation_delay_months + benefits_ramp_up_months,
-            'evaluation_years': evaluation_years
-        },
-        'reallocation_and_fte': {
-            'total_cost_savings_for_reallocation': total_operational_savings_from_time_saved,
-            'equivalent_ftes_from_savings': equivalent_ftes_from_savings
-        }
-    }
-
-def create_timeline_chart_for_pdf():
-    """Create implementation timeline chart for PDF"""
-    if not REPORT_DEPENDENCIES_AVAILABLE:
-        return None
-        
-    fig, ax = plt.subplots(figsize=(10, 4))
-    
-    # Timeline data
-    phases = ['Implementation', 'Ramp-up', 'Full Benefits']
-    starts = [0, implementation_delay_months, implementation_delay_months + benefits_ramp_up_months]
-    durations = [implementation_delay_months, benefits_ramp_up_months, max(0, (evaluation_years*12) - (implementation_delay_months + benefits_ramp_up_months))]
-    colors_list = ['#ff6b6b', '#ffa500', '#4ecdc4']
-    
-    # Create Gantt chart
-    for i, (phase, start, duration, color) in enumerate(zip(phases, starts, durations, colors_list)):
-        if duration > 0:
-            ax.barh(i, duration, left=start, height=0.6, color=color, alpha=0.7, label=phase)
-            ax.text(start + duration/2, i, phase, ha='center', va='center', fontweight='bold', fontsize=10)
-    
-    ax.set_ylim(-0.5, len(phases) - 0.5)
-    ax.set_xlim(0, evaluation_years * 12)
-    ax.set_xlabel('Months from Project Start', fontsize=12)
-    ax.set_title('Implementation Timeline & Benefit Realization', fontsize=14, fontweight='bold')
-    ax.grid(axis='x', alpha=0.3)
-    
-    # Remove y-axis labels
-    ax.set_yticks([])
-    
-    plt.tight_layout()
-    
-    # Save to BytesIO
-    img_buffer = BytesIO()
-    plt.savefig(img_buffer, format='png', dpi=300, bbox_inches='tight')
-    img_buffer.seek(0)
-    plt.close()
-    
-    return img_buffer
-
-def create_scenario_chart_for_pdf(scenario_results, currency_symbol):
-    """Create scenario comparison chart for PDF"""
-    if not REPORT_DEPENDENCIES_AVAILABLE:
-        return None
-        
-    fig, ax = plt.subplots(figsize=(10, 6))
-    
-    scenarios_list = list(scenario_results.keys())
-    npvs = [scenario_results[scenario]['npv'] for scenario in scenarios_list]
-    colors_list = ['#ff6b6b', '#4ecdc4', '#45b7d1']
-    
-    bars = ax.bar(scenarios_list, npvs, color=colors_list, alpha=0.8)
-    
-    # Add value labels on bars
-    for bar, npv in zip(bars, npvs):
-        height = bar.get_height()
-        ax.text(bar.get_x() + bar.get_width()/2., height + max(npvs)*0.01,
-                f'{currency_symbol}{npv:,.0f}', ha='center', va='bottom', fontweight='bold')
-    
-    ax.set_ylabel(f'Net Present Value ({currency_symbol})', fontsize=12)
-    ax.set_title('Scenario Analysis - NPV Comparison', fontsize=14, fontweight='bold')
-    ax.grid(axis='y', alpha=0.3)
-    
-    # Format y-axis
-    ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'{currency_symbol}{x/1000:.0f}K'))
-    
-    plt.tight_layout()
-    
-    # Save to BytesIO
-    img_buffer = BytesIO()
-    plt.savefig(img_buffer, format='png', dpi=300, bbox_inches='tight')
-    img_buffer.seek(0)
-    plt.close()
-    
-    return img_buffer
-
-def generate_executive_report_pdf(summary_data, scenario_results, solution_name, organization_name="Your Organization"):
-    """Generate comprehensive executive report PDF"""
-    
-    if not REPORT_DEPENDENCIES_AVAILABLE:
-        return None
-    
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4)
-    story = []
-    styles = getSampleStyleSheet()
-    
-    # Custom styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        spaceAfter=30,
-        alignment=TA_CENTER,
-        textColor=colors.darkblue
-    )
-    
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=16,
-        spaceAfter=12,
-        textColor=colors.darkblue,
-        borderWidth=1,
-        borderColor=colors.darkblue,
-        borderPadding=5
-    )
-    
-    subheading_style = ParagraphStyle(
-        'CustomSubheading',
-        parent=styles['Heading3'],
-        fontSize=14,
-        spaceAfter=8,
-        textColor=colors.darkblue
-    )
-    
-    # Title Page
-    story.append(Paragraph(f"Business Value Assessment", title_style))
-    story.append(Paragraph(f"{solution_name} Implementation", styles['Title']))
-    story.append(Spacer(1, 0.5*inch))
-    story.append(Paragraph(f"Prepared for: {organization_name}", styles['Heading2']))
-    story.append(Paragraph(f"Date: {datetime.now().strftime('%B %d, %Y')}", styles['Normal']))
-    story.append(Spacer(1, 0.5*inch))
-    
-    # Custom style for white header text
-    header_style = ParagraphStyle(
-        'HeaderStyle',
-        parent=styles['Normal'],
-        textColor=colors.white,
-        fontName='Helvetica-Bold'
-    )
-    
-    # Executive Summary Box with proper column widths and white headers
-    exec_summary_data = [
-        [Paragraph('<b>Metric</b>', header_style), 
-         Paragraph('<b>Conservative</b>', header_style), 
-         Paragraph('<b>Expected</b>', header_style), 
-         Paragraph('<b>Optimistic</b>', header_style)],
-        [Paragraph('Net Present Value', styles['Normal']), 
-         Paragraph(f"{summary_data['investment_summary']['currency']}{scenario_results['Conservative']['npv']:,.0f}", styles['Normal']),
-         Paragraph(f"{summary_data['investment_summary']['currency']}{scenario_results['Expected']['npv']:,.0f}", styles['Normal']),
-         Paragraph(f"{summary_data['investment_summary']['currency']}{scenario_results['Optimistic']['npv']:,.0f}", styles['Normal'])],
-        [Paragraph('Return on Investment', styles['Normal']),
-         Paragraph(f"{scenario_results['Conservative']['roi']*100:.1f}%", styles['Normal']),
-         Paragraph(f"{scenario_results['Expected']['roi']*100:.1f}%", styles['Normal']),
-         Paragraph(f"{scenario_results['Optimistic']['roi']*100:.1f}%", styles['Normal'])],
-        [Paragraph('Payback Period (Years)', styles['Normal']),
-         Paragraph(scenario_results['Conservative']['payback'], styles['Normal']),
-         Paragraph(scenario_results['Expected']['payback'], styles['Normal']),
-         Paragraph(scenario_results['Optimistic']['payback'], styles['Normal'])],
-        [Paragraph('Payback Period (Months)', styles['Normal']),
-         Paragraph(scenario_results['Conservative']['payback_months'], styles['Normal']),
-         Paragraph(scenario_results['Expected']['payback_months'], styles['Normal']),
-         Paragraph(scenario_results['Optimistic']['payback_months'], styles['Normal'])]
-    ]
-    
-    exec_table = Table(exec_summary_data, colWidths=[2.2*inch, 1.5*inch, 1.5*inch, 1.5*inch])
-    exec_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('TOPPADDING', (0, 0), (-1, -1), 8),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
-    
-    story.append(exec_table)
-    story.append(Spacer(1, 0.2*inch))
-    
-    # Add overall cost reallocation and FTE equivalency to Executive Summary (optional, can be its own section)
-    story.append(Paragraph("Operational Savings for Reallocation:", subheading_style))
-    story.append(Paragraph(
-        f"Annually, **{summary_data['investment_summary']['currency']}{summary_data['reallocation_and_fte']['total_cost_savings_for_reallocation']:,.0f}** can be reallocated to higher-margin projects. "
-        f"This represents **{summary_data['reallocation_and_fte']['equivalent_ftes_from_savings']:,.1f}** equivalent full-time employees (FTEs) in savings.",
-        styles['Normal']
-    ))
-    story.append(PageBreak())
-    
-    # 1. Executive Summary
-    story.append(Paragraph("Executive Summary", heading_style))
-    
-    exec_text = f"""
-    This Business Value Assessment demonstrates the financial and operational benefits of implementing {solution_name} at {organization_name}. Our analysis shows strong positive returns across all scenarios: 
-    <b>Key Financial Highlights:</b><br/> 
-    • Expected NPV: {summary_data['investment_summary']['currency']}{summary_data['investment_summary']['expected_npv']:,.0f}<br/> 
-    • Expected ROI: {summary_data['investment_summary']['expected_roi']*100:.1f}%<br/> 
-    • Payback Period: {summary_data['investment_summary']['payback_period']} ({summary_data['investment_summary']['expected_payback_months']})<br/> 
-    • NPV Range: {summary_data['investment_summary']['currency']}{scenario_results['Conservative']['npv']:,.0f} to {summary_data['investment_summary']['currency']}{scenario_results['Optimistic']['npv']:,.0f}<br/><br/> 
-    <b>Primary Value Drivers:</b><br/> 
-    • Alert Management Optimization: {summary_data['investment_summary']['currency']}{summary_data['key_benefits']['alert_reduction_savings'] + summary_data['key_benefits']['incident_reduction_savings']:,.0f} annually<br/> 
-    • Incident Management Efficiency: {summary_data['investment_summary']['currency']}{summary_data['key_benefits']['incident_reduction_savings'] + summary_data['key_benefits']['incident_triage_savings']:,.0f} annually<br/> 
-    • Major Incident Impact Reduction: {summary_data['investment_summary']['currency']}{summary_data['key_benefits']['major_incident_savings']:,.0f} annually<br/><br/> 
-    <b>Operational Savings for Reallocation:</b><br/>
-    • Total Annual Cost Savings from A&I Management: {summary_data['investment_summary']['currency']}{summary_data['reallocation_and_fte']['total_cost_savings_for_reallocation']:,.0f}<br/>
-    • Equivalent FTEs from Savings: {summary_data['reallocation_and_fte']['equivalent_ftes_from_savings']:,.1f} FTEs<br/><br/>
-    <b>Implementation Timeline:</b><br/> 
-    • Implementation Phase: {summary_data['implementation']['delay_months']} months<br/> 
-    • Ramp-up to Full Benefits: {summary_data['implementation']['ramp_up_months']} months<br/> 
-    • Full ROI Realization: Month {summary_data['implementation']['full_benefits_month']}<br/><br/> 
-    Even under conservative assumptions (30% lower benefits, 30% longer implementation), the investment delivers **{scenario_results['Conservative']['roi']*100:.1f}% ROI** with a **{scenario_results['Conservative']['payback_months']}** payback period. 
-    """ 
-    story.append(Paragraph(exec_text, styles['Normal'])) 
-    story.append(Spacer(1, 0.3*inch)) 
-    # Add scenario chart 
-    scenario_chart = create_scenario_chart_for_pdf(scenario_results, summary_data['investment_summary']['currency']) 
-    if scenario_chart: 
-        story.append(Image(scenario_chart, width=6*inch, height=3.6*inch)) 
-    story.append(PageBreak()) 
-    # 2. Implementation Roadmap with wrapped text and white headers 
-    story.append(Paragraph("Implementation Roadmap & Milestones", heading_style)) 
-    roadmap_data = [ 
-        [Paragraph('<b>Phase</b>', header_style), Paragraph('<b>Duration</b>', header_style), Paragraph('<b>Key Activities</b>', header_style), Paragraph('<b>Benefits Realization</b>', header_style)], 
-        [Paragraph('Planning & Setup', styles['Normal']), Paragraph(f"Months 1-2", styles['Normal']), Paragraph('Environment setup, integration planning, team training', styles['Normal']), Paragraph('0%', styles['Normal'])], 
-        [Paragraph('Core Implementation', styles['Normal']), Paragraph(f"Months 3-{implementation_delay_months}", styles['Normal']), Paragraph('Data integration, alert configuration, dashboard creation', styles['Normal']), Paragraph('0%', styles['Normal'])], 
-        [Paragraph('Go-Live & Ramp-up', styles['Normal']), Paragraph(f"Months {implementation_delay_months+1}-{implementation_delay_months + benefits_ramp_up_months}", styles['Normal']), Paragraph('Deployment, user adoption, process optimization', styles['Normal']), Paragraph('0% → 100%', styles['Normal'])], 
-        [Paragraph('Full Operation', styles['Normal']), Paragraph(f"Month {implementation_delay_months + benefits_ramp_up_months}+", styles['Normal']), Paragraph('Business as usual, continuous improvement', styles['Normal']), Paragraph('100%', styles['Normal'])], 
-    ] 
-    roadmap_table = Table(roadmap_data, colWidths=[1.3*inch, 1.1*inch, 3*inch, 1.3*inch]) 
-    roadmap_table.setStyle(TableStyle([ 
-        ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue), 
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke), 
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'), 
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'), 
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'), 
-        ('FONTSIZE', (0, 0), (-1, -1), 9), 
-        ('TOPPADDING', (0, 0), (-1, -1), 8), 
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 8), 
-        ('LEFTPADDING', (0, 0), (-1, -1), 6), 
-        ('RIGHTPADDING', (0, 0), (-1, -1), 6), 
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]), 
-        ('GRID', (0, 0), (-1, -1), 1, colors.black) 
-    ])) 
-    story.append(roadmap_table) 
-    story.append(Spacer(1, 0.3*inch)) 
-    # Add timeline chart 
-    timeline_chart = create_timeline_chart_for_pdf() 
-    if timeline_chart: 
-        story.append(Image(timeline_chart, width=6*inch, height=2.4*inch)) 
-    story.append(Spacer(1, 0.3*inch)) 
-    # Key Milestones 
-    story.append(Paragraph("Key Success Milestones", subheading_style)) 
-    milestones_text = f""" 
-    <b>Month {implementation_delay_months}: Go-Live Milestone</b><br/> 
-    • Solution deployed and operational<br/> 
-    • Initial benefits begin to materialize<br/> 
-    • User training completed<br/><br/> 
-    <b>Month {implementation_delay_months + benefits_ramp_up_months}: Full Benefits Milestone</b><br/> 
-    • 100% benefit realization achieved<br/> 
-    • All processes optimized<br/> 
-    • ROI tracking established<br/><br/> 
-    <b>Month {evaluation_years * 12}: Final Review & Optimization</b><br/>
-    • Comprehensive review of benefits realization<br/>
-    • Identify areas for further optimization<br/>
-    • Plan for future initiatives and expansion
-    """
-    story.append(Paragraph(milestones_text, styles['Normal']))
-    story.append(Spacer(1, 0.3*inch))
-
-    # Add a concluding statement
-    story.append(Paragraph(
-        "By implementing the proposed solution, " + organization_name + " can expect to achieve significant financial benefits and operational efficiencies, driving enhanced business value.",
-        styles['Normal']
-    ))
-
-    # Build the PDF
-    doc.build(story)
-    buffer.seek(0)
-    return buffer
-
 # --- Main App Layout ---
 st.title(f"Business Value Assessment for {solution_name} Implementation")
 st.markdown("This tool helps estimate the financial impact of implementing the solution, providing a comprehensive business case with scenario analysis.")
@@ -1229,33 +684,36 @@ st.markdown("This tool helps estimate the financial impact of implementing the s
 st.header("Financial Impact Summary")
 
 # --- Key Metrics Cards ---
-col1, col2, col3 = st.columns(3)
-
-with col1:
-    expected_npv = scenario_results['Expected']['npv']
-    st.metric(label=f"Expected Net Present Value (NPV) over {evaluation_years} years",
-              value=f"{currency_symbol}{expected_npv:,.0f}")
-    
-with col2:
-    expected_roi = scenario_results['Expected']['roi'] * 100
-    st.metric(label=f"Expected Return on Investment (ROI) over {evaluation_years} years",
-              value=f"{expected_roi:.1f}%")
+def build_key_metrics():
+    """Labels and values of the headline metric cards"""
+    expected = scenario_results[reference_scenario]
+    return [
+        (f"{reference_scenario} Net Present Value (NPV) over {evaluation_years} years", f"{currency_symbol}{expected['npv']:,.0f}"),
+        (f"{reference_scenario} Return on Investment (ROI) over {evaluation_years} years", f"{expected['roi'] * 100:.1f}%"),
+        (f"{reference_scenario} Internal Rate of Return (IRR)", format_rate(expected['irr'])),
+        (f"{reference_scenario} Payback Period", format_payback(expected['payback_months'], "months", evaluation_years * 12))
+    ]
 
-with col3:
-    expected_payback = scenario_results['Expected']['payback']
-    expected_payback_months = scenario_results['Expected']['payback_months']
-    st.metric(label="Expected Payback Period",
-              value=f"{expected_payback_months}")
+key_metrics = section_content('key_metrics', build_key_metrics)
+for metric_column, (metric_label, metric_value) in zip(st.columns(len(key_metrics)), key_metrics):
+    metric_column.metric(label=metric_label, value=metric_value)
 
 st.markdown("---")
 
 # --- Value Reallocation & FTE Equivalency (Overall Project) ---
 st.subheader("🚀 Value Reallocation & FTE Equivalency (Overall Project)")
-st.write(f"**Cost Available for Higher Margin Projects (Annually):** {currency_symbol}{total_operational_savings_from_time_saved:,.0f}")
-if effective_avg_fte_salary > 0:
-    st.write(f"**Equivalent FTEs from Savings (Annually):** {equivalent_ftes_from_savings:,.1f} FTEs")
-else:
-    st.write("Average FTE salary not provided, unable to calculate equivalent FTEs.")
+
+def build_value_reallocation():
+    """Value reallocation lines"""
+    lines = [f"**Cost Available for Higher Margin Projects (Annually):** {currency_symbol}{total_operational_savings_from_time_saved:,.0f}"]
+    if effective_avg_fte_salary > 0:
+        lines.append(f"**Equivalent FTEs from Savings (Annually):** {equivalent_ftes_from_savings:,.1f} FTEs")
+    else:
+        lines.append("Average FTE salary not provided, unable to calculate equivalent FTEs.")
+    return lines
+
+for line in section_content('value_reallocation', build_value_reallocation):
+    st.write(line)
 
 st.markdown("---")
 
@@ -1263,137 +721,528 @@ st.markdown("---")
 st.header("Scenario Analysis")
 st.info("Explore the potential financial outcomes under different assumptions.")
 
+def build_scenario_tabs():
+    """Scenario comparison table, per-scenario summary lines and formatted cash-flow tables"""
+    content = {'comparison': pd.DataFrame([
+        {
+            'Scenario': scenario_name,
+            'Benefits ×': params['benefits_multiplier'],
+            'Implementation (Months)': scenario_results[scenario_name]['impl_delay'],
+            'NPV': scenario_results[scenario_name]['npv'],
+            'ROI': scenario_results[scenario_name]['roi'] * 100,
+            'IRR': format_rate(scenario_results[scenario_name]['irr']),
+            'Payback': format_payback(scenario_results[scenario_name]['payback_months'], "months", evaluation_years * 12)
+        }
+        for scenario_name, params in scenarios.items()
+    ])}
+    for scenario_name, params in scenarios.items():
+        result = scenario_results[scenario_name]
+        cash_flow_df = pd.DataFrame(result['cash_flows'])
+        cash_flow_df['net_cash_flow_cumulative'] = cash_flow_df['net_cash_flow'].cumsum()
+
+        # Format for display
+        cash_flow_display_df = cash_flow_df.copy()
+        for col in ['benefits', 'platform_cost', 'services_cost', 'net_cash_flow', 'net_cash_flow_cumulative', 'present_value']:
+            cash_flow_display_df[col] = cash_flow_display_df[col].apply(lambda x: f"{currency_symbol}{x:,.0f}")
+        
+        cash_flow_display_df['realization_factor'] = cash_flow_display_df['realization_factor'].apply(lambda x: f"{x*100:.1f}%")
+
+        content[scenario_name] = {
+            'cost_lines': [
+                f"**Annual Benefits (Year 1):** {currency_symbol}{result['annual_benefits']:,.0f}",
+                f"**Annual Platform Cost (Year 1):** {currency_symbol}{result['platform_cost']:,.0f}",
+                f"**One-Time Services Cost:** {currency_symbol}{result['services_cost']:,.0f}",
+                f"**Implementation / Ramp-up:** {result['impl_delay']} / {result['ramp_up_months']:.0f} months"
+            ],
+            'result_lines': [
+                f"**Net Present Value (NPV):** {currency_symbol}{result['npv']:,.0f}",
+                f"**Return on Investment (ROI):** {result['roi']*100:.1f}%",
+                f"**Internal Rate of Return (IRR):** {format_rate(result['irr'])}",
+                f"**Modified IRR (MIRR):** {format_rate(result['mirr'])}",
+                f"**Payback Period (Years):** {format_payback(result['payback'], 'years', evaluation_years)}",
+                f"**Payback Period (Months):** {format_payback(result['payback_months'], 'months', evaluation_years * 12)}"
+            ],
+            'cash_flows': cash_flow_display_df[[
+                'year', 'benefits', 'platform_cost', 'services_cost', 
+                'net_cash_flow', 'net_cash_flow_cumulative', 'present_value', 'realization_factor'
+            ]].rename(columns={
+                'year': 'Year',
+                'benefits': 'Benefits',
+                'platform_cost': 'Platform Cost',
+                'services_cost': 'Services Cost',
+                'net_cash_flow': 'Net Cash Flow',
+                'net_cash_flow_cumulative': 'Cumulative Net Cash Flow',
+                'present_value': 'Present Value',
+                'realization_factor': 'Benefit Realization Factor'
+            })
+        }
+    return content
+
+scenario_tab_content = section_content('scenario_tabs', build_scenario_tabs)
+st.dataframe(
+    scenario_tab_content['comparison'],
+    hide_index=True,
+    column_config={
+        'NPV': st.column_config.NumberColumn(f"NPV ({currency_symbol})", format="localized"),
+        'ROI': st.column_config.NumberColumn("ROI", format="%.1f%%")
+    }
+)
 tabs = st.tabs(list(scenarios.keys()))
 
 for i, (scenario_name, params) in enumerate(scenarios.items()):
     with tabs[i]:
-        result = scenario_results[scenario_name]
+        content = scenario_tab_content[scenario_name]
         st.subheader(f"{params['icon']} {scenario_name} Scenario")
         st.markdown(f"*{params['description']}*")
 
         st.markdown("---")
 
-        st.write(f"**Annual Benefits (Year {evaluation_years}):** {currency_symbol}{result['annual_benefits']:,.0f}")
-        st.write(f"**Total Annual Platform Cost:** {currency_symbol}{platform_cost:,.0f}")
-        st.write(f"**One-Time Services Cost:** {currency_symbol}{services_cost:,.0f}")
+        for line in content['cost_lines']:
+            st.write(line)
 
         st.markdown("---")
 
-        st.write(f"**Net Present Value (NPV):** {currency_symbol}{result['npv']:,.0f}")
-        st.write(f"**Return on Investment (ROI):** {result['roi']*100:.1f}%")
-        st.write(f"**Payback Period (Years):** {result['payback']}")
-        st.write(f"**Payback Period (Months):** {result['payback_months']}") # New monthly payback display
+        for line in content['result_lines']:
+            st.write(line)
 
         # Display cash flows in a table
         st.markdown("#### Detailed Cash Flows")
-        cash_flow_df = pd.DataFrame(result['cash_flows'])
-        cash_flow_df['net_cash_flow_cumulative'] = cash_flow_df['net_cash_flow'].cumsum()
-
-        # Format for display
-        cash_flow_display_df = cash_flow_df.copy()
-        for col in ['benefits', 'platform_cost', 'services_cost', 'net_cash_flow', 'net_cash_flow_cumulative']:
-            cash_flow_display_df[col] = cash_flow_display_df[col].apply(lambda x: f"{currency_symbol}{x:,.0f}")
-        
-        cash_flow_display_df['realization_factor'] = cash_flow_display_df['realization_factor'].apply(lambda x: f"{x*100:.1f}%")
-
-        st.dataframe(cash_flow_display_df[[
-            'year', 'benefits', 'platform_cost', 'services_cost', 
-            'net_cash_flow', 'net_cash_flow_cumulative', 'realization_factor'
-        ]].rename(columns={
-            'year': 'Year',
-            'benefits': 'Benefits',
-            'platform_cost': 'Platform Cost',
-            'services_cost': 'Services Cost',
-            'net_cash_flow': 'Net Cash Flow',
-            'net_cash_flow_cumulative': 'Cumulative Net Cash Flow',
-            'realization_factor': 'Benefit Realization Factor'
-        }), hide_index=True)
+        st.dataframe(content['cash_flows'], hide_index=True)
 
 
 st.markdown("---")
 
-# --- Monthly Cumulative Cash Flow Chart (Expected Scenario - showing initial months) ---
-st.subheader("Cumulative Net Cash Flow Over Time (Expected Scenario)")
-
-def get_monthly_cumulative_cash_flow(annual_benefits, annual_platform_cost, one_time_services_cost, 
-                                     implementation_delay_months, benefits_ramp_up_months, evaluation_years):
-    total_months = evaluation_years * 12
-    monthly_data = []
-    cumulative_cash_flow = 0
-    
-    # Start with initial services cost as a negative cash flow at month 0
-    monthly_data.append({'month': 0, 'net_cash_flow': -one_time_services_cost, 'cumulative_net_cash_flow': -one_time_services_cost})
-    cumulative_cash_flow = -one_time_services_cost
-
-    for month in range(1, total_months + 1):
-        factor = calculate_benefit_realization_factor(month, implementation_delay_months, benefits_ramp_up_months)
-        
-        monthly_benefit = (annual_benefits / 12) * factor
-        monthly_platform_cost = annual_platform_cost / 12
-        
-        monthly_net_cash_flow = monthly_benefit - monthly_platform_cost
-        
-        cumulative_cash_flow += monthly_net_cash_flow
-        
-        monthly_data.append({
-            'month': month,
-            'net_cash_flow': monthly_net_cash_flow,
-            'cumulative_net_cash_flow': cumulative_cash_flow
-        })
-    return pd.DataFrame(monthly_data)
-
-expected_monthly_cf_df = get_monthly_cumulative_cash_flow(
-    total_annual_benefits * scenarios['Expected']['benefits_multiplier'],
-    platform_cost,
-    services_cost,
-    implementation_delay_months,
-    benefits_ramp_up_months,
-    evaluation_years
-)
-
-fig_monthly_cf = px.line(expected_monthly_cf_df, x='month', y='cumulative_net_cash_flow',
-                 labels={'cumulative_net_cash_flow': f'Cumulative Net Cash Flow ({currency_symbol})', 'month': 'Month'},
-                 title='Cumulative Net Cash Flow (Expected Scenario - Monthly View)')
-fig_monthly_cf.add_hline(y=0, line_dash="dash", line_color="red", annotation_text="Payback Point", 
-                  annotation_position="bottom right")
-fig_monthly_cf.update_layout(hovermode="x unified")
-st.plotly_chart(fig_monthly_cf, use_container_width=True)
+# --- Monthly Cumulative Cash Flow Chart (all scenarios, reference scenario highlighted) ---
+st.subheader("Cumulative Net Cash Flow Over Time")
+
+def build_monthly_cash_flow_chart():
+    """Cumulative net cash flow of every scenario from the engine's cash-flow grid"""
+    fig_monthly_cf = go.Figure()
+    for scenario_name, result in scenario_results.items():
+        fig_monthly_cf.add_trace(go.Scatter(
+            x=np.arange(len(result['monthly_cumulative_cash_flow'])),
+            y=result['monthly_cumulative_cash_flow'], mode='lines', name=scenario_name,
+            line=dict(color=result['color'], width=3 if scenario_name == reference_scenario else 1.5),
+            hovertemplate='Month=%{x}<br>Cumulative Net Cash Flow=%{y}<extra>' + scenario_name + '</extra>'
+        ))
+    fig_monthly_cf.update_layout(title='Cumulative Net Cash Flow by Scenario (Monthly View)',
+                                 xaxis_title='Month', yaxis_title=f'Cumulative Net Cash Flow ({currency_symbol})')
+    fig_monthly_cf.add_hline(y=0, line_dash="dash", line_color="red", annotation_text="Payback Point", 
+                      annotation_position="bottom right")
+    fig_monthly_cf.update_layout(hovermode="x unified")
+    return fig_monthly_cf
+
+st.plotly_chart(section_content('monthly_cash_flow_chart', build_monthly_cash_flow_chart), use_container_width=True)
 
 
 st.markdown("---")
 
 # Implementation Timeline Chart
 st.subheader("Implementation Timeline & Benefit Realization")
-timeline_fig = create_implementation_timeline_chart(
+timeline_fig = section_content('timeline_chart', lambda: create_implementation_timeline_chart(
     implementation_delay_months, 
     benefits_ramp_up_months, 
     evaluation_years, 
     currency_symbol, 
-    total_annual_benefits
-)
+    total_annual_benefits,
+    realization_factors=scenario_results[reference_scenario]['monthly_realization']
+))
 st.plotly_chart(timeline_fig, use_container_width=True)
 
 
+st.markdown("---")
+
+# --- Sensitivity Analysis ---
+st.header("Sensitivity Analysis")
+st.info(f"Which assumption matters most? Each input is moved to a low and a high value on its own while all others stay at the current settings ({reference_scenario} scenario).")
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def run_cached_tornado(input_values, pct, custom_ranges, scenario_name, scenarios):
+    """Cached tornado run so unchanged settings are not re-evaluated on every rerun"""
+    return run_tornado(input_values, pct=pct, custom_ranges=custom_ranges, scenario_name=scenario_name, scenarios=scenarios)
+
+def create_tornado_chart(tornado, metric, n_inputs, currency_symbol):
+    """Horizontal tornado chart of the outcome at each input's low and high value around the base case"""
+    if metric == "NPV":
+        base = tornado['base_npv']
+        low_key, high_key = 'npv_low', 'npv_high'
+        rows = tornado['rows']
+        axis_title = f"{tornado['scenario']} NPV ({currency_symbol})"
+    else:
+        # Payback never reached (or beyond the horizon) is drawn at the end of the evaluation period
+        horizon = tornado['evaluation_years'] * 12
+        base = min(tornado['base_payback_months'], horizon)
+        low_key, high_key = 'payback_months_low', 'payback_months_high'
+        rows = sorted(tornado['rows'], reverse=True, key=lambda row: abs(
+            min(row['payback_months_high'], horizon) - min(row['payback_months_low'], horizon)))
+        rows = [dict(row, **{low_key: min(row[low_key], horizon), high_key: min(row[high_key], horizon)}) for row in rows]
+        axis_title = f"{tornado['scenario']} Payback (Months)"
+
+    rows = rows[:n_inputs][::-1]  # Largest swing at the top
+    labels = [INPUT_DESCRIPTIONS.get(row['key'], row['key']) for row in rows]
+    fig = go.Figure()
+    for name, value_key, outcome_key, color in [("Low input", 'low_value', low_key, '#ff6b6b'),
+                                                 ("High input", 'high_value', high_key, '#4ecdc4')]:
+        fig.add_trace(go.Bar(
+            y=labels, x=[row[outcome_key] - base for row in rows], base=base, orientation='h', name=name,
+            marker_color=color, customdata=[[row[value_key], row[outcome_key]] for row in rows],
+            hovertemplate='%{y}<br>Input: %{customdata[0]:,.2f}<br>Result: %{customdata[1]:,.1f}<extra>' + name + '</extra>'
+        ))
+    fig.add_vline(x=base, line_dash="dash", line_color="gray", annotation_text="Base", annotation_position="top")
+    fig.update_layout(barmode='overlay', xaxis_title=axis_title, height=max(400, 28 * len(rows) + 120),
+                      legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1))
+    return fig
+
+@st.fragment
+@profiled_run("panel: sensitivity", session_profiler)
+def sensitivity_panel():
+    """Sensitivity controls and tornado chart (a fragment: its widgets rerun only this panel)"""
+    with st.expander("Configure sensitivity ranges", expanded=False):
+        sensitivity_pct = st.slider("Perturbation (± % of current value)", 1, 50, 10, key="sens_pct")
+        custom_range_inputs = st.multiselect(
+            "Inputs with custom low/high values",
+            SENSITIVITY_INPUTS,
+            format_func=lambda key: INPUT_DESCRIPTIONS.get(key, key),
+            key="sens_custom_inputs"
+        )
+        custom_ranges = {}
+        for key in custom_range_inputs:
+            current_value = float(current_input_values[key])
+            low_col, high_col = st.columns(2)
+            low = low_col.number_input(f"{INPUT_DESCRIPTIONS.get(key, key)} - Low", value=current_value * 0.8, key=f"sens_low_{key}")
+            high = high_col.number_input(f"{INPUT_DESCRIPTIONS.get(key, key)} - High", value=current_value * 1.2, key=f"sens_high_{key}")
+            custom_ranges[key] = (low, high)
+
+    with stage("sensitivity: tornado runs"):
+        tornado = run_cached_tornado(current_input_values, sensitivity_pct, custom_ranges, reference_scenario, scenarios)
+    tornado_col1, tornado_col2 = st.columns([1, 3])
+    with tornado_col1:
+        tornado_metric = st.radio("Outcome", ["NPV", "Payback"], key="sens_metric")
+        tornado_inputs_shown = st.slider("Inputs shown", 5, len(SENSITIVITY_INPUTS), 12, key="sens_inputs_shown")
+        top_driver = tornado['rows'][0]
+        st.metric("Most influential input", INPUT_DESCRIPTIONS.get(top_driver['key'], top_driver['key']),
+                  f"NPV swing {currency_symbol}{top_driver['npv_swing']:,.0f}", delta_color="off")
+    with tornado_col2:
+        with stage("chart: tornado", 'chart'):
+            st.plotly_chart(create_tornado_chart(tornado, tornado_metric, tornado_inputs_shown, currency_symbol), use_container_width=True)
+
+sensitivity_panel()
+
+st.markdown("---")
+
+# --- Goal Seek ---
+st.header("Goal Seek")
+st.info(f"Find the input value that reaches a target, e.g. the highest subscription cost that keeps {downside_scenario} NPV at or above zero.")
+
+@st.fragment
+@profiled_run("panel: goal seek", session_profiler)
+def goal_seek_panel():
+    """Goal seek controls and result (a fragment: its widgets rerun only this panel)"""
+    goal_col1, goal_col2, goal_col3, goal_col4 = st.columns(4)
+    with goal_col1:
+        goal_key = st.selectbox("Input to solve for", MODEL_INPUT_KEYS, index=MODEL_INPUT_KEYS.index('platform_cost'),
+                                format_func=lambda key: INPUT_DESCRIPTIONS.get(key, key), key="goal_key")
+    with goal_col2:
+        goal_metric = st.selectbox("Target metric", list(GOAL_SEEK_METRICS), format_func=GOAL_SEEK_METRICS.get, key="goal_metric")
+    with goal_col3:
+        goal_target = st.number_input(
+            "Target value" + (" (%)" if goal_metric == 'roi' else ""),
+            value=12.0 if goal_metric == 'payback_months' else 0.0, key=f"goal_target_{goal_metric}"
+        )
+    with goal_col4:
+        goal_scenario = st.selectbox("Scenario", list(scenarios), key="goal_scenario")
+
+    with stage("goal seek: solve"):
+        goal = solve_break_even(current_input_values, goal_key, goal_metric,
+                                goal_target / 100 if goal_metric == 'roi' else goal_target, goal_scenario, scenarios=scenarios)
+    goal_input_label = INPUT_DESCRIPTIONS.get(goal_key, goal_key)
+    goal_metric_label = f"{goal_scenario} {GOAL_SEEK_METRICS[goal_metric]}"
+    if goal['value'] is None:
+        st.warning(f"{goal_metric_label} does not reach {goal_target:,.2f} anywhere in the allowed range of {goal_input_label}.")
+    else:
+        # NPV/ROI targets are met on the side where the metric rises; payback targets where it falls
+        meets_above = (goal['direction'] > 0) != (goal_metric == 'payback_months')
+        goal_comparison = "≤" if goal_metric == 'payback_months' else "≥"
+        goal_result_col1, goal_result_col2 = st.columns([1, 2])
+        goal_result_col1.metric(f"Break-even {goal_input_label}", f"{goal['value']:,.2f}",
+                                f"current: {float(current_input_values[goal_key]):,.2f}", delta_color="off")
+        goal_result_col2.markdown(
+            f"**{goal_metric_label} {goal_comparison} {goal_target:,.2f}** when {goal_input_label} is "
+            f"**{'at least' if meets_above else 'at most'} {goal['value']:,.2f}**."
+        )
+
+goal_seek_panel()
+
+st.markdown("---")
+
+# --- Parameter Sweep ---
+st.header("Parameter Sweep")
+st.info("See how two inputs interact: every combination on the grid is evaluated with all other inputs at their current settings.")
+
+SWEEP_METRICS = {'npv': "NPV", 'roi': "ROI (%)", 'payback_months': "Payback (Months)"}
+
+def create_sweep_heatmap(sweep, metric, currency_symbol):
+    """Heatmap of a parameter sweep metric over the two swept inputs"""
+    values = sweep[metric] * (100 if metric == 'roi' else 1)
+    if metric == 'payback_months':
+        values = np.where(np.isfinite(values), values, np.nan)  # Never paid back shows as a gap
+    metric_label = f"{sweep['scenario']} {SWEEP_METRICS[metric]}" + (f" ({currency_symbol})" if metric == 'npv' else "")
+    fig = go.Figure(go.Heatmap(
+        x=sweep['x_values'], y=sweep['y_values'], z=values,
+        colorscale='RdYlGn_r' if metric == 'payback_months' else 'RdYlGn',
+        zmid=0 if metric in ('npv', 'roi') else None,
+        colorbar=dict(title=SWEEP_METRICS[metric]),
+        hovertemplate='%{x:,.2f} / %{y:,.2f}<br>' + metric_label + ': %{z:,.1f}<extra></extra>'
+    ))
+    fig.update_layout(
+        title=metric_label,
+        xaxis_title=INPUT_DESCRIPTIONS.get(sweep['x_key'], sweep['x_key']),
+        yaxis_title=INPUT_DESCRIPTIONS.get(sweep['y_key'], sweep['y_key']),
+        height=550
+    )
+    return fig
+
+@st.fragment
+@profiled_run("panel: parameter sweep", session_profiler)
+def parameter_sweep_panel():
+    """Sweep controls and heatmap (a fragment: its widgets rerun only this panel)"""
+    sweep_axes = []
+    for axis, default_key in [("X", 'implementation_delay'), ("Y", 'alert_reduction_pct')]:
+        key_col, low_col, high_col = st.columns([2, 1, 1])
+        sweep_key = key_col.selectbox(f"{axis} axis input", MODEL_INPUT_KEYS, index=MODEL_INPUT_KEYS.index(default_key),
+                                      format_func=lambda key: INPUT_DESCRIPTIONS.get(key, key), key=f"sweep_{axis}_key")
+        default_low, default_high = INPUT_BOUNDS.get(sweep_key, (0, None))
+        if default_high is None:
+            default_high = max(float(current_input_values[sweep_key]) * 2, 1.0)
+        sweep_low = low_col.number_input("From", value=float(default_low), key=f"sweep_{axis}_low_{sweep_key}")
+        sweep_high = high_col.number_input("To", value=float(default_high), key=f"sweep_{axis}_high_{sweep_key}")
+        sweep_axes.append((sweep_key, sweep_low, sweep_high))
+
+    sweep_col1, sweep_col2 = st.columns(2)
+    sweep_steps = sweep_col1.select_slider("Grid points per axis", [10, 25, 50, 100], value=50, key="sweep_steps")
+    sweep_metric = sweep_col2.radio("Metric", list(SWEEP_METRICS), format_func=SWEEP_METRICS.get, horizontal=True, key="sweep_metric")
+
+    (x_key, x_low, x_high), (y_key, y_low, y_high) = sweep_axes
+    if x_key == y_key:
+        st.warning("Choose two different inputs to sweep.")
+    elif x_low >= x_high or y_low >= y_high:
+        st.warning("Each axis range needs a 'To' value above its 'From' value.")
+    else:
+        with stage("parameter sweep: grid evaluation"):
+            sweep = run_parameter_sweep_cached(
+                current_input_values, x_key, sweep_values(x_key, x_low, x_high, sweep_steps),
+                y_key, sweep_values(y_key, y_low, y_high, sweep_steps), reference_scenario, scenarios
+            )
+        with stage("chart: sweep heatmap", 'chart'):
+            st.plotly_chart(create_sweep_heatmap(sweep, sweep_metric, currency_symbol), use_container_width=True)
+
+parameter_sweep_panel()
+
+st.markdown("---")
+
+# --- Monte Carlo Simulation ---
+st.header("Monte Carlo Simulation")
+st.info("Give key inputs a range instead of a single value to see the spread of possible outcomes (inputs as entered, without scenario multipliers).")
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def run_cached_simulation(input_values, distributions, n_draws, seed):
+    """Cached simulation run so unchanged settings are not re-simulated on every rerun"""
+    return run_simulation(input_values, distributions, n_draws=n_draws, seed=seed)
+
+def create_simulation_histogram(values, title, x_label, color, markers):
+    """Histogram of simulated values (binned server-side) with percentile markers"""
+    counts, edges = np.histogram(values, bins=60)
+    fig = go.Figure(go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2, y=counts / len(values) * 100, width=np.diff(edges),
+        marker_color=color, hovertemplate='%{x:,.0f}<br>%{y:.1f}% of draws<extra></extra>'
+    ))
+    for label, value in markers.items():
+        fig.add_vline(x=value, line_dash="dash", line_color="gray", annotation_text=label, annotation_position="top")
+    fig.update_layout(title=title, xaxis_title=x_label, yaxis_title="% of Draws", height=400, bargap=0)
+    return fig
+
+@st.fragment
+@profiled_run("panel: Monte Carlo", session_profiler)
+def monte_carlo_panel():
+    """Simulation controls and results (a fragment: its widgets rerun only this panel)"""
+    with st.expander("Configure input distributions", expanded=True):
+        simulated_inputs = st.multiselect(
+            "Inputs to simulate",
+            SIMULATION_INPUTS,
+            default=['alert_reduction_pct', 'avg_alert_triage_time', 'implementation_delay', 'mttr_improvement_pct'],
+            format_func=lambda key: INPUT_DESCRIPTIONS.get(key, key),
+            key="mc_inputs"
+        )
+        n_draws = st.select_slider("Number of Draws", [10_000, 50_000, 100_000, 250_000], value=100_000, key="mc_draws")
+
+        distributions = {}
+        for key in simulated_inputs:
+            current_value = float(current_input_values[key])
+            dist_col, low_col, high_col = st.columns(3)
+            distribution = dist_col.selectbox(INPUT_DESCRIPTIONS.get(key, key), DISTRIBUTIONS, key=f"mc_dist_{key}")
+            low = low_col.number_input("Low", value=current_value * 0.8, key=f"mc_low_{key}")
+            high = high_col.number_input("High", value=current_value * 1.2, key=f"mc_high_{key}")
+            try:
+                distributions[key] = distribution_from_range(distribution, low, high, mode=current_value)
+            except ValueError as e:
+                st.warning(f"{INPUT_DESCRIPTIONS.get(key, key)}: {str(e)}")
+        st.caption("Triangular distributions peak at the current value; for normal and lognormal, low/high is a 95% range.")
+
+    if distributions:
+        with stage("Monte Carlo: simulation"):
+            simulation = run_cached_simulation(current_input_values, distributions, n_draws, seed=42)
+            simulation_summary = summarize_simulation(simulation)
+        npv_pct = simulation_summary['npv_percentiles']
+        roi_pct = simulation_summary['roi_percentiles']
+
+        sim_col1, sim_col2, sim_col3, sim_col4 = st.columns(4)
+        sim_col1.metric("Median NPV (P50)", f"{currency_symbol}{npv_pct[50]:,.0f}")
+        sim_col2.metric("NPV Range (P5 - P95)", f"{currency_symbol}{npv_pct[5]/1000:,.0f}K - {currency_symbol}{npv_pct[95]/1000:,.0f}K")
+        sim_col3.metric("Probability NPV > 0", f"{simulation_summary['probability_positive_npv']*100:.1f}%")
+        sim_col4.metric(f"Probability of Payback within {evaluation_years} Years",
+                        f"{simulation_summary['probability_payback_within_horizon']*100:.1f}%")
+
+        percentile_df = pd.DataFrame({
+            'Percentile': [f"P{p}" for p in npv_pct],
+            'NPV': [f"{currency_symbol}{v:,.0f}" for v in npv_pct.values()],
+            'ROI': [f"{v*100:.1f}%" for v in roi_pct.values()],
+            'Payback (Months)': [
+                f"{simulation_summary['payback_months_percentiles'][p]:.1f}" if simulation_summary['payback_months_percentiles'] else "N/A"
+                for p in npv_pct
+            ]
+        })
+        st.dataframe(percentile_df, hide_index=True)
+
+        hist_col1, hist_col2 = st.columns(2)
+        with hist_col1, stage("chart: NPV histogram", 'chart'):
+            st.plotly_chart(create_simulation_histogram(
+                simulation['npv'], f"NPV Distribution ({n_draws:,} draws)", f"NPV ({currency_symbol})", '#4ecdc4',
+                {'P5': npv_pct[5], 'P50': npv_pct[50], 'P95': npv_pct[95]}
+            ), use_container_width=True)
+        with hist_col2, stage("chart: payback histogram", 'chart'):
+            paid_back = simulation['payback_months'][np.isfinite(simulation['payback_months'])]
+            if len(paid_back) > 0:
+                st.plotly_chart(create_simulation_histogram(
+                    paid_back, "Payback Month Distribution (draws reaching payback)", "Payback (Months)", '#45b7d1',
+                    {'P50': float(np.median(paid_back)), 'Horizon': evaluation_years * 12}
+                ), use_container_width=True)
+            else:
+                st.warning("No simulated draw ever reaches payback.")
+    else:
+        st.write("Select at least one input to simulate.")
+
+monte_carlo_panel()
+
+st.markdown("---")
+
+# --- Portfolio Scoring ---
+st.header("Portfolio Scoring")
+st.info("Score many customers at once: upload a CSV with one row per customer and one column per input (column names as in the configuration export).")
+
+BREAK_EVEN_COLUMN = f"Max Subscription Cost ({downside_scenario} NPV ≥ 0)"
+MAX_LISTED_INVALID_ROWS = 20
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def score_cached_portfolio(csv_content, scenarios, include_break_even, break_even_scenario):
+    """Cached portfolio scoring so the table can be sorted and filtered without re-scoring"""
+    portfolio = score_portfolio(csv_content, scenarios)
+    table = portfolio_table(portfolio)
+    if include_break_even:
+        table[f"Max Subscription Cost ({break_even_scenario} NPV ≥ 0)"] = solve_break_even_columns(
+            portfolio['inputs'], 'platform_cost', 'npv', 0.0, break_even_scenario, scenarios=scenarios)['value']
+    results_df = pd.DataFrame(table).replace([np.inf, -np.inf], np.nan)
+    return results_df, portfolio['warnings'], portfolio['invalid_rows']
+
+@st.fragment
+@profiled_run("panel: portfolio", session_profiler)
+def portfolio_panel():
+    """Portfolio upload and results (a fragment: its widgets rerun only this panel)"""
+    portfolio_col1, portfolio_col2 = st.columns([3, 1])
+    with portfolio_col1:
+        portfolio_file = st.file_uploader("Upload portfolio CSV", type=['csv'], key="portfolio_file")
+    with portfolio_col2:
+        st.download_button(
+            label="📄 Download Portfolio Template",
+            data=portfolio_template_csv(get_all_input_values(), rows=3),
+            file_name="bva_portfolio_template.csv",
+            mime="text/csv"
+        )
+
+    include_break_even = st.checkbox(f"Add deal-desk column: highest subscription cost keeping {downside_scenario} NPV ≥ 0", key="portfolio_break_even")
+
+    if portfolio_file is not None:
+        try:
+            with stage("portfolio: scoring"):
+                portfolio_df, portfolio_warnings, invalid_rows = score_cached_portfolio(
+                    portfolio_file.getvalue().decode('utf-8-sig'), scenarios, include_break_even, downside_scenario)
+        except (ValueError, UnicodeDecodeError) as e:
+            st.error(f"Could not score portfolio: {str(e)}")
+        else:
+            for warning in portfolio_warnings:
+                st.warning(warning)
+            if invalid_rows:
+                shown = "\n".join(f"- {message}" for message in invalid_rows[:MAX_LISTED_INVALID_ROWS])
+                more = len(invalid_rows) - MAX_LISTED_INVALID_ROWS
+                st.error(f"{len(invalid_rows):,} row(s) with invalid values were not scored:\n{shown}"
+                         + (f"\n\n…and {more:,} more" if more > 0 else ""))
+
+            expected_npvs = portfolio_df[f'{reference_scenario} NPV']
+            pf_col1, pf_col2, pf_col3, pf_col4 = st.columns(4)
+            pf_col1.metric("Customers", f"{len(portfolio_df):,}")
+            pf_col2.metric(f"Total {reference_scenario} NPV", f"{expected_npvs.sum():,.0f}")
+            pf_col3.metric(f"Customers with Positive {reference_scenario} NPV", f"{(expected_npvs > 0).mean()*100:.1f}%")
+            pf_col4.metric(f"Median {reference_scenario} Payback", format_payback(portfolio_df[f'{reference_scenario} Payback (Months)'].fillna(np.inf).median(), "months"))
+
+            money_format = st.column_config.NumberColumn(format="localized")
+            st.dataframe(
+                portfolio_df,
+                hide_index=True,
+                column_config={
+                    **{column: money_format for column in portfolio_df.columns
+                       if column.endswith('NPV') or column in ('Annual Benefits', BREAK_EVEN_COLUMN)},
+                    **{column: st.column_config.NumberColumn(format="%.1f") for column in portfolio_df.columns
+                       if column.endswith(('ROI (%)', 'IRR (%)', 'Payback (Months)'))}
+                }
+            )
+            st.caption("Click a column header to sort. Amounts are in each customer's own currency; an empty payback cell means "
+                       "payback is never reached, an empty IRR or MIRR cell means the rate is not defined and an empty break-even cell means no subscription cost reaches the target.")
+            st.download_button(
+                label="📊 Download Portfolio Results",
+                data=portfolio_df.to_csv(index=False),
+                file_name=f"BVA_Portfolio_Results_{datetime.now().strftime('%Y%m%d')}.csv",
+                mime="text/csv"
+            )
+
+portfolio_panel()
+
 st.markdown("---")
 
 # --- Show BVA Calculations Section ---
 st.header("Show BVA Calculations")
+
+def build_calculation_lines():
+    """Lines of the detailed calculations expander"""
+    return [
+        f"**Cost per Alert:** {currency_symbol}{cost_per_alert:,.2f}",
+        f"**Total Annual Alert Handling Cost:** {currency_symbol}{total_alert_handling_cost:,.0f}",
+        f"**FTE Time % on Alerts:** {alert_fte_percentage*100:.1f}%",
+        f"**Cost per Incident:** {currency_symbol}{cost_per_incident:,.2f}",
+        f"**Total Annual Incident Handling Cost:** {currency_symbol}{total_incident_handling_cost:,.0f}",
+        f"**Incident Triage Time Savings (Annual):** {currency_symbol}{incident_triage_savings:,.0f}",
+        f"**Major Incident MTTR Savings (Annual):** {currency_symbol}{major_incident_savings:,.0f}",
+        f"---",
+        f"**Total Operational Savings from Alert/Incident Management (Annual):** {currency_symbol}{total_operational_savings_from_time_saved:,.0f}",
+        f"**Total Additional Benefits (Tool Consolidaton, FTE Avoidance, etc.) (Annual):** {currency_symbol}{tool_savings + people_cost_per_year + fte_avoidance + sla_penalty_avoidance + revenue_growth + capex_savings + opex_savings:,.0f}",
+        f"**TOTAL ANNUAL BASELINE BENEFITS:** {currency_symbol}{total_annual_benefits:,.0f}",
+        f"---",
+        f"**Effective Average FTE Salary:** {currency_symbol}{effective_avg_fte_salary:,.0f}",
+        f"**Equivalent FTEs from Operational Savings:** {equivalent_ftes_from_savings:,.1f} FTEs"
+    ]
+
 with st.expander("Click to view detailed calculations"):
     st.markdown("### Cost per Alert/Incident")
-    st.write(f"**Cost per Alert:** {currency_symbol}{cost_per_alert:,.2f}")
-    st.write(f"**Total Annual Alert Handling Cost:** {currency_symbol}{total_alert_handling_cost:,.0f}")
-    st.write(f"**FTE Time % on Alerts:** {alert_fte_percentage*100:.1f}%")
-    st.write(f"**Cost per Incident:** {currency_symbol}{cost_per_incident:,.2f}")
-    st.write(f"**Total Annual Incident Handling Cost:** {currency_symbol}{total_incident_handling_cost:,.0f}")
-    st.write(f"**Incident Triage Time Savings (Annual):** {currency_symbol}{incident_triage_savings:,.0f}")
-    st.write(f"**Major Incident MTTR Savings (Annual):** {currency_symbol}{major_incident_savings:,.0f}")
-    st.write(f"---")
-    st.write(f"**Total Operational Savings from Alert/Incident Management (Annual):** {currency_symbol}{total_operational_savings_from_time_saved:,.0f}")
-    st.write(f"**Total Additional Benefits (Tool Consolidaton, FTE Avoidance, etc.) (Annual):** {currency_symbol}{tool_savings + people_cost_per_year + fte_avoidance + sla_penalty_avoidance + revenue_growth + capex_savings + opex_savings:,.0f}")
-    st.write(f"**TOTAL ANNUAL BASELINE BENEFITS:** {currency_symbol}{total_annual_benefits:,.0f}")
-    st.write(f"---")
-    st.write(f"**Effective Average FTE Salary:** {currency_symbol}{effective_avg_fte_salary:,.0f}")
-    st.write(f"**Equivalent FTEs from Operational Savings:** {equivalent_ftes_from_savings:,.1f} FTEs")
+    for line in section_content('calculations', build_calculation_lines):
+        st.write(line)
 
 st.markdown("---")
 
@@ -1401,58 +1250,53 @@ st.markdown("---")
 st.header("Stakeholder Value Propositions")
 st.info("Tailored value messages for key stakeholders, highlighting the benefits most relevant to their roles.")
 
-stakeholder_tabs = st.tabs(["CIO", "CTO", "CFO", "Operations Manager", "Service Desk Manager"])
+def build_stakeholder_messages():
+    """Heading and value message for each stakeholder tab"""
+    expected = scenario_results[reference_scenario]
+    conservative = scenario_results[downside_scenario]
+    conservative_payback_text = format_payback(conservative['payback_months'], "months", evaluation_years * 12)
+    expected_payback_text = format_payback(expected['payback_months'], "months", evaluation_years * 12)
 
-with stakeholder_tabs[0]: # CIO
-    st.subheader("For the CIO (Chief Information Officer)")
-    st.markdown(f"""
+    return [
+        ("For the CIO (Chief Information Officer)", f"""
     **Strategic Alignment & Digital Transformation:**
     Implementing {solution_name} is a strategic move towards a more proactive and agile IT environment. 
     By automating repetitive tasks and providing unified visibility, we can free up IT resources to focus on innovation and digital transformation initiatives that directly impact business growth. 
-    The projected **{currency_symbol}{scenario_results['Expected']['npv']:,.0f} NPV** and **{scenario_results['Expected']['roi']*100:.1f}% ROI** over {evaluation_years} years demonstrate a strong financial case for this investment.
+    The projected **{currency_symbol}{expected['npv']:,.0f} NPV** and **{expected['roi']*100:.1f}% ROI** over {evaluation_years} years demonstrate a strong financial case for this investment.
     
-    Even under the conservative scenario, the solution still delivers a positive **{scenario_results['Conservative']['roi']*100:.1f}% ROI** with a payback period of **{scenario_results['Conservative']['payback_months']}**, affirming its robust value.
+    Even under the {downside_scenario} scenario, the solution still delivers a positive **{conservative['roi']*100:.1f}% ROI** with a payback period of **{conservative_payback_text}**, affirming its robust value.
 
     **Key Benefits for the CIO:**
     * **Enhanced Service Delivery:** Proactive identification and resolution of issues lead to higher application availability and improved customer satisfaction.
     * **Operational Excellence:** Standardizes and automates IT operations, reducing manual effort and human error across the organization.
     * **Resource Optimization:** Reallocates **{equivalent_ftes_from_savings:,.1f} FTEs equivalent in savings** from reactive tasks to strategic projects, optimizing IT spending.
     * **Improved Decision Making:** Provides comprehensive insights into IT performance, enabling data-driven strategic planning.
-    """)
-
-with stakeholder_tabs[1]: # CTO
-    st.subheader("For the CTO (Chief Technology Officer)")
-    st.markdown(f"""
+    """),
+        ("For the CTO (Chief Technology Officer)", f"""
     **Technology Modernization & Resiliency:**
     {solution_name} directly addresses the complexities of our hybrid IT landscape, improving overall system resiliency and performance. 
     Its advanced AI/ML capabilities will enable us to move from reactive troubleshooting to predictive problem resolution, ensuring our technology stack supports business demands effectively.
     
-    Even with conservative assumptions, the technology proves its worth, offering a **{scenario_results['Conservative']['roi']*100:.1f}% ROI** and reaching payback in **{scenario_results['Conservative']['payback_months']}**.
+    Even with {downside_scenario} assumptions, the technology proves its worth, offering a **{conservative['roi']*100:.1f}% ROI** and reaching payback in **{conservative_payback_text}**.
 
     **Key Benefits for the CTO:**
     * **Reduced MTTR:** A **{mttr_improvement_pct:.0f}% reduction in MTTR for major incidents** translates to significant cost savings of **{currency_symbol}{major_incident_savings:,.0f} annually** and minimized business disruption.
     * **Proactive Problem Solving:** AI-driven insights help identify root causes faster and even predict potential issues before they impact services.
     * **Scalability & Efficiency:** Automates routine operational tasks, allowing technical teams to scale operations without proportional headcount increases.
     * **Unified Observability:** Provides a single pane of glass for all infrastructure and application performance, breaking down data silos.
-    """)
-
-with stakeholder_tabs[2]: # CFO
-    st.subheader("For the CFO (Chief Financial Officer)")
-    st.markdown(f"""
+    """),
+        ("For the CFO (Chief Financial Officer)", f"""
     **Strong Financial Returns & Cost Optimization:**
-    This investment in {solution_name} is projected to deliver substantial financial returns, with an **Expected Net Present Value of {currency_symbol}{scenario_results['Expected']['npv']:,.0f}** and an **ROI of {scenario_results['Expected']['roi']*100:.1f}%** over {evaluation_years} years. 
-    The rapid payback period of **{scenario_results['Expected']['payback_months']}** ensures a quick return on our investment.
+    This investment in {solution_name} is projected to deliver substantial financial returns, with an **{reference_scenario} Net Present Value of {currency_symbol}{expected['npv']:,.0f}** and an **ROI of {expected['roi']*100:.1f}%** over {evaluation_years} years. 
+    The rapid payback period of **{expected_payback_text}** ensures a quick return on our investment.
     
-    Critically, even in the most conservative scenario, the solution demonstrates a positive **{scenario_results['Conservative']['roi']*100:.1f}% ROI** and achieves payback within **{scenario_results['Conservative']['payback_months']}**, confirming its financial viability under various conditions.
+    Critically, even in the {downside_scenario} scenario, the solution demonstrates a positive **{conservative['roi']*100:.1f}% ROI** and achieves payback within **{conservative_payback_text}**, confirming its financial viability under various conditions.
 
     **Key Benefits for the CFO:**
     * **Significant Cost Savings:** Achieves **{currency_symbol}{total_operational_savings_from_time_saved:,.0f} in annual operational savings** from reduced alert/incident volumes and improved efficiency.
     * **Predictable Budgeting:** Streamlined operations lead to more predictable and manageable IT operational expenditures.
-    """)
-
-with stakeholder_tabs[3]: # Operations Manager
-    st.subheader("For the Operations Manager")
-    st.markdown(f"""
+    """),
+        ("For the Operations Manager", f"""
     **Streamlined Operations & Reduced Toil:**
     {solution_name} will significantly enhance our operational efficiency by reducing noise and automating routine tasks. 
     This means fewer false alarms, faster triage, and more time for your teams to focus on impactful work rather than constant firefighting.
@@ -1462,11 +1306,8 @@ with stakeholder_tabs[3]: # Operations Manager
     * **Faster Triage & Resolution:** Improve average alert triage time by **{alert_triage_time_saved_pct:.0f}%** and incident triage by **{incident_triage_time_savings_pct:.0f}%**, saving significant time and effort.
     * **Automated Workflows:** Automate repetitive responses to common issues, improving consistency and speed.
     * **Improved Team Morale:** Reduce alert fatigue and empower your team with better tools and a clearer focus.
-    """)
-
-with stakeholder_tabs[4]: # Service Desk Manager
-    st.subheader("For the Service Desk Manager")
-    st.markdown(f"""
+    """),
+        ("For the Service Desk Manager", f"""
     **Enhanced Service Quality & Customer Satisfaction:**
     {solution_name} will empower your service desk with more accurate and actionable information, enabling faster resolution of user-reported issues and even preventing issues before users notice them.
     
@@ -1476,6 +1317,15 @@ with stakeholder_tabs[4]: # Service Desk Manager
     * **Proactive Issue Resolution:** By integrating with IT operations, many issues can be resolved before they escalate to user-impacting problems.
     * **Clearer Communication:** Provides real-time status and impact assessments, improving communication with end-users during outages.
     """)
+    ]
+
+stakeholder_tabs = st.tabs(["CIO", "CTO", "CFO", "Operations Manager", "Service Desk Manager"])
+
+for stakeholder_tab, (stakeholder_heading, stakeholder_message) in zip(
+        stakeholder_tabs, section_content('stakeholders', build_stakeholder_messages)):
+    with stakeholder_tab:
+        st.subheader(stakeholder_heading)
+        st.markdown(stakeholder_message)
 
 
 st.markdown("---")
@@ -1483,24 +1333,51 @@ st.markdown("---")
 # --- Executive Report Generation ---
 st.header("Generate Executive Report")
 
-if REPORT_DEPENDENCIES_AVAILABLE:
-    st.write("Generate a professional PDF executive summary of this Business Value Assessment.")
-    
-    org_name_for_report = st.text_input("Your Organization Name (for report)", value="My Company", key="org_name_report")
-
-    if st.button("Generate PDF Report"):
-        with st.spinner("Generating PDF report..."):
-            summary_data_for_report = create_executive_summary_data(scenario_results, currency_symbol)
-            pdf_buffer = generate_executive_report_pdf(summary_data_for_report, scenario_results, solution_name, org_name_for_report)
-            if pdf_buffer:
-                st.download_button(
-                    label="Download PDF Report",
-                    data=pdf_buffer,
-                    file_name=f"{org_name_for_report}_{solution_name}_BVA_Report.pdf",
-                    mime="application/pdf"
-                )
-            else:
-                st.error("Failed to generate PDF report. Please check if reportlab dependencies are installed correctly.")
-else:
-    st.warning("To generate PDF reports, please install `reportlab` and `matplotlib` (`pip install reportlab matplotlib`).")
-
+@st.fragment
+@profiled_run("panel: report", session_profiler)
+def report_panel():
+    """Report generation (a fragment: editing the organization name reruns only this panel)"""
+    if REPORT_DEPENDENCIES_AVAILABLE:
+        st.write("Generate a professional PDF executive summary of this Business Value Assessment.")
+
+        org_name_for_report = st.text_input("Your Organization Name (for report)", value="My Company", key="org_name_report")
+
+        if st.button("Generate PDF Report"):
+            with st.spinner("Generating PDF report..."):
+                # Served from the report cache when inputs, organization and report version are unchanged
+                with stage("pdf: report", 'report'):
+                    pdf_bytes = render_report_pdf(get_all_input_values(), org_name_for_report, scenarios)
+                if pdf_bytes:
+                    st.download_button(
+                        label="Download PDF Report",
+                        data=pdf_bytes,
+                        file_name=f"{org_name_for_report}_{solution_name}_BVA_Report.pdf",
+                        mime="application/pdf"
+                    )
+                else:
+                    st.error("Failed to generate PDF report. Please check if reportlab dependencies are installed correctly.")
+    else:
+        st.warning("To generate PDF reports, please install `reportlab` (`pip install reportlab`).")
+
+report_panel()
+
+cache_stats_placeholder.json({
+    'model': ASSESSMENT_CACHE.stats(),
+    'sweeps': SWEEP_CACHE.stats(),
+    'reports': REPORT_CACHE.stats(),
+    'sections_rebuilt': rebuilt_sections
+})
+
+if profiler:
+    profiler.end_run()
+    last_run = profiler.runs[-1]
+    with profile_placeholder.container():
+        st.metric("Last full rerun", f"{last_run['dur'] / 1000:,.0f} ms")
+        st.dataframe(pd.DataFrame(profiler.stage_table(last_run)), hide_index=True)
+        st.download_button(
+            label="Download Chrome Trace (JSON)",
+            data=json.dumps(profiler.chrome_trace()),
+            file_name=f"bva_trace_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+            mime="application/json",
+            help="Recent reruns of this session; open in chrome://tracing or ui.perfetto.dev"
+        )
@@ -0,0 +1,155 @@
+# Batch executive report generation for a directory of exported configurations
+#
+# Usage: python bva_batch.py CONFIG_DIR OUTPUT_DIR [--workers N] [--no-resume]
+#
+# Each *.json file (as written by export_to_json) becomes OUTPUT_DIR/<name>.pdf. Reports are
+# rendered across a process pool; manifest.json in OUTPUT_DIR records per-report status and
+# timing, and is rewritten after every report so an interrupted run resumes where it stopped.
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from bva_config import parse_configuration_json, validated_input_values
+from bva_report import REPORT_DEPENDENCIES_AVAILABLE, render_report_pdf
+
+MANIFEST_NAME = "manifest.json"
+
+def new_file_mode():
+    """Permissions open() gives a new file under the current umask (mkstemp files are 0600)"""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+def _write_atomic(path, data):
+    """Write bytes to path via a temporary file so readers never see partial output"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    os.chmod(tmp_path, new_file_mode())
+    os.replace(tmp_path, path)
+
+def _file_sha256(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def organization_name_for(config_path):
+    """Organization name used in the report, taken from the configuration file name"""
+    return os.path.splitext(os.path.basename(config_path))[0].replace('_', ' ')
+
+def render_report_file(config_path, output_path, organization_name=None):
+    """Render one configuration file to a PDF (runs in a worker process); returns its manifest entry"""
+    started = time.perf_counter()
+    entry = {
+        'config': os.path.basename(config_path),
+        'output': os.path.basename(output_path),
+        'pid': os.getpid()
+    }
+    try:
+        # Hashed and parsed from the same read, so the manifest matches the rendered configuration
+        with open(config_path, 'rb') as f:
+            content = f.read()
+        entry['config_sha256'] = hashlib.sha256(content).hexdigest()
+        input_values = validated_input_values(parse_configuration_json(content.decode('utf-8')))
+        pdf_bytes = render_report_pdf(input_values, organization_name or organization_name_for(config_path))
+        _write_atomic(output_path, pdf_bytes)
+        entry.update({'status': 'ok', 'bytes': len(pdf_bytes)})
+    except Exception as e:
+        entry.update({'status': 'failed', 'error': f"{type(e).__name__}: {str(e)}"})
+    entry['seconds'] = round(time.perf_counter() - started, 4)
+    entry['finished'] = datetime.now().isoformat()
+    return entry
+
+def load_manifest(output_dir):
+    """Load an existing manifest, or start a new one"""
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'reports': {}}
+
+def save_manifest(output_dir, manifest):
+    _write_atomic(os.path.join(output_dir, MANIFEST_NAME), json.dumps(manifest, indent=2).encode('utf-8'))
+
+def _is_complete(entry, config_path, output_path):
+    """A report is done if it succeeded for the same configuration and its PDF still exists"""
+    return (
+        entry is not None and entry.get('status') == 'ok' and os.path.exists(output_path)
+        and entry.get('config_sha256') == _file_sha256(config_path)
+    )
+
+def run_batch(config_dir, output_dir, workers=None, resume=True, organization_name=None, progress=None):
+    """Render a report for every JSON configuration in config_dir; returns the manifest"""
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = load_manifest(output_dir) if resume else {'reports': {}}
+    reports = manifest['reports']
+
+    config_names = sorted(name for name in os.listdir(config_dir) if name.lower().endswith('.json'))
+    jobs = []
+    skipped = 0
+    for name in config_names:
+        config_path = os.path.join(config_dir, name)
+        output_path = os.path.join(output_dir, os.path.splitext(name)[0] + '.pdf')
+        if resume and _is_complete(reports.get(name), config_path, output_path):
+            skipped += 1
+            continue
+        jobs.append((config_path, output_path))
+
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    manifest.update({'started': datetime.now().isoformat(), 'workers': workers})
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(render_report_file, config_path, output_path, organization_name)
+                   for config_path, output_path in jobs]
+        for completed, future in enumerate(as_completed(futures), start=1):
+            entry = future.result()
+            reports[entry['config']] = entry
+            save_manifest(output_dir, manifest)
+            if progress:
+                progress(completed, len(jobs), entry)
+
+    statuses = [reports[name].get('status') for name in config_names if name in reports]
+    manifest['finished'] = datetime.now().isoformat()
+    manifest['summary'] = {
+        'configurations': len(config_names),
+        'rendered': len(jobs),
+        'skipped': skipped,
+        'ok': statuses.count('ok'),
+        'failed': statuses.count('failed'),
+        'wall_seconds': round(time.perf_counter() - started, 3),
+        'render_seconds': round(sum(reports[os.path.basename(config_path)]['seconds'] for config_path, _ in jobs), 3)
+    }
+    save_manifest(output_dir, manifest)
+    return manifest
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render executive PDF reports for a directory of BVA configurations")
+    parser.add_argument("config_dir", help="Directory of JSON configurations written by the export function")
+    parser.add_argument("output_dir", help="Directory for the PDFs and manifest.json")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--organization", default=None, help="Organization name for every report (default: file name)")
+    parser.add_argument("--no-resume", action="store_true", help="Re-render reports already completed in the manifest")
+    args = parser.parse_args(argv)
+
+    if not REPORT_DEPENDENCIES_AVAILABLE:
+        print("reportlab is required (pip install reportlab)", file=sys.stderr)
+        return 2
+
+    def progress(completed, total, entry):
+        detail = f"{entry['seconds']:.2f}s" if entry['status'] == 'ok' else entry['error']
+        print(f"[{completed}/{total}] {entry['config']}: {entry['status']} ({detail})", file=sys.stderr)
+
+    manifest = run_batch(args.config_dir, args.output_dir, workers=args.workers,
+                         resume=not args.no_resume, organization_name=args.organization, progress=progress)
+    print(json.dumps(manifest['summary'], indent=2))
+    return 1 if manifest['summary']['failed'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
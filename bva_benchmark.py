@@ -0,0 +1,220 @@
+# Micro-benchmarks of the model, configuration export/import and report rendering
+#
+# Usage: python bva_benchmark.py [--save] [--baseline PATH] [--threshold PCT] [--filter TEXT] [--template NAME]
+#
+# Every benchmark runs once per industry template. The best per-call time over several repeats
+# is compared with the stored baseline (bva_benchmark_baseline.json); the run exits with status 1
+# when any benchmark is slower than its baseline by more than the threshold. Only the engine,
+# config and report modules are imported, so it runs headless without Streamlit.
+
+import argparse
+import json
+import os
+import platform
+import sys
+import timeit
+from datetime import datetime
+
+import numpy as np
+
+from bva_config import (INDUSTRY_TEMPLATES, complete_input_values, export_to_csv, export_to_json,
+                        parse_configuration_csv, parse_configuration_json)
+from bva_engine import (DEFAULT_SCENARIOS, calculate_alert_costs, calculate_annual_benefits, calculate_payback_months,
+                        calculate_scenario_results, define_scenarios, get_monthly_cumulative_cash_flow, run_assessment)
+from bva_report import (REPORT_DEPENDENCIES_AVAILABLE, create_executive_summary_data, create_scenario_chart_for_pdf,
+                        create_timeline_chart_for_pdf, generate_executive_report_pdf)
+
+DEFAULT_BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bva_benchmark_baseline.json")
+
+# Slowdown (percent over baseline) reported as a regression
+DEFAULT_THRESHOLD_PCT = 25.0
+
+# Staffing and costs the templates leave open, so every template has non-trivial benefits and cash flows
+BENCHMARK_BASE_INPUTS = {
+    'alert_ftes': 20,
+    'avg_alert_fte_salary': 90000,
+    'alert_triage_time_saved_pct': 30,
+    'incident_ftes': 30,
+    'avg_incident_fte_salary': 95000,
+    'incident_triage_time_savings_pct': 30,
+    'avg_major_incident_cost': 10000,
+    'avg_mttr_hours': 4.0,
+    'platform_cost': 500000,
+    'services_cost': 150000
+}
+
+# A 20-scenario review (multiplier grid, every other scenario with a subscription cost override);
+# it is evaluated in the same vectorized pass as the three default scenarios
+REVIEW_SCENARIOS = define_scenarios({
+    f"Review {index + 1}": {
+        'benefits_multiplier': 0.6 + 0.05 * index,
+        'implementation_delay_multiplier': 1.4 - 0.03 * index,
+        'platform_cost': 400000 if index % 2 else None
+    }
+    for index in range(20)
+})
+
+# A 15-year horizon with escalating volumes, salaries and subscription plus a per-year incident cost
+LONG_HORIZON_INPUTS = {
+    'evaluation_years': 15,
+    'alert_volume_growth_pct': 8.0,
+    'incident_volume_growth_pct': 5.0,
+    'salary_inflation_pct': 3.0,
+    'platform_cost_escalation_pct': 4.0,
+    'avg_major_incident_cost_by_year': '10000, 12000, 15000'
+}
+
+def template_inputs(template_name):
+    """Representative full input values for an industry template"""
+    return complete_input_values(dict(BENCHMARK_BASE_INPUTS, **INDUSTRY_TEMPLATES[template_name],
+                                      industry_template=template_name))
+
+def _render_drawing(drawing):
+    """Lay out and render a chart Drawing on its own PDF page (charts are built lazily)"""
+    from reportlab.graphics import renderPDF
+    return renderPDF.drawToString(drawing)
+
+def _benchmark_calls(inputs):
+    """Benchmark name -> zero-argument call for one configuration (setup is done here, untimed)"""
+    benefits = calculate_annual_benefits(inputs)
+    total_annual_benefits = benefits['total_annual_benefits']
+    expected = DEFAULT_SCENARIOS['Expected']
+    cash_flow_args = (total_annual_benefits, inputs['platform_cost'], inputs['services_cost'],
+                      inputs['implementation_delay'], inputs['benefits_ramp_up'])
+    csv_content = export_to_csv(inputs)
+    json_content = export_to_json(inputs)
+    long_horizon_inputs = dict(inputs, **LONG_HORIZON_INPUTS)
+
+    calls = {
+        'calculate_alert_costs': lambda: calculate_alert_costs(
+            inputs['alert_volume'], inputs['alert_ftes'], inputs['avg_alert_triage_time'], inputs['avg_alert_fte_salary'],
+            inputs['hours_per_day'], inputs['days_per_week'], inputs['weeks_per_year'], inputs['holiday_sick_days']),
+        'calculate_scenario_results': lambda: calculate_scenario_results(
+            inputs, total_annual_benefits, expected['benefits_multiplier'], expected['implementation_delay_multiplier'],
+            'Expected'),
+        'calculate_payback_months': lambda: calculate_payback_months(*cash_flow_args),
+        'get_monthly_cumulative_cash_flow': lambda: get_monthly_cumulative_cash_flow(
+            *cash_flow_args, inputs['evaluation_years']),
+        'run_assessment_3_scenarios': lambda: run_assessment(inputs),
+        'run_assessment_20_scenarios': lambda: run_assessment(inputs, REVIEW_SCENARIOS),
+        'run_assessment_15_years_escalating': lambda: run_assessment(long_horizon_inputs),
+        'export_to_csv': lambda: export_to_csv(inputs),
+        'import_from_csv': lambda: parse_configuration_csv(csv_content),
+        'export_to_json': lambda: export_to_json(inputs),
+        'import_from_json': lambda: parse_configuration_json(json_content)
+    }
+
+    if REPORT_DEPENDENCIES_AVAILABLE:
+        assessment = run_assessment(inputs)
+        scenario_results = assessment['scenario_results']
+        summary_data = create_executive_summary_data(scenario_results, inputs['currency'], assessment['benefits'], inputs)
+        calls.update({
+            'create_timeline_chart_for_pdf': lambda: _render_drawing(create_timeline_chart_for_pdf(
+                inputs['implementation_delay'], inputs['benefits_ramp_up'], inputs['evaluation_years'])),
+            'create_scenario_chart_for_pdf': lambda: _render_drawing(create_scenario_chart_for_pdf(
+                scenario_results, inputs['currency'])),
+            'generate_executive_report_pdf': lambda: generate_executive_report_pdf(
+                summary_data, scenario_results, inputs['solution_name'])
+        })
+    return calls
+
+def time_call(call, repeat=3, min_time=0.2):
+    """Best seconds per call over repeat samples, each looping the call for at least min_time"""
+    timer = timeit.Timer(call)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9)) + 1)
+    samples = [elapsed] + timer.repeat(repeat=repeat - 1, number=number)
+    return min(samples) / number
+
+def run_benchmarks(templates=None, repeat=3, min_time=0.2, name_filter=None, progress=None):
+    """Time every benchmark for every template; returns {'<benchmark>[<template>]': seconds per call}"""
+    results = {}
+    for template_name in templates or INDUSTRY_TEMPLATES:
+        for name, call in _benchmark_calls(template_inputs(template_name)).items():
+            label = f"{name}[{template_name}]"
+            if name_filter and name_filter not in label:
+                continue
+            results[label] = time_call(call, repeat, min_time)
+            if progress:
+                progress(label, results[label])
+    return results
+
+def compare_to_baseline(results, baseline, threshold_pct=DEFAULT_THRESHOLD_PCT):
+    """Per-benchmark ratio to the baseline time and the labels slower than the threshold allows"""
+    ratios = {label: seconds / baseline[label] for label, seconds in results.items() if baseline.get(label)}
+    regressions = [label for label, ratio in ratios.items() if ratio > 1 + threshold_pct / 100]
+    return ratios, regressions
+
+def load_baseline(path):
+    """Stored baseline timings ({} when no baseline has been saved yet)"""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)['results']
+
+def save_baseline(path, results):
+    """Write timings as the new baseline, with the environment they were measured in"""
+    baseline = {
+        'metadata': {
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'processor': platform.processor() or platform.machine()
+        },
+        'results': results
+    }
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+def format_report(results, ratios, regressions, threshold_pct):
+    """Text table of timings against the baseline"""
+    lines = []
+    for label, seconds in results.items():
+        ratio = ratios.get(label)
+        versus = f"{ratio:6.2f}x baseline" if ratio is not None else "   (no baseline)"
+        flag = "  REGRESSION" if label in regressions else ""
+        lines.append(f"  {label:<58}{seconds * 1e3:>11.3f} ms  {versus}{flag}")
+    if regressions:
+        lines.append(f"{len(regressions)} benchmark(s) more than {threshold_pct:g}% slower than baseline")
+    else:
+        lines.append(f"No benchmark more than {threshold_pct:g}% slower than baseline")
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the BVA model, export/import and report rendering")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH, help="Baseline timings file")
+    parser.add_argument("--save", action="store_true", help="Store this run's timings as the new baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD_PCT,
+                        help="Slowdown over baseline (percent) that counts as a regression")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing samples per benchmark (best is kept)")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds per timing sample")
+    parser.add_argument("--filter", default=None, help="Only run benchmarks whose label contains this text")
+    parser.add_argument("--template", action="append", choices=list(INDUSTRY_TEMPLATES),
+                        help="Industry template to benchmark (repeatable; default: all)")
+    args = parser.parse_args(argv)
+
+    if not REPORT_DEPENDENCIES_AVAILABLE:
+        print("reportlab is not installed; skipping chart and PDF benchmarks", file=sys.stderr)
+
+    def progress(label, seconds):
+        print(f"{label}: {seconds * 1e3:.3f} ms", file=sys.stderr)
+
+    results = run_benchmarks(args.template, args.repeat, args.min_time, args.filter, progress)
+    if args.save:
+        # Merge so a filtered run only replaces the benchmarks it measured
+        save_baseline(args.baseline, dict(load_baseline(args.baseline), **results))
+        print(f"Saved {len(results)} timings to {args.baseline}")
+        return 0
+
+    ratios, regressions = compare_to_baseline(results, load_baseline(args.baseline), args.threshold)
+    print(format_report(results, ratios, regressions, args.threshold))
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
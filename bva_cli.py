@@ -0,0 +1,230 @@
+# Command-line scoring: scenario metrics (and optionally executive PDFs) for exported configurations
+#
+# Usage: python bva_cli.py [CONFIG ...] [--format json|csv] [--cash-flows] [--pdf PATH | --pdf-dir DIR]
+#                          [--scenarios SCENARIOS.json]
+#        some_command | python bva_cli.py --format csv
+#
+# Each CONFIG is read as CSV (export_to_csv) when it ends in .csv and as JSON (export_to_json) otherwise.
+# With no CONFIG, or "-", stdin is read: JSON Lines (one configuration per line, scored and written in
+# batches as they arrive) or a single JSON or CSV document. --scenarios replaces the default scenarios with
+# a JSON object of scenario name -> parameters (see define_scenarios in bva_engine). Metrics are written to stdout as one JSON
+# object per configuration or as CSV rows per scenario. Streamlit is never imported and the report
+# stack only with --pdf/--pdf-dir, so the command is cheap to call per record from pipelines and cron.
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import re
+import sys
+
+from bva_config import parse_configuration_csv, parse_configuration_json, record_input_values, validate_configurations
+from bva_engine import define_scenarios, run_assessments, summarize_assessment
+
+CSV_FIELDS = ['source', 'scenario', 'currency', 'evaluation_years', 'npv', 'roi', 'irr', 'mirr',
+              'payback_months', 'payback_years', 'annual_benefits']
+
+def _parse_list_item(item):
+    try:
+        return parse_configuration_json(json.dumps(item))
+    except ValueError as e:
+        return e
+
+def parse_configuration_document(content):
+    """Configurations in a JSON document (an export, a bare configuration or a list of them) or a CSV export
+
+    Items of a list that are not configurations are returned as their ValueError.
+    """
+    if content.lstrip().startswith(('{', '[')):
+        data = json.loads(content)
+        if isinstance(data, list):
+            return [_parse_list_item(item) for item in data]
+        return [parse_configuration_json(content)]
+    return [parse_configuration_csv(content)]
+
+def _read_file(path):
+    with open(path, encoding='utf-8') as f:
+        content = f.read()
+    if path.lower().endswith('.csv'):
+        return [parse_configuration_csv(content)]
+    return parse_configuration_document(content)
+
+def _read_stdin(stream):
+    """(source, configuration or parse error) for the configurations on stdin, yielded as lines arrive"""
+    first_line = ''
+    for first_line in stream:
+        if first_line.strip():
+            break
+    if not first_line.strip():
+        return  # Empty input
+    try:
+        json_lines = not isinstance(json.loads(first_line), list)
+    except ValueError:
+        json_lines = False
+    if not json_lines:
+        # Not JSON Lines: a pretty-printed JSON export, a JSON array or a CSV export
+        try:
+            for index, configuration in enumerate(parse_configuration_document(first_line + stream.read()), start=1):
+                yield f"stdin:{index}", configuration
+        except ValueError as e:
+            yield "stdin", e
+        return
+
+    for line_number, line in enumerate(itertools.chain([first_line], stream), start=1):
+        if not line.strip():
+            continue
+        try:
+            yield f"stdin:{line_number}", parse_configuration_json(line)
+        except ValueError as e:
+            yield f"stdin:{line_number}", e
+
+def read_configurations(paths, stdin=sys.stdin):
+    """(source, configuration) pairs from files and/or stdin; unreadable input yields (source, exception)"""
+    for path in paths or ['-']:
+        if path == '-':
+            yield from _read_stdin(stdin)
+            continue
+        try:
+            configurations = _read_file(path)
+        except (OSError, ValueError, KeyError) as e:
+            yield path, e
+            continue
+        for index, configuration in enumerate(configurations, start=1):
+            yield (path if len(configurations) == 1 else f"{path}:{index}"), configuration
+
+def load_scenarios(path):
+    """Validated scenarios from a JSON object of scenario name -> parameters"""
+    with open(path, encoding='utf-8') as f:
+        definitions = json.load(f)
+    if not isinstance(definitions, dict) or not all(isinstance(params, dict) for params in definitions.values()):
+        raise ValueError("Scenarios must be a JSON object of scenario name -> parameters")
+    return define_scenarios(definitions)
+
+def _score_batch(batch, scenarios=None):
+    configurations = [{} if isinstance(configuration, Exception) else configuration for _, configuration in batch]
+    records, errors = validate_configurations(configurations)
+    valid = [index for index in range(len(batch)) if index not in errors and not isinstance(batch[index][1], Exception)]
+    assessments = dict(zip(valid, run_assessments([record_input_values(records[index]) for index in valid], scenarios)))
+    results = []
+    for index, (source, configuration) in enumerate(batch):
+        if index in assessments:
+            results.append((source, assessments[index]))
+        elif isinstance(configuration, Exception):
+            results.append((source, configuration))
+        else:
+            results.append((source, ValueError("; ".join(errors[index].values()))))
+    return results
+
+def score_records(records, batch_size=256, scenarios=None):
+    """(source, assessment or exception) for (source, configuration) records, scored in batches
+
+    A batch is scored as soon as it is full or the input ends, so streamed input produces
+    output in step with it.
+    """
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield from _score_batch(batch, scenarios)
+            batch = []
+    if batch:
+        yield from _score_batch(batch, scenarios)
+
+def _pdf_file_name(source):
+    """PDF file name for a configuration source: its file name without extension, plus its index in the file"""
+    name = re.sub(r'\.(json|csv)(?=:|$)', '', os.path.basename(source), flags=re.IGNORECASE)
+    return re.sub(r'[^A-Za-z0-9._-]+', '_', name.replace(':', '-')) + '.pdf'
+
+def write_report_pdf(assessment, path, organization_name):
+    """Write the executive report for an assessment to path"""
+    from bva_report import create_executive_summary_data, generate_executive_report_pdf
+
+    inputs = assessment['inputs']
+    summary_data = create_executive_summary_data(
+        assessment['scenario_results'], inputs['currency'], assessment['benefits'], inputs
+    )
+    pdf_buffer = generate_executive_report_pdf(
+        summary_data, assessment['scenario_results'], inputs['solution_name'], organization_name
+    )
+    with open(path, 'wb') as f:
+        f.write(pdf_buffer.getvalue())
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score BVA configurations without starting the app")
+    parser.add_argument("configs", nargs="*", metavar="CONFIG",
+                        help="JSON or CSV configuration files (default or '-': stdin, JSON Lines or one document)")
+    parser.add_argument("--format", choices=["json", "csv"], default="json",
+                        help="Output one JSON object per configuration or CSV rows per scenario")
+    parser.add_argument("--cash-flows", action="store_true", help="Include yearly and monthly cash flows (JSON only)")
+    pdf_output = parser.add_mutually_exclusive_group()
+    pdf_output.add_argument("--pdf", metavar="PATH", help="Write the executive report PDF of a single configuration")
+    pdf_output.add_argument("--pdf-dir", metavar="DIR", help="Write one executive report PDF per configuration")
+    parser.add_argument("--organization", default="Your Organization", help="Organization name in the reports")
+    parser.add_argument("--batch-size", type=int, default=256, help="Configurations scored per vectorized batch")
+    parser.add_argument("--scenarios", metavar="PATH",
+                        help="JSON object of scenario name -> parameters to score instead of the default scenarios")
+    args = parser.parse_args(argv)
+
+    scenarios = None
+    if args.scenarios:
+        try:
+            scenarios = load_scenarios(args.scenarios)
+        except (OSError, ValueError) as e:
+            print(f"{args.scenarios}: {e}", file=sys.stderr)
+            return 2
+
+    if args.pdf or args.pdf_dir:
+        from bva_report import REPORT_DEPENDENCIES_AVAILABLE
+        if not REPORT_DEPENDENCIES_AVAILABLE:
+            print("reportlab is required for PDFs (pip install reportlab)", file=sys.stderr)
+            return 2
+        if args.pdf_dir:
+            os.makedirs(args.pdf_dir, exist_ok=True)
+
+    writer = None
+    if args.format == "csv":
+        writer = csv.DictWriter(sys.stdout, fieldnames=CSV_FIELDS, lineterminator="\n")
+        writer.writeheader()
+
+    failures = 0
+    records = 0
+    pdf_written = False
+    for source, assessment in score_records(read_configurations(args.configs), args.batch_size, scenarios):
+        records += 1
+        if isinstance(assessment, Exception):
+            failures += 1
+            print(f"{source}: {type(assessment).__name__}: {assessment}", file=sys.stderr)
+            continue
+
+        summary = summarize_assessment(assessment, include_cash_flows=args.cash_flows and writer is None)
+        if writer is None:
+            print(json.dumps({'source': source, **summary}))
+        else:
+            for scenario_name, metrics in summary['scenarios'].items():
+                writer.writerow({
+                    'source': source,
+                    'scenario': scenario_name,
+                    'currency': summary['currency'],
+                    'evaluation_years': summary['evaluation_years'],
+                    **{field: metrics[field] for field in CSV_FIELDS[4:]}
+                })
+
+        if args.pdf:
+            if pdf_written:
+                print(f"{source}: --pdf takes a single configuration; use --pdf-dir for several", file=sys.stderr)
+                failures += 1
+            else:
+                write_report_pdf(assessment, args.pdf, args.organization)
+                pdf_written = True
+        elif args.pdf_dir:
+            write_report_pdf(assessment, os.path.join(args.pdf_dir, _pdf_file_name(source)), args.organization)
+        sys.stdout.flush()
+
+    if records == 0:
+        print("No configurations to score (empty input)", file=sys.stderr)
+        return 1
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
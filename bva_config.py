@@ -0,0 +1,509 @@
+# Configuration keys, default values and export/import formats shared by the Streamlit app and headless tools
+
+import csv
+import json
+import math
+from datetime import datetime
+from io import StringIO
+
+import numpy as np
+
+# All input keys tracked for export/import and model evaluation
+INPUT_KEYS = [
+    # Basic Configuration
+    'solution_name', 'industry_template', 'currency',
+
+    # Implementation Timeline
+    'implementation_delay', 'benefits_ramp_up',
+
+    # Working Hours Configuration
+    'hours_per_day', 'days_per_week', 'weeks_per_year', 'holiday_sick_days',
+
+    # Alert Management
+    'alert_volume', 'alert_ftes', 'avg_alert_triage_time', 'avg_alert_fte_salary',
+    'alert_reduction_pct', 'alert_triage_time_saved_pct',
+
+    # Incident Management
+    'incident_volume', 'incident_ftes', 'avg_incident_triage_time', 'avg_incident_fte_salary',
+    'incident_reduction_pct', 'incident_triage_time_savings_pct',
+
+    # Major Incidents
+    'major_incident_volume', 'avg_major_incident_cost', 'avg_mttr_hours', 'mttr_improvement_pct',
+
+    # Additional Benefits
+    'tool_savings', 'people_efficiency', 'fte_avoidance', 'sla_penalty',
+    'revenue_growth', 'capex_savings', 'opex_savings',
+
+    # Costs
+    'platform_cost', 'services_cost',
+
+    # Financial Settings
+    'evaluation_years', 'discount_rate', 'mid_period_discounting',
+
+    # Multi-Year Assumptions: yearly growth rates (%) and optional per-year schedules
+    'alert_volume_growth_pct', 'incident_volume_growth_pct', 'salary_inflation_pct',
+    'major_incident_cost_growth_pct', 'platform_cost_escalation_pct',
+    'alert_volume_by_year', 'incident_volume_by_year', 'avg_alert_fte_salary_by_year',
+    'avg_incident_fte_salary_by_year', 'avg_major_incident_cost_by_year', 'platform_cost_by_year'
+]
+
+# Inputs that can change from year to year -> (yearly growth rate key, per-year schedule key).
+# The value grows by the rate (compounded) from year 2 on, unless a schedule lists the value for
+# each year; past the schedule's end the last listed value continues
+YEARLY_INPUTS = {
+    'alert_volume': ('alert_volume_growth_pct', 'alert_volume_by_year'),
+    'incident_volume': ('incident_volume_growth_pct', 'incident_volume_by_year'),
+    'avg_alert_fte_salary': ('salary_inflation_pct', 'avg_alert_fte_salary_by_year'),
+    'avg_incident_fte_salary': ('salary_inflation_pct', 'avg_incident_fte_salary_by_year'),
+    'avg_major_incident_cost': ('major_incident_cost_growth_pct', 'avg_major_incident_cost_by_year'),
+    'platform_cost': ('platform_cost_escalation_pct', 'platform_cost_by_year')
+}
+YEARLY_SCHEDULE_KEYS = [schedule_key for _, schedule_key in YEARLY_INPUTS.values()]
+
+# Keys that affect the financial results as numbers (labels like the solution name or currency do not;
+# per-year schedules are text and are passed alongside)
+MODEL_INPUT_KEYS = [key for key in INPUT_KEYS
+                    if key not in ['solution_name', 'industry_template', 'currency'] + YEARLY_SCHEDULE_KEYS]
+
+# Input groups by the stage of the model they feed (used to declare page section dependencies)
+TIMELINE_INPUT_KEYS = ['implementation_delay', 'benefits_ramp_up', 'evaluation_years']
+COST_INPUT_KEYS = ['platform_cost', 'services_cost', 'platform_cost_escalation_pct', 'platform_cost_by_year']
+BENEFIT_INPUT_KEYS = [
+    key for key in MODEL_INPUT_KEYS + YEARLY_SCHEDULE_KEYS
+    if key not in TIMELINE_INPUT_KEYS + COST_INPUT_KEYS + ['discount_rate', 'mid_period_discounting']
+]
+CASH_FLOW_INPUT_KEYS = BENEFIT_INPUT_KEYS + COST_INPUT_KEYS + TIMELINE_INPUT_KEYS  # Undiscounted cash flows
+NPV_INPUT_KEYS = CASH_FLOW_INPUT_KEYS + ['discount_rate', 'mid_period_discounting']
+
+DEFAULT_VALUES = {
+    'solution_name': 'AIOPs',
+    'industry_template': 'Custom',
+    'currency': '$',
+    'implementation_delay': 6,
+    'benefits_ramp_up': 3,
+    'hours_per_day': 8.0,
+    'days_per_week': 5,
+    'weeks_per_year': 52,
+    'holiday_sick_days': 25,
+    'alert_volume': 0,
+    'alert_ftes': 0,
+    'avg_alert_triage_time': 0,
+    'avg_alert_fte_salary': 50000,
+    'alert_reduction_pct': 0,
+    'alert_triage_time_saved_pct': 0,
+    'incident_volume': 0,
+    'incident_ftes': 0,
+    'avg_incident_triage_time': 0,
+    'avg_incident_fte_salary': 50000,
+    'incident_reduction_pct': 0,
+    'incident_triage_time_savings_pct': 0,
+    'major_incident_volume': 0,
+    'avg_major_incident_cost': 0,
+    'avg_mttr_hours': 0.0,
+    'mttr_improvement_pct': 0,
+    'tool_savings': 0,
+    'people_efficiency': 0,
+    'fte_avoidance': 0,
+    'sla_penalty': 0,
+    'revenue_growth': 0,
+    'capex_savings': 0,
+    'opex_savings': 0,
+    'platform_cost': 0,
+    'services_cost': 0,
+    'evaluation_years': 3,
+    'discount_rate': 10,
+    'mid_period_discounting': 0,
+    'alert_volume_growth_pct': 0.0,
+    'incident_volume_growth_pct': 0.0,
+    'salary_inflation_pct': 0.0,
+    'major_incident_cost_growth_pct': 0.0,
+    'platform_cost_escalation_pct': 0.0,
+    'alert_volume_by_year': '',
+    'incident_volume_by_year': '',
+    'avg_alert_fte_salary_by_year': '',
+    'avg_incident_fte_salary_by_year': '',
+    'avg_major_incident_cost_by_year': '',
+    'platform_cost_by_year': ''
+}
+
+# Human-readable parameter descriptions (used in exports and analysis panels)
+INPUT_DESCRIPTIONS = {
+    'solution_name': 'Solution Name',
+    'industry_template': 'Industry Template',
+    'currency': 'Currency Symbol',
+    'implementation_delay': 'Implementation Delay (months)',
+    'benefits_ramp_up': 'Benefits Ramp-up Period (months)',
+    'hours_per_day': 'Working Hours per Day',
+    'days_per_week': 'Working Days per Week',
+    'weeks_per_year': 'Working Weeks per Year',
+    'holiday_sick_days': 'Holiday + Sick Days per Year',
+    'alert_volume': 'Total Infrastructure Related Alerts per Year',
+    'alert_ftes': 'Total FTEs Managing Infrastructure Alerts',
+    'avg_alert_triage_time': 'Average Alert Triage Time (minutes)',
+    'avg_alert_fte_salary': 'Average Annual Salary per Alert Management FTE',
+    'alert_reduction_pct': '% Alert Reduction',
+    'alert_triage_time_saved_pct': '% Alert Triage Time Reduction',
+    'incident_volume': 'Total Infrastructure Related Incident Volumes per Year',
+    'incident_ftes': 'Total FTEs Managing Infrastructure Incidents',
+    'avg_incident_triage_time': 'Average Incident Triage Time (minutes)',
+    'avg_incident_fte_salary': 'Average Annual Salary per Incident Management FTE',
+    'incident_reduction_pct': '% Incident Reduction',
+    'incident_triage_time_savings_pct': '% Incident Triage Time Reduction',
+    'major_incident_volume': 'Total Infrastructure Related Major Incidents per Year (Sev1)',
+    'avg_major_incident_cost': 'Average Major Incident Cost per Hour',
+    'avg_mttr_hours': 'Average MTTR (hours)',
+    'mttr_improvement_pct': 'MTTR Improvement Percentage',
+    'tool_savings': 'Tool Consolidation Savings',
+    'people_efficiency': 'People Efficiency Gains',
+    'fte_avoidance': 'FTE Avoidance (annualized value)',
+    'sla_penalty': 'SLA Penalty Avoidance',
+    'revenue_growth': 'Revenue Growth',
+    'capex_savings': 'Capital Expenditure Savings',
+    'opex_savings': 'Operational Expenditure Savings',
+    'platform_cost': 'Annual Subscription Cost',
+    'services_cost': 'Implementation & Services (One-Time)',
+    'evaluation_years': 'Evaluation Period (Years)',
+    'discount_rate': 'NPV Discount Rate (%)',
+    'mid_period_discounting': 'Mid-Month Discounting (1 = cash flows mid-month, 0 = month end)',
+    'alert_volume_growth_pct': 'Alert Volume Growth (% per year)',
+    'incident_volume_growth_pct': 'Incident Volume Growth (% per year)',
+    'salary_inflation_pct': 'Salary Inflation (% per year)',
+    'major_incident_cost_growth_pct': 'Major Incident Cost Growth (% per year)',
+    'platform_cost_escalation_pct': 'Subscription Price Escalation (% per year)',
+    'alert_volume_by_year': 'Alerts per Year, by Year (overrides growth)',
+    'incident_volume_by_year': 'Incidents per Year, by Year (overrides growth)',
+    'avg_alert_fte_salary_by_year': 'Alert FTE Salary by Year (overrides inflation)',
+    'avg_incident_fte_salary_by_year': 'Incident FTE Salary by Year (overrides inflation)',
+    'avg_major_incident_cost_by_year': 'Major Incident Cost per Hour by Year (overrides growth)',
+    'platform_cost_by_year': 'Subscription Cost by Year (overrides escalation)'
+}
+
+def get_default_value(key):
+    """Get default values for inputs"""
+    return DEFAULT_VALUES.get(key, 0)
+
+def complete_input_values(input_values):
+    """Return a full input dict, filling any missing keys with their defaults"""
+    return {key: input_values.get(key, get_default_value(key)) for key in INPUT_KEYS}
+
+# Allowed (min, max) ranges, matching the sidebar widget bounds (None = unbounded)
+INPUT_BOUNDS = {
+    'implementation_delay': (0, 24),
+    'benefits_ramp_up': (0, 12),
+    'hours_per_day': (1.0, 24.0),
+    'days_per_week': (1, 7),
+    'weeks_per_year': (1, 52),
+    'holiday_sick_days': (0, 100),
+    'alert_reduction_pct': (0, 100),
+    'alert_triage_time_saved_pct': (0, 100),
+    'incident_reduction_pct': (0, 100),
+    'incident_triage_time_savings_pct': (0, 100),
+    'mttr_improvement_pct': (0, 100),
+    'evaluation_years': (1, 15),
+    'discount_rate': (0, 20),
+    'mid_period_discounting': (0, 1),
+    'alert_volume_growth_pct': (-50.0, 100.0),
+    'incident_volume_growth_pct': (-50.0, 100.0),
+    'salary_inflation_pct': (-50.0, 100.0),
+    'major_incident_cost_growth_pct': (-50.0, 100.0),
+    'platform_cost_escalation_pct': (-50.0, 100.0)
+}
+
+def parse_yearly_schedule(text):
+    """Per-year values listed in text (year 1 first, separated by commas, semicolons or spaces)
+
+    Returns a tuple of floats (empty for blank text); raises ValueError for values that are not
+    non-negative numbers or for more values than the longest evaluation period.
+    """
+    values = []
+    for item in text.replace(';', ' ').replace(',', ' ').split():
+        value = _to_float(item)
+        if not math.isfinite(value) or value < 0:
+            raise ValueError(f"{item!r} is not a non-negative number")
+        values.append(value)
+    if len(values) > INPUT_BOUNDS['evaluation_years'][1]:
+        raise ValueError(f"lists {len(values)} years; at most {INPUT_BOUNDS['evaluation_years'][1]} are used")
+    return tuple(values)
+
+# Industry benchmark templates: baseline values applied to the sidebar inputs when selected
+INDUSTRY_TEMPLATES = {
+    "Custom": {},
+    "Financial Services": {
+        "alert_volume": 1_200_000,
+        "major_incident_volume": 140,
+        "avg_alert_triage_time": 25,
+        "alert_reduction_pct": 40,
+        "incident_volume": 400_000,
+        "avg_incident_triage_time": 30,
+        "incident_reduction_pct": 40,
+        "mttr_improvement_pct": 40
+    },
+    "Retail": {
+        "alert_volume": 600_000,
+        "major_incident_volume": 80,
+        "avg_alert_triage_time": 20,
+        "alert_reduction_pct": 30,
+        "incident_volume": 200_000,
+        "avg_incident_triage_time": 25,
+        "incident_reduction_pct": 30,
+        "mttr_improvement_pct": 30
+    },
+    "MSP": {
+        "alert_volume": 2_500_000,
+        "major_incident_volume": 200,
+        "avg_alert_triage_time": 35,
+        "alert_reduction_pct": 50,
+        "incident_volume": 800_000,
+        "avg_incident_triage_time": 35,
+        "incident_reduction_pct": 50,
+        "mttr_improvement_pct": 50
+    },
+    "Healthcare": {
+        "alert_volume": 800_000,
+        "major_incident_volume": 100,
+        "avg_alert_triage_time": 30,
+        "alert_reduction_pct": 35,
+        "incident_volume": 300_000,
+        "avg_incident_triage_time": 30,
+        "incident_reduction_pct": 35,
+        "mttr_improvement_pct": 35
+    },
+    "Telecom": {
+        "alert_volume": 1_800_000,
+        "major_incident_volume": 160,
+        "avg_alert_triage_time": 35,
+        "alert_reduction_pct": 45,
+        "incident_volume": 600_000,
+        "avg_incident_triage_time": 35,
+        "incident_reduction_pct": 40,
+        "mttr_improvement_pct": 45
+    }
+}
+
+# Currency symbols offered by the sidebar
+CURRENCY_SYMBOLS = ["$", "€", "£", "Kč"]
+
+# --- TYPED INPUT SCHEMA ---
+
+class InputField:
+    """Type, default, allowed range and choices of one input, matching its sidebar widget"""
+
+    __slots__ = ('key', 'kind', 'default', 'min_value', 'max_value', 'choices', 'parser')
+
+    def __init__(self, key, kind, default, min_value=None, max_value=None, choices=None, parser=None):
+        self.key = key
+        self.kind = kind
+        self.default = default
+        self.min_value = min_value
+        self.max_value = max_value
+        self.choices = choices
+        self.parser = parser  # Text fields with a format: raises ValueError describing invalid text
+
+    def coerce(self, value):
+        """value converted to the field's type (int, float or str), or ValueError naming the field and problem"""
+        if self.kind is str:
+            value = str(value)
+            if self.choices is not None and value not in self.choices:
+                raise ValueError(f"{self.key}: {value!r} is not one of {', '.join(self.choices)}")
+            if self.parser is not None:
+                try:
+                    self.parser(value)
+                except ValueError as e:
+                    raise ValueError(f"{self.key}: {e}")
+            return value
+
+        number = _to_float(value)
+        if math.isnan(number):
+            raise ValueError(f"{self.key}: expected a number, got {value!r}")
+        if math.isinf(number):
+            raise ValueError(f"{self.key}: expected a finite number, got {value!r}")
+        if self.kind is int:
+            if number != round(number):
+                raise ValueError(f"{self.key}: expected a whole number, got {value!r}")
+            number = int(number)
+        if self.min_value is not None and number < self.min_value:
+            raise ValueError(f"{self.key}: {number:g} is below the minimum of {self.min_value:g}")
+        if self.max_value is not None and number > self.max_value:
+            raise ValueError(f"{self.key}: {number:g} is above the maximum of {self.max_value:g}")
+        return number
+
+def _to_float(value):
+    """float(value), or NaN for anything that is not a number or numeric text"""
+    if isinstance(value, str):
+        value = value.strip()
+    elif not isinstance(value, (int, float, np.number)):
+        return math.nan
+    try:
+        return float(value)
+    except ValueError:
+        return math.nan
+
+def _input_field(key):
+    default = get_default_value(key)
+    if key in MODEL_INPUT_KEYS:
+        # Inputs without other bounds are non-negative amounts, volumes and durations (min_value=0 widgets)
+        min_value, max_value = INPUT_BOUNDS.get(key, (0, None))
+        return InputField(key, type(default), default, min_value, max_value)
+    choices = {'industry_template': list(INDUSTRY_TEMPLATES), 'currency': CURRENCY_SYMBOLS}.get(key)
+    parser = parse_yearly_schedule if key in YEARLY_SCHEDULE_KEYS else None
+    return InputField(key, str, default, choices=choices, parser=parser)
+
+# One field per input key: int inputs are whole-number widgets, float inputs accept fractions
+INPUT_SCHEMA = {key: _input_field(key) for key in INPUT_KEYS}
+
+def validate_input_values(input_values):
+    """Typed full input values of one configuration and {key: message} for every invalid field
+
+    Missing keys take their defaults, invalid fields keep their defaults in the returned values,
+    and keys outside the schema are ignored.
+    """
+    values, errors = {}, {}
+    for key, field in INPUT_SCHEMA.items():
+        try:
+            values[key] = field.coerce(input_values.get(key, field.default))
+        except ValueError as e:
+            values[key] = field.default
+            errors[key] = str(e)
+    return values, errors
+
+def validated_input_values(configuration):
+    """Typed full input values of an imported configuration, raising ValueError listing every invalid field"""
+    if not isinstance(configuration, dict):
+        raise ValueError("A configuration must be a JSON object")
+    values, errors = validate_input_values(configuration)
+    if errors:
+        raise ValueError("; ".join(errors.values()))
+    return values
+
+def validate_input_columns(columns, n_rows):
+    """Validate input columns (input key -> n_rows raw values, e.g. CSV text) against the schema
+
+    Keys missing from columns take their defaults. Returns (columns, errors): a typed array per
+    input key (invalid fields hold the default) and {row index: {key: message}} for every
+    invalid row. Each column is converted and range-checked as a whole; only the rows flagged
+    invalid are revisited to word their errors.
+    """
+    errors = {}
+    typed = {}
+    for key, field in INPUT_SCHEMA.items():
+        raw = columns.get(key)
+        if raw is None:
+            typed[key] = np.full(n_rows, field.default)
+            continue
+        if field.kind is str:
+            column = np.array([str(value) for value in raw], dtype=str).reshape(n_rows)
+            invalid = ~np.isin(column, field.choices) if field.choices is not None else np.zeros(n_rows, dtype=bool)
+            if field.parser is not None:
+                # Only the non-blank cells of a text column with a format are parsed
+                invalid |= np.char.strip(column) != ''
+        else:
+            try:
+                column = np.array(raw, dtype=float).reshape(n_rows)
+            except (TypeError, ValueError):
+                column = np.array([_to_float(value) for value in raw], dtype=float).reshape(n_rows)
+            invalid = ~np.isfinite(column)
+            with np.errstate(invalid='ignore'):
+                if field.kind is int:
+                    invalid |= column != np.round(column)
+                if field.min_value is not None:
+                    invalid |= column < field.min_value
+                if field.max_value is not None:
+                    invalid |= column > field.max_value
+        for row in np.flatnonzero(invalid):
+            value = raw[row].item() if isinstance(raw[row], np.generic) else raw[row]
+            try:
+                column[row] = field.coerce(value)
+            except ValueError as e:
+                errors.setdefault(int(row), {})[key] = str(e)
+                column[row] = field.default
+        typed[key] = column.astype(np.int64) if field.kind is int else column
+    return typed, dict(sorted(errors.items()))
+
+def validate_configurations(configurations):
+    """Validate many configurations at once into a structured array with one typed field per input key
+
+    Returns (records, errors): records has a row per configuration (missing keys and invalid
+    fields hold the default) and errors maps the index of every invalid configuration to its
+    {key: message}. The configurations are validated column by column (see validate_input_columns).
+    """
+    n_rows = len(configurations)
+    errors = {}
+    for row, configuration in enumerate(configurations):
+        if not isinstance(configuration, dict):
+            errors[row] = {'configuration': "A configuration must be a JSON object"}
+    rows = [configuration if isinstance(configuration, dict) else {} for configuration in configurations]
+
+    columns, column_errors = validate_input_columns(
+        {key: [row.get(key, field.default) for row in rows] for key, field in INPUT_SCHEMA.items()}, n_rows
+    )
+    for row, messages in column_errors.items():
+        errors.setdefault(row, {}).update(messages)
+
+    records = np.empty(n_rows, dtype=[(key, column.dtype) for key, column in columns.items()])
+    for key, column in columns.items():
+        records[key] = column
+    return records, dict(sorted(errors.items()))
+
+def record_input_values(record):
+    """Input values dict (plain Python types) of one row of validate_configurations' records"""
+    return {key: record[key].item() for key in INPUT_KEYS}
+
+# --- EXPORT/IMPORT FORMATS ---
+
+def export_to_csv(input_values):
+    """Export input values to CSV format"""
+    output = StringIO()
+    writer = csv.writer(output)
+    
+    # Write header
+    writer.writerow(['Parameter', 'Value', 'Description'])
+    
+    # Write data rows
+    for key, value in input_values.items():
+        description = INPUT_DESCRIPTIONS.get(key, key.replace('_', ' ').title())
+        writer.writerow([key, value, description])
+    
+    return output.getvalue()
+
+def _parse_csv_value(key, value):
+    """CSV text as the schema's type for key (unparseable or unknown values are kept as text for validation)"""
+    field = INPUT_SCHEMA.get(key)
+    if field is None or field.kind is str:
+        return value
+    number = _to_float(value)
+    if math.isnan(number):
+        return value
+    return int(number) if field.kind is int and number == round(number) else number
+
+def parse_configuration_csv(csv_content):
+    """Parse input values from CSV content written by export_to_csv"""
+    reader = csv.DictReader(StringIO(csv_content))
+    return {row['Parameter']: _parse_csv_value(row['Parameter'], row['Value']) for row in reader}
+
+def export_to_json(input_values):
+    """Export input values to JSON format"""
+    # Add metadata
+    export_data = {
+        'metadata': {
+            'export_date': datetime.now().isoformat(),
+            'version': '1.7',
+            'tool': 'BVA Business Value Assessment'
+        },
+        'configuration': input_values
+    }
+    return json.dumps(export_data, indent=2)
+
+def parse_configuration_json(json_content):
+    """Parse input values from JSON content written by export_to_json (or a bare configuration object)
+
+    Raises ValueError when the content is not JSON or the configuration is not a JSON object.
+    """
+    data = json.loads(json_content)
+    
+    # Extract configuration data
+    if isinstance(data, dict) and 'configuration' in data:
+        data = data['configuration']
+    # Otherwise assume the entire JSON is the configuration
+    if not isinstance(data, dict):
+        raise ValueError("A configuration must be a JSON object")
+    return data
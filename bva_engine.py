@@ -0,0 +1,842 @@
+# Headless BVA calculation engine - no Streamlit, plotting or reporting imports
+
+import numpy as np
+
+from bva_cache import LRUCache, fingerprint
+from bva_config import (MODEL_INPUT_KEYS, YEARLY_INPUTS, YEARLY_SCHEDULE_KEYS, complete_input_values,
+                        parse_yearly_schedule)
+from bva_profiler import stage
+
+# Bump whenever a change to the model alters its results (invalidates cached results)
+MODEL_VERSION = "2.2"
+
+# Scenario definitions (benefit and implementation timeline multipliers)
+DEFAULT_SCENARIOS = {
+    "Conservative": {
+        "benefits_multiplier": 0.7,  # 30% lower benefits
+        "implementation_delay_multiplier": 1.3,  # 30% longer implementation
+        "description": "Benefits 30% lower, implementation 30% longer",
+        "color": "#ff6b6b",
+        "icon": "🔴"
+    },
+    "Expected": {
+        "benefits_multiplier": 1.0,  # Baseline
+        "implementation_delay_multiplier": 1.0,  # Baseline
+        "description": "Baseline assumptions as entered",
+        "color": "#4ecdc4",
+        "icon": "🟢"
+    },
+    "Optimistic": {
+        "benefits_multiplier": 1.2,  # 20% higher benefits
+        "implementation_delay_multiplier": 0.8,  # 20% faster implementation
+        "description": "Benefits 20% higher, implementation 20% faster",
+        "color": "#45b7d1",
+        "icon": "🔵"
+    }
+}
+
+# Optional scenario overrides of inputs (absent or None = the input value is used), keyed by scenario parameter
+SCENARIO_OVERRIDES = {
+    'ramp_up_months': 'benefits_ramp_up',
+    'platform_cost': 'platform_cost',
+    'services_cost': 'services_cost'
+}
+
+# Colors and icon for user-defined scenarios (assigned by position)
+SCENARIO_COLORS = ["#ff6b6b", "#4ecdc4", "#45b7d1", "#f7b731", "#a55eea", "#26de81", "#fd9644", "#778ca3",
+                   "#eb3b5a", "#2d98da"]
+SCENARIO_ICON = "🔹"
+
+def define_scenarios(definitions):
+    """Validated scenarios from user definitions ((scenario name, parameters) pairs or a dict), in order
+
+    Each scenario needs a benefits_multiplier and an implementation_delay_multiplier and may
+    override the ramp-up months, subscription (platform) cost and services cost. A definition
+    identical to a default scenario is returned as that default, so default results stay cached;
+    other scenarios get a generated description, color and icon unless given. Raises ValueError
+    naming the scenario and parameter when a definition is invalid.
+    """
+    definitions = list(definitions.items() if isinstance(definitions, dict) else definitions)
+    if not definitions:
+        raise ValueError("Define at least one scenario")
+    scenarios = {}
+    for position, (name, params) in enumerate(definitions):
+        name = name.strip() if isinstance(name, str) else ''
+        if not name:
+            raise ValueError("Every scenario needs a name")
+        if name in scenarios:
+            raise ValueError(f"Scenario names must be unique: {name!r} is used twice")
+        scenario = {}
+        for key in ('benefits_multiplier', 'implementation_delay_multiplier') + tuple(SCENARIO_OVERRIDES):
+            value = params.get(key)
+            if value is None or (key in SCENARIO_OVERRIDES and isinstance(value, float) and np.isnan(value)):
+                if key in SCENARIO_OVERRIDES:
+                    continue
+                raise ValueError(f"Scenario {name!r}: {key.replace('_', ' ')} is required")
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"Scenario {name!r}: {key.replace('_', ' ')} must be a number, got {value!r}")
+            if not np.isfinite(value) or value < 0:
+                raise ValueError(f"Scenario {name!r}: {key.replace('_', ' ')} must be a non-negative number")
+            scenario[key] = value
+
+        default = DEFAULT_SCENARIOS.get(name)
+        if (default is not None and len(scenario) == 2 and scenario == {key: default[key] for key in scenario}
+                and params.get('description') in (None, '', default['description'])):
+            scenarios[name] = default
+            continue
+        description = f"Benefits x{scenario['benefits_multiplier']:g}, implementation x{scenario['implementation_delay_multiplier']:g}"
+        overrides = [f"{key.replace('_', ' ')} {scenario[key]:,.0f}" for key in SCENARIO_OVERRIDES if key in scenario]
+        if overrides:
+            description += "; " + ", ".join(overrides)
+        scenarios[name] = dict(
+            scenario,
+            description=params.get('description') or description,
+            color=params.get('color') or SCENARIO_COLORS[position % len(SCENARIO_COLORS)],
+            icon=params.get('icon') or SCENARIO_ICON
+        )
+    return scenarios
+
+def reference_scenario_name(scenario_results):
+    """Scenario reported as the headline case: 'Expected' when defined, otherwise the one closest to the inputs as entered"""
+    if 'Expected' in scenario_results:
+        return 'Expected'
+    return min(scenario_results, key=lambda name: abs(scenario_results[name]['benefits_mult'] - 1)
+               + abs(scenario_results[name].get('delay_mult', 1) - 1))
+
+def downside_scenario_name(scenario_results):
+    """Scenario reported as the downside case: 'Conservative' when defined, otherwise the lowest NPV"""
+    if 'Conservative' in scenario_results:
+        return 'Conservative'
+    return min(scenario_results, key=lambda name: scenario_results[name]['npv'])
+
+def _scenario_arrays(scenarios):
+    """Per-scenario parameter arrays; override entries are NaN where a scenario uses the input value"""
+    params = list(scenarios.values())
+    arrays = {
+        'benefits_multiplier': np.array([p["benefits_multiplier"] for p in params], dtype=float),
+        'implementation_delay_multiplier': np.array([p["implementation_delay_multiplier"] for p in params], dtype=float)
+    }
+    for key in SCENARIO_OVERRIDES:
+        arrays[key] = np.array([np.nan if p.get(key) is None else p[key] for p in params], dtype=float)
+    return arrays
+
+def _scenario_cash_flow_inputs(inputs, benefits_by_year, platform_cost_by_year, rows, arrays):
+    """Configurations x scenarios benefits, costs, delays and ramp-ups for evaluate_cash_flows
+
+    Benefits and subscription costs are per year (configurations x scenarios x years). A
+    scenario's subscription cost override replaces the year 1 cost, escalated at the input rate.
+    """
+    def with_override(key):
+        return np.where(np.isnan(arrays[key]), inputs[SCENARIO_OVERRIDES[key]][rows, np.newaxis], arrays[key])
+
+    escalation = (1 + inputs['platform_cost_escalation_pct'][rows, np.newaxis] / 100) ** np.arange(platform_cost_by_year.shape[-1])
+    platform_cost_override = arrays['platform_cost'][:, np.newaxis]
+    return {
+        'annual_benefits': benefits_by_year[rows, np.newaxis, :] * arrays['benefits_multiplier'][:, np.newaxis],
+        'platform_cost': np.where(np.isnan(platform_cost_override), platform_cost_by_year[rows, np.newaxis, :],
+                                  platform_cost_override * escalation[:, np.newaxis, :]),
+        'services_cost': with_override('services_cost'),
+        'implementation_delay': get_scenario_impl_delay(inputs['implementation_delay'][rows, np.newaxis],
+                                                        arrays['implementation_delay_multiplier']),
+        'ramp_up_months': with_override('ramp_up_months')
+    }
+
+# --- CORRECTED CALCULATIONS WITH CONFIGURABLE WORKING HOURS ---
+# The cost functions accept scalars or equally shaped arrays (e.g. Monte Carlo draws)
+
+def _safe_divide(numerator, denominator):
+    """numerator / denominator where denominator > 0, otherwise 0"""
+    numerator, denominator = np.broadcast_arrays(np.asarray(numerator, dtype=float), np.asarray(denominator, dtype=float))
+    result = np.divide(numerator, denominator, out=np.zeros(numerator.shape), where=denominator > 0)
+    return result[()]
+
+def _calculate_fte_time_costs(volume, ftes, avg_triage_time, avg_salary_per_year,
+                              hours_per_day, days_per_week, weeks_per_year, holiday_sick_days):
+    """Cost per item, total handling cost, FTE time share and working hours for alerts or incidents"""
+    volume = np.asarray(volume, dtype=float)
+    ftes = np.asarray(ftes, dtype=float)
+
+    total_time_hours_per_year = volume * avg_triage_time / 60
+
+    total_working_days = (weeks_per_year * days_per_week) - holiday_sick_days
+    working_hours_per_fte_per_year = total_working_days * hours_per_day
+    total_available_fte_hours = ftes * working_hours_per_fte_per_year
+
+    fte_time_percentage = _safe_divide(total_time_hours_per_year, total_available_fte_hours)
+
+    total_fte_cost = ftes * avg_salary_per_year
+    total_handling_cost = total_fte_cost * fte_time_percentage
+    cost_per_item = _safe_divide(total_handling_cost, volume)
+
+    # No volume or no FTEs means there is nothing to cost
+    no_workload = (volume == 0) | (ftes == 0)
+    return (
+        np.where(no_workload, 0.0, cost_per_item)[()],
+        np.where(no_workload, 0.0, total_handling_cost)[()],
+        np.where(no_workload, 0.0, fte_time_percentage)[()],
+        np.where(no_workload, 0.0, working_hours_per_fte_per_year)[()]
+    )
+
+# Function to calculate alert costs based on FTE time allocation
+def calculate_alert_costs(alert_volume, alert_ftes, avg_alert_triage_time, avg_salary_per_year,
+                         hours_per_day, days_per_week, weeks_per_year, holiday_sick_days):
+    """Calculate the true cost per alert based on FTE time allocation"""
+    return _calculate_fte_time_costs(alert_volume, alert_ftes, avg_alert_triage_time, avg_salary_per_year,
+                                     hours_per_day, days_per_week, weeks_per_year, holiday_sick_days)
+
+# Function to calculate incident costs based on FTE time allocation
+def calculate_incident_costs(incident_volume, incident_ftes, avg_incident_triage_time, avg_salary_per_year,
+                           hours_per_day, days_per_week, weeks_per_year, holiday_sick_days):
+    """Calculate the true cost per incident based on FTE time allocation"""
+    return _calculate_fte_time_costs(incident_volume, incident_ftes, avg_incident_triage_time, avg_salary_per_year,
+                                     hours_per_day, days_per_week, weeks_per_year, holiday_sick_days)
+
+def calculate_annual_benefits(inputs):
+    """Calculate baseline annual savings and total annual benefits from the input values
+
+    Values may be scalars or arrays of draws/rows; results have the same shape.
+    """
+    cost_per_alert, total_alert_handling_cost, alert_fte_percentage, alert_working_hours = calculate_alert_costs(
+        inputs['alert_volume'], inputs['alert_ftes'], inputs['avg_alert_triage_time'], inputs['avg_alert_fte_salary'],
+        inputs['hours_per_day'], inputs['days_per_week'], inputs['weeks_per_year'], inputs['holiday_sick_days']
+    )
+
+    cost_per_incident, total_incident_handling_cost, incident_fte_percentage, incident_working_hours = calculate_incident_costs(
+        inputs['incident_volume'], inputs['incident_ftes'], inputs['avg_incident_triage_time'], inputs['avg_incident_fte_salary'],
+        inputs['hours_per_day'], inputs['days_per_week'], inputs['weeks_per_year'], inputs['holiday_sick_days']
+    )
+
+    # Calculate baseline savings
+    avoided_alerts = inputs['alert_volume'] * (inputs['alert_reduction_pct'] / 100)
+    remaining_alerts = inputs['alert_volume'] - avoided_alerts
+    alert_reduction_savings = avoided_alerts * cost_per_alert
+    remaining_alert_handling_cost = remaining_alerts * cost_per_alert
+    alert_triage_savings = remaining_alert_handling_cost * (inputs['alert_triage_time_saved_pct'] / 100)
+
+    avoided_incidents = inputs['incident_volume'] * (inputs['incident_reduction_pct'] / 100)
+    remaining_incidents = inputs['incident_volume'] - avoided_incidents
+    incident_reduction_savings = avoided_incidents * cost_per_incident
+    remaining_incident_handling_cost = remaining_incidents * cost_per_incident
+    incident_triage_savings = remaining_incident_handling_cost * (inputs['incident_triage_time_savings_pct'] / 100)
+
+    mttr_hours_saved_per_incident = (inputs['mttr_improvement_pct'] / 100) * inputs['avg_mttr_hours']
+    total_mttr_hours_saved = inputs['major_incident_volume'] * mttr_hours_saved_per_incident
+    major_incident_savings = total_mttr_hours_saved * inputs['avg_major_incident_cost']
+
+    total_operational_savings_from_time_saved = (
+        alert_reduction_savings + alert_triage_savings +
+        incident_reduction_savings + incident_triage_savings +
+        major_incident_savings
+    )
+    total_additional_benefits = (
+        inputs['tool_savings'] + inputs['people_efficiency'] + inputs['fte_avoidance'] + inputs['sla_penalty'] +
+        inputs['revenue_growth'] + inputs['capex_savings'] + inputs['opex_savings']
+    )
+
+    # Determine the equivalent number of full-time employees (FTEs) from savings
+    avg_alert_fte_salary = np.asarray(inputs['avg_alert_fte_salary'], dtype=float)
+    avg_incident_fte_salary = np.asarray(inputs['avg_incident_fte_salary'], dtype=float)
+    effective_avg_fte_salary = np.where(
+        (avg_alert_fte_salary > 0) & (avg_incident_fte_salary > 0),
+        (avg_alert_fte_salary + avg_incident_fte_salary) / 2,
+        np.where(avg_alert_fte_salary > 0, avg_alert_fte_salary,
+                 np.where(avg_incident_fte_salary > 0, avg_incident_fte_salary, 0.0))
+    )[()]
+    equivalent_ftes_from_savings = _safe_divide(total_operational_savings_from_time_saved, effective_avg_fte_salary)
+
+    return {
+        'cost_per_alert': cost_per_alert,
+        'total_alert_handling_cost': total_alert_handling_cost,
+        'alert_fte_percentage': alert_fte_percentage,
+        'cost_per_incident': cost_per_incident,
+        'total_incident_handling_cost': total_incident_handling_cost,
+        'incident_fte_percentage': incident_fte_percentage,
+        'alert_reduction_savings': alert_reduction_savings,
+        'alert_triage_savings': alert_triage_savings,
+        'incident_reduction_savings': incident_reduction_savings,
+        'incident_triage_savings': incident_triage_savings,
+        'major_incident_savings': major_incident_savings,
+        'total_operational_savings_from_time_saved': total_operational_savings_from_time_saved,
+        'total_additional_benefits': total_additional_benefits,
+        'total_annual_benefits': total_operational_savings_from_time_saved + total_additional_benefits,
+        'effective_avg_fte_salary': effective_avg_fte_salary,
+        'equivalent_ftes_from_savings': equivalent_ftes_from_savings
+    }
+
+def _carry_forward(values, n_years):
+    """Per-year values (last axis) extended or cut to n_years; the last year's value continues"""
+    values = np.asarray(values, dtype=float)
+    return values[..., np.minimum(np.arange(n_years), values.shape[-1] - 1)]
+
+def yearly_input_values(inputs, n_years):
+    """Values of the time-varying inputs (YEARLY_INPUTS) in years 1..n_years, shaped (..., n_years)
+
+    Each value grows by its yearly rate from year 2 on, unless its per-year schedule is given.
+    Inputs may be scalars or arrays of rows/draws; a schedule may be one text for all rows or
+    one text per row (each distinct text is parsed once).
+    """
+    parsed = {}
+    yearly = {}
+    for key, (growth_key, schedule_key) in YEARLY_INPUTS.items():
+        base = np.asarray(inputs[key], dtype=float)[..., np.newaxis]
+        growth = np.asarray(inputs[growth_key], dtype=float)[..., np.newaxis]
+        values = base * (1 + growth / 100) ** np.arange(n_years)
+        schedules = np.asarray(inputs.get(schedule_key, ''), dtype=str)
+        if not schedules.any():
+            yearly[key] = values
+            continue
+        for schedule in np.unique(schedules):
+            if schedule not in parsed:
+                parsed[schedule] = parse_yearly_schedule(schedule)
+            if parsed[schedule]:
+                values = np.where((schedules == schedule)[..., np.newaxis],
+                                  _carry_forward(parsed[schedule], n_years), values)
+        yearly[key] = values
+    return yearly
+
+def calculate_yearly_benefits(inputs, n_years):
+    """calculate_annual_benefits for each of years 1..n_years, and the yearly input values used
+
+    Returns (benefits, yearly_inputs): the time-varying inputs take their value of each year
+    (see yearly_input_values), all others are the same every year. Benefit arrays have a
+    trailing years axis (length 1 where a benefit does not vary by year).
+    """
+    yearly_inputs = yearly_input_values(inputs, n_years)
+    year_inputs = {key: np.asarray(inputs[key], dtype=float)[..., np.newaxis] for key in MODEL_INPUT_KEYS}
+    year_inputs.update(yearly_inputs)
+    return calculate_annual_benefits(year_inputs), yearly_inputs
+
+# --- Implementation Delay Functions ---
+def calculate_benefit_realization_factor(month, implementation_delay_months, ramp_up_months):
+    """Calculate what percentage of benefits are realized in a given month"""
+    if month <= implementation_delay_months:
+        return 0.0  # No benefits during implementation
+    elif month <= implementation_delay_months + ramp_up_months:
+        # Linear ramp-up during ramp-up period
+        months_since_golive = month - implementation_delay_months
+        return months_since_golive / ramp_up_months
+    else:
+        return 1.0  # Full benefits realized
+
+def benefit_realization_grid(implementation_delay_months, ramp_up_months, total_months):
+    """Benefit realization factors for months 1..total_months, shaped (..., total_months)
+
+    Delay and ramp-up may be scalars or arrays (e.g. one entry per scenario); the
+    result matches calculate_benefit_realization_factor month by month.
+    """
+    delay = np.asarray(implementation_delay_months, dtype=float)[..., np.newaxis]
+    ramp = np.asarray(ramp_up_months, dtype=float)[..., np.newaxis]
+    months_since_golive = np.arange(1, total_months + 1) - delay
+
+    # Linear ramp-up after go-live; a zero ramp-up jumps straight to full benefits
+    ramp_factor = np.where(ramp > 0, months_since_golive / np.where(ramp > 0, ramp, 1.0), 1.0)
+    return np.where(months_since_golive > 0, np.minimum(ramp_factor, 1.0), 0.0)
+
+def calculate_monthly_cash_flows(annual_benefits, annual_platform_cost, one_time_services_cost,
+                                 realization_factors, yearly_values=False):
+    """Monthly net and cumulative cash flows from a realization grid, including month 0
+
+    With yearly_values, annual_benefits and annual_platform_cost hold one value per year along
+    their last axis and each month takes its year's value (the last year's continues after it).
+    """
+    if yearly_values:
+        month_years = np.arange(realization_factors.shape[-1]) // 12
+        annual_benefits = _carry_forward(annual_benefits, month_years[-1] + 1)[..., month_years]
+        annual_platform_cost = _carry_forward(annual_platform_cost, month_years[-1] + 1)[..., month_years]
+    else:
+        annual_benefits = np.asarray(annual_benefits, dtype=float)[..., np.newaxis]
+        annual_platform_cost = np.asarray(annual_platform_cost, dtype=float)[..., np.newaxis]
+    one_time_services_cost = np.asarray(one_time_services_cost, dtype=float)[..., np.newaxis]
+
+    monthly_net = (annual_benefits / 12) * realization_factors - annual_platform_cost / 12
+    # Initial investment (services cost) incurred at the beginning (month 0)
+    month_zero = np.broadcast_to(-one_time_services_cost, monthly_net.shape[:-1] + (1,))
+    monthly_net = np.concatenate([month_zero, monthly_net], axis=-1)
+    return monthly_net, np.cumsum(monthly_net, axis=-1)
+
+def _payback_from_cash_flows(monthly_net, cumulative, annual_benefits, annual_platform_cost):
+    """Fractional payback month from a monthly series that runs at least until full benefits
+
+    Cash flows accrue evenly within each month, so the cumulative cash flow is linear between
+    month ends: the first zero crossing is interpolated within its month. Past the end of the
+    series the monthly net cash flow is constant, so a later crossing is solved in closed form
+    (inf if never reached).
+    """
+    series_months = monthly_net.shape[-1] - 1
+    reached = cumulative[..., 1:] >= 0
+    crossing_month = np.argmax(reached, axis=-1) + 1
+    before_crossing = np.take_along_axis(cumulative, (crossing_month - 1)[..., np.newaxis], axis=-1)[..., 0]
+    crossing_step = np.take_along_axis(monthly_net, crossing_month[..., np.newaxis], axis=-1)[..., 0]
+    month_fraction = np.clip(_safe_divide(-before_crossing, crossing_step), 0.0, 1.0)
+    series_payback = crossing_month - 1 + month_fraction
+
+    full_monthly_net = np.broadcast_to((annual_benefits - annual_platform_cost) / 12, cumulative.shape[:-1])
+    months_after_series = _safe_divide(-cumulative[..., -1], full_monthly_net)
+    tail_payback = np.where(full_monthly_net > 0, series_months + months_after_series, np.inf)
+
+    return np.where(reached.any(axis=-1), series_payback, tail_payback)
+
+# Annual rates scanned to bracket the IRR (-99% to +1,000,000% a year)
+_IRR_SCAN_RATES = np.array([-0.99, 0.0, 1.0, 1e4])
+
+def solve_irr(cash_flows, timing_years, max_iterations=100, xtol=1e-12):
+    """Vectorized internal rate of return of many cash-flow series at once
+
+    cash_flows holds one series per row along the last axis; timing_years is the time of each
+    flow in years (broadcast against cash_flows). Solves sum(cash_flows * (1 + irr) ** -t) = 0
+    for the annual irr: a scan over a coarse rate grid brackets the first root, then Newton
+    steps on log(1 + irr) refine it, falling back to bisection whenever a step leaves the
+    bracket or converges slower than bisection. Series without both an outflow and an inflow
+    (e.g. all zero) or without a root in the scanned range have no IRR and give NaN.
+    """
+    cash_flows = np.asarray(cash_flows, dtype=float)
+    batch_shape = cash_flows.shape[:-1]
+    flows = cash_flows.reshape(-1, cash_flows.shape[-1])
+    times = np.broadcast_to(np.asarray(timing_years, dtype=float), cash_flows.shape).reshape(flows.shape)
+
+    def present_value(rows, log_rate):
+        weighted = flows[rows] * np.exp(-log_rate[:, np.newaxis] * times[rows])
+        return weighted.sum(axis=-1), -(weighted * times[rows]).sum(axis=-1)
+
+    n_rows = len(flows)
+    all_rows = np.arange(n_rows)
+    # Present values this close to zero are rounding noise of the series
+    ftol = 1e-13 * np.abs(flows).sum(axis=-1)
+    mixed_signs = (flows < 0).any(axis=-1) & (flows > 0).any(axis=-1)
+    scan = np.log1p(_IRR_SCAN_RATES)
+    scan_values = np.stack([present_value(all_rows, np.full(n_rows, rate))[0] for rate in scan], axis=-1)
+    sign_change = np.sign(scan_values[:, :-1]) * np.sign(scan_values[:, 1:]) < 0
+    bracketed = sign_change.any(axis=-1)
+    first = np.argmax(sign_change, axis=-1)
+
+    # low always keeps the sign of f_low, so low < x < high; start from the secant point
+    low, high = scan[first], scan[first + 1]
+    f_low = scan_values[all_rows, first]
+    f_high = scan_values[all_rows, first + 1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x = np.where(bracketed, low - f_low * (high - low) / (f_high - f_low), np.nan)
+    # A series can also hit zero exactly on a scanned rate (e.g. an IRR of 0%)
+    # (an all-zero series is zero at every rate but has no IRR)
+    on_grid = mixed_signs & ~bracketed & (scan_values == 0).any(axis=-1)
+    log_rate = np.where(on_grid, scan[np.argmax(scan_values == 0, axis=-1)], np.nan)
+    solved = ~bracketed
+    step_before_last = high - low
+    last_step = high - low
+    for _ in range(max_iterations):
+        active = np.flatnonzero(~solved)
+        if len(active) == 0:
+            break
+        xs = x[active]
+        fx, slope = present_value(active, xs)
+
+        same_side = np.sign(fx) == np.sign(f_low[active])
+        low[active] = np.where(same_side, xs, low[active])
+        high[active] = np.where(same_side, high[active], xs)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            newton = xs - fx / slope
+        accept = (np.isfinite(newton) & (newton > low[active]) & (newton < high[active])
+                  & (np.abs(newton - xs) <= step_before_last[active] / 2))
+        next_x = np.where(accept, newton, (low[active] + high[active]) / 2)
+
+        done = ((np.abs(fx) <= ftol[active]) | (high[active] - low[active] <= xtol)
+                | (accept & (np.abs(newton - xs) <= xtol)))
+        log_rate[active[done]] = np.where(np.abs(fx[done]) <= ftol[active[done]], xs[done], next_x[done])
+        solved[active[done]] = True
+
+        step_before_last[active] = last_step[active]
+        last_step[active] = np.abs(next_x - xs)
+        x[active] = next_x
+
+    # Rows still open after max_iterations report the bracket midpoint
+    unfinished = np.flatnonzero(np.isnan(log_rate) & bracketed)
+    log_rate[unfinished] = (low[unfinished] + high[unfinished]) / 2
+    return np.expm1(log_rate).reshape(batch_shape)
+
+def calculate_mirr(cash_flows, timing_years, horizon_years, finance_rate, reinvestment_rate=None):
+    """Modified internal rate of return of many cash-flow series at once
+
+    Negative flows are discounted to time 0 at finance_rate and positive flows compounded to
+    horizon_years at reinvestment_rate (default: finance_rate); both rates are annual fractions
+    broadcast against the series batch. NaN where a series lacks either negative or positive flows.
+    """
+    cash_flows = np.asarray(cash_flows, dtype=float)
+    timing_years = np.asarray(timing_years, dtype=float)
+    finance_rate = np.asarray(finance_rate, dtype=float)[..., np.newaxis]
+    reinvestment_rate = finance_rate if reinvestment_rate is None else np.asarray(reinvestment_rate, dtype=float)[..., np.newaxis]
+
+    outflows = -(np.minimum(cash_flows, 0) * (1 + finance_rate) ** -timing_years).sum(axis=-1)
+    inflows = (np.maximum(cash_flows, 0) * (1 + reinvestment_rate) ** (horizon_years - timing_years)).sum(axis=-1)
+    valid = (outflows > 0) & (inflows > 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mirr = (inflows / outflows) ** (1 / horizon_years) - 1
+    return np.where(valid, mirr, np.nan)
+
+def evaluate_cash_flows(annual_benefits, annual_platform_cost, one_time_services_cost,
+                        implementation_delay_months, ramp_up_months, evaluation_years, discount_rate,
+                        mid_period_discounting=0, rates_of_return=False, yearly_values=False):
+    """Single-pass monthly cash-flow model for a batch of scenarios
+
+    All money and timeline arguments broadcast against each other (scenarios along the
+    leading axis); discount_rate is a fraction. One monthly net cash-flow series is built
+    per scenario (month 0 holds the services cost) and everything else is derived from it:
+    NPV discounts each month at the effective monthly rate, at month end or, where
+    mid_period_discounting is 1, mid-month; yearly figures are sums of the months in each
+    year; payback is the zero crossing of the cumulative series. The series runs past the
+    evaluation period when needed so payback after the horizon is still exact. With
+    rates_of_return, the annual IRR and MIRR (discount rate as finance and reinvestment rate)
+    of the evaluation-period series are added; they are None otherwise. With yearly_values,
+    annual_benefits and annual_platform_cost carry a trailing axis of values per year (year 1
+    first), so the grid is computed over scenarios x years x months; after the last given year
+    (including months past the evaluation period) the last year's values continue.
+    """
+    total_months = evaluation_years * 12
+    annual_benefits = np.asarray(annual_benefits, dtype=float)
+    annual_platform_cost = np.asarray(annual_platform_cost, dtype=float)
+    if not yearly_values:
+        annual_benefits = annual_benefits[..., np.newaxis]
+        annual_platform_cost = annual_platform_cost[..., np.newaxis]
+    one_time_services_cost = np.asarray(one_time_services_cost, dtype=float)
+    discount_rate = np.asarray(discount_rate, dtype=float)
+    delay = np.asarray(implementation_delay_months, dtype=float)
+    ramp = np.asarray(ramp_up_months, dtype=float)
+
+    # One series long enough for the evaluation period and for every scenario to reach full benefits
+    series_months = max(total_months, int(np.ceil(np.max(delay + ramp, initial=0))))
+    realization = benefit_realization_grid(delay, ramp, series_months)
+    monthly_net, monthly_cumulative = calculate_monthly_cash_flows(
+        annual_benefits, annual_platform_cost, one_time_services_cost, realization, yearly_values=True
+    )
+    batch_shape = np.broadcast_shapes(monthly_net.shape[:-1], discount_rate.shape,
+                                      np.shape(mid_period_discounting))
+    monthly_net = np.broadcast_to(monthly_net, batch_shape + (series_months + 1,))
+    monthly_cumulative = np.broadcast_to(monthly_cumulative, batch_shape + (series_months + 1,))
+    realization = np.broadcast_to(realization, batch_shape + (series_months,))
+
+    payback_months = _payback_from_cash_flows(monthly_net, monthly_cumulative,
+                                              annual_benefits[..., -1], annual_platform_cost[..., -1])
+
+    # Evaluation period slices; month m's cash flow is discounted from month end (or mid-month)
+    horizon_net = monthly_net[..., :total_months + 1]
+    offset = np.asarray(mid_period_discounting, dtype=float)[..., np.newaxis] * 0.5
+    timing = np.maximum(np.arange(total_months + 1) - offset, 0.0)
+    discount_factors = (1 + discount_rate[..., np.newaxis]) ** (-timing / 12)
+    monthly_present_value = horizon_net * discount_factors
+    npv = monthly_present_value.sum(axis=-1)
+
+    # Rates of return of the same series and timing convention (NPV at the IRR is zero)
+    irr = solve_irr(horizon_net, timing / 12) if rates_of_return else None
+    mirr = calculate_mirr(horizon_net, timing / 12, evaluation_years, discount_rate) if rates_of_return else None
+
+    # Yearly rollups of the same months (the month 0 services cost falls in year 1)
+    years = np.arange(1, evaluation_years + 1)
+    yearly_shape = batch_shape + (evaluation_years, 12)
+    yearly_realization = realization[..., :total_months].reshape(yearly_shape).mean(axis=-1)
+    yearly_benefits = _carry_forward(annual_benefits, evaluation_years) * yearly_realization
+    yearly_platform_cost = np.broadcast_to(_carry_forward(annual_platform_cost, evaluation_years), yearly_benefits.shape)
+    yearly_services_cost = np.where(years == 1, one_time_services_cost[..., np.newaxis], 0.0)
+    yearly_services_cost = np.broadcast_to(yearly_services_cost, yearly_benefits.shape)
+    yearly_net = horizon_net[..., 1:].reshape(yearly_shape).sum(axis=-1) - yearly_services_cost
+    yearly_present_value = monthly_present_value[..., 1:].reshape(yearly_shape).sum(axis=-1)
+    yearly_present_value[..., 0] += monthly_present_value[..., 0]
+
+    tco = (yearly_platform_cost + yearly_services_cost).sum(axis=-1)
+    roi = np.divide(npv, tco, out=np.zeros_like(npv), where=tco != 0)
+
+    return {
+        'realization': realization[..., :total_months],
+        'yearly_realization': yearly_realization,
+        'yearly_benefits': yearly_benefits,
+        'yearly_platform_cost': yearly_platform_cost,
+        'yearly_services_cost': yearly_services_cost,
+        'yearly_net_cash_flow': yearly_net,
+        'yearly_present_value': yearly_present_value,
+        'monthly_net_cash_flow': horizon_net,
+        'monthly_cumulative_cash_flow': monthly_cumulative[..., :total_months + 1],
+        'npv': npv,
+        'tco': tco,
+        'roi': roi,
+        'irr': irr,
+        'mirr': mirr,
+        'payback_years': payback_months / 12,
+        'payback_months': payback_months
+    }
+
+def get_scenario_impl_delay(implementation_delay_months, implementation_delay_multiplier):
+    """Scenario implementation delay in whole months"""
+    scenario_delay = np.trunc(np.asarray(implementation_delay_months) * np.asarray(implementation_delay_multiplier))
+    return np.maximum(0, scenario_delay).astype(int) # Ensure not negative
+
+def format_payback(period, unit, horizon=None):
+    """Format a numeric payback period for display, flagging results beyond the evaluation horizon"""
+    if not np.isfinite(period):
+        return "Not reached"
+    text = f"{period:.1f} {unit}"
+    if horizon is not None and period > horizon:
+        text += " (beyond evaluation period)"
+    return text
+
+def format_rate(rate):
+    """Format an annual rate of return (IRR/MIRR) for display"""
+    if not np.isfinite(rate):
+        return "Not defined"
+    return f"{rate * 100:.1f}%"
+
+def _scenario_result(grid, index, benefits_multiplier, scenario_impl_delay, scenario_benefits):
+    """Build the per-scenario result dict from one row of an evaluate_cash_flows batch"""
+    scenario_cash_flows = []
+    for year_index in range(grid['yearly_net_cash_flow'].shape[-1]):
+        scenario_cash_flows.append({
+            'year': year_index + 1,
+            'benefits': grid['yearly_benefits'][index][year_index],
+            'platform_cost': grid['yearly_platform_cost'][index][year_index],
+            'services_cost': grid['yearly_services_cost'][index][year_index],
+            'net_cash_flow': grid['yearly_net_cash_flow'][index][year_index],
+            'present_value': grid['yearly_present_value'][index][year_index],
+            'realization_factor': grid['yearly_realization'][index][year_index]
+        })
+
+    return {
+        'npv': grid['npv'][index],
+        'roi': grid['roi'][index],
+        'irr': grid['irr'][index],
+        'mirr': grid['mirr'][index],
+        'payback': grid['payback_years'][index],
+        'payback_months': grid['payback_months'][index],
+        'impl_delay': int(scenario_impl_delay),
+        'benefits_mult': benefits_multiplier,
+        'cash_flows': scenario_cash_flows,
+        'annual_benefits': scenario_benefits,
+        'monthly_realization': grid['realization'][index],
+        'monthly_net_cash_flow': grid['monthly_net_cash_flow'][index],
+        'monthly_cumulative_cash_flow': grid['monthly_cumulative_cash_flow'][index]
+    }
+
+def calculate_scenario_results(inputs, total_annual_benefits, benefits_multiplier, implementation_delay_multiplier, scenario_name):
+    """Calculate NPV, ROI, and payback for a given scenario"""
+    scenario_benefits = total_annual_benefits * benefits_multiplier
+    scenario_impl_delay = get_scenario_impl_delay(inputs['implementation_delay'], implementation_delay_multiplier)
+    grid = evaluate_cash_flows(
+        [scenario_benefits], inputs['platform_cost'], inputs['services_cost'],
+        [scenario_impl_delay], inputs['benefits_ramp_up'],
+        inputs['evaluation_years'], inputs['discount_rate'] / 100, inputs.get('mid_period_discounting', 0),
+        rates_of_return=True
+    )
+    return _scenario_result(grid, 0, benefits_multiplier, scenario_impl_delay, scenario_benefits)
+
+# Payback Periods in Months (More granular calculation)
+def calculate_payback_months(annual_benefits, annual_platform_cost, one_time_services_cost,
+                             implementation_delay_months, benefits_ramp_up_months):
+    """Calculates the fractional payback period in months (inf if never reached)."""
+    grid = evaluate_cash_flows(annual_benefits, annual_platform_cost, one_time_services_cost,
+                               implementation_delay_months, benefits_ramp_up_months, 1, 0.0)
+    return grid['payback_months'][()]
+
+def get_monthly_cumulative_cash_flow(annual_benefits, annual_platform_cost, one_time_services_cost,
+                                     implementation_delay_months, benefits_ramp_up_months, evaluation_years):
+    """Monthly net and cumulative cash flow columns (month 0 holds the services cost)"""
+    grid = evaluate_cash_flows(annual_benefits, annual_platform_cost, one_time_services_cost,
+                               implementation_delay_months, benefits_ramp_up_months, evaluation_years, 0.0)
+    return {
+        'month': np.arange(evaluation_years * 12 + 1),
+        'net_cash_flow': grid['monthly_net_cash_flow'],
+        'cumulative_net_cash_flow': grid['monthly_cumulative_cash_flow']
+    }
+
+def run_assessment(input_values, scenarios=None):
+    """Evaluate a configuration (as collected by get_all_input_values) across all scenarios"""
+    return run_assessments([input_values], scenarios)[0]
+
+def run_assessments(input_values_list, scenarios=None):
+    """Evaluate many configurations across all scenarios in vectorized passes
+
+    Benefits of all configurations are computed in one configurations x years column pass and
+    cash flows in one configurations x scenarios x months pass per evaluation period. Returns
+    one assessment per configuration, as run_assessment would; its 'benefits' breakdown is
+    that of year 1 and 'benefits_by_year' holds the total annual benefits of every year.
+    """
+    all_inputs = [complete_input_values(input_values) for input_values in input_values_list]
+    scenarios = DEFAULT_SCENARIOS if scenarios is None else scenarios
+    n_rows = len(all_inputs)
+    if n_rows == 0:
+        return []
+    columns = {key: np.array([float(inputs[key]) for inputs in all_inputs]) for key in MODEL_INPUT_KEYS}
+    columns.update({key: np.array([inputs[key] for inputs in all_inputs], dtype=str) for key in YEARLY_SCHEDULE_KEYS})
+    evaluation_years = columns['evaluation_years'].astype(int)
+
+    with stage('model: cost and benefit calculations', 'model'):
+        yearly_benefits, yearly_inputs = calculate_yearly_benefits(columns, int(evaluation_years.max()))
+        benefits = {key: value[:, 0] for key, value in yearly_benefits.items()}
+
+    all_rows = np.arange(n_rows)
+    scenario_inputs = _scenario_cash_flow_inputs(columns, yearly_benefits['total_annual_benefits'],
+                                                 yearly_inputs['platform_cost'], all_rows, _scenario_arrays(scenarios))
+
+    assessments = [None] * n_rows
+    for years in np.unique(evaluation_years):
+        rows = np.flatnonzero(evaluation_years == years)
+        # All scenarios of these configurations as one configurations x scenarios x months array computation
+        with stage('model: scenario cash flows, NPV, IRR and payback', 'model'):
+            grid = evaluate_cash_flows(
+                scenario_inputs['annual_benefits'][rows, :, :years], scenario_inputs['platform_cost'][rows, :, :years],
+                scenario_inputs['services_cost'][rows], scenario_inputs['implementation_delay'][rows],
+                scenario_inputs['ramp_up_months'][rows], int(years),
+                columns['discount_rate'][rows, np.newaxis] / 100, columns['mid_period_discounting'][rows, np.newaxis],
+                rates_of_return=True, yearly_values=True
+            )
+
+        with stage('model: scenario results', 'model'):
+            for position, row in enumerate(rows):
+                row_grid = {name: values[position] for name, values in grid.items()}
+                scenario_results = {}
+                for index, (scenario_name, params) in enumerate(scenarios.items()):
+                    result = _scenario_result(row_grid, index, params["benefits_multiplier"],
+                                              scenario_inputs['implementation_delay'][row, index],
+                                              scenario_inputs['annual_benefits'][row, index, 0])
+                    result.update({
+                        "delay_mult": params["implementation_delay_multiplier"],
+                        "ramp_up_months": scenario_inputs['ramp_up_months'][row, index],
+                        "platform_cost": scenario_inputs['platform_cost'][row, index, 0],
+                        "services_cost": scenario_inputs['services_cost'][row, index],
+                        "color": params.get("color"),
+                        "description": params.get("description"),
+                        "icon": params.get("icon")
+                    })
+                    scenario_results[scenario_name] = result
+
+                assessments[row] = {
+                    'inputs': all_inputs[row],
+                    'benefits': {key: value[row] for key, value in benefits.items()},
+                    'benefits_by_year': yearly_benefits['total_annual_benefits'][row, :years],
+                    'scenario_results': scenario_results,
+                    'cash_flow_grid': row_grid
+                }
+    return assessments
+
+def _json_number(value):
+    """Plain float for JSON output; non-finite values (payback never reached, undefined IRR) become None"""
+    value = float(value)
+    return value if np.isfinite(value) else None
+
+def summarize_assessment(assessment, include_cash_flows=True):
+    """JSON-serializable scenario metrics (and optionally cash flows) of an assessment"""
+    scenarios = {}
+    for scenario_name, result in assessment['scenario_results'].items():
+        summary = {
+            'npv': _json_number(result['npv']),
+            'roi': _json_number(result['roi']),
+            'irr': _json_number(result['irr']),
+            'mirr': _json_number(result['mirr']),
+            'payback_months': _json_number(result['payback_months']),
+            'payback_years': _json_number(result['payback']),
+            'annual_benefits': _json_number(result['annual_benefits'])
+        }
+        if include_cash_flows:
+            summary['yearly_cash_flows'] = [
+                {key: (int(value) if key == 'year' else _json_number(value)) for key, value in cash_flow.items()}
+                for cash_flow in result['cash_flows']
+            ]
+            summary['monthly_net_cash_flow'] = [_json_number(value) for value in result['monthly_net_cash_flow']]
+            summary['monthly_cumulative_cash_flow'] = [_json_number(value) for value in result['monthly_cumulative_cash_flow']]
+        scenarios[scenario_name] = summary
+
+    return {
+        'model_version': MODEL_VERSION,
+        'currency': assessment['inputs']['currency'],
+        'evaluation_years': int(assessment['inputs']['evaluation_years']),
+        'total_annual_benefits': _json_number(assessment['benefits']['total_annual_benefits']),
+        'scenarios': scenarios
+    }
+
+# Process-wide cache of assessments, shared by every Streamlit session and batch caller
+ASSESSMENT_CACHE = LRUCache(max_entries=512)
+
+def model_fingerprint(input_values, scenarios=None):
+    """Canonical hash of everything that affects the model results"""
+    inputs = complete_input_values(input_values)
+    return fingerprint({
+        'model_version': MODEL_VERSION,
+        'inputs': {key: inputs[key] for key in MODEL_INPUT_KEYS + YEARLY_SCHEDULE_KEYS},
+        'scenarios': DEFAULT_SCENARIOS if scenarios is None else scenarios
+    })
+
+def run_assessment_cached(input_values, scenarios=None, cache=ASSESSMENT_CACHE):
+    """run_assessment served from a bounded LRU cache keyed on the model fingerprint
+
+    Cached results are shared between callers and must be treated as read-only.
+    """
+    assessment = cache.get_or_compute(
+        model_fingerprint(input_values, scenarios),
+        lambda: run_assessment(input_values, scenarios)
+    )
+    return dict(assessment, inputs=complete_input_values(input_values))
+
+# Configuration x scenario x month cells evaluated per chunk by evaluate_configurations (~32 MB per array)
+_CHUNK_CELLS = 4_000_000
+
+def evaluate_configurations(columns, scenarios=None, chunk_size=10_000, rates_of_return=True):
+    """Score many configurations under every scenario in vectorized column passes
+
+    columns maps model input keys (and optionally per-year schedule keys) to equally long
+    arrays (one entry per configuration; missing keys use their defaults). Returns the year 1
+    annual benefit breakdown per configuration and configurations x scenarios arrays of NPV,
+    ROI, TCO and payback, plus IRR and MIRR unless rates_of_return is False. Rows are grouped
+    by evaluation period and processed in chunks sized to keep the scenarios x month grid
+    memory bounded however long the period.
+    """
+    scenarios = DEFAULT_SCENARIOS if scenarios is None else scenarios
+    n_rows = len(next(iter(columns.values()))) if columns else 0
+    defaults = complete_input_values({})
+    inputs = {
+        key: np.broadcast_to(np.asarray(columns.get(key, defaults[key]), dtype=float), (n_rows,))
+        for key in MODEL_INPUT_KEYS
+    }
+    inputs.update({
+        key: np.broadcast_to(np.asarray(columns.get(key, defaults[key]), dtype=str), (n_rows,))
+        for key in YEARLY_SCHEDULE_KEYS
+    })
+
+    arrays = _scenario_arrays(scenarios)
+    metrics = ('npv', 'roi', 'tco', 'payback_months') + (('irr', 'mirr') if rates_of_return else ())
+    results = {name: np.empty((n_rows, len(scenarios))) for name in metrics}
+    benefits = {}
+
+    evaluation_years = inputs['evaluation_years'].astype(int)
+    for years in np.unique(evaluation_years):
+        group = np.flatnonzero(evaluation_years == years)
+        rows_per_chunk = min(chunk_size, max(1, _CHUNK_CELLS // (len(scenarios) * (int(years) * 12 + 1))))
+        for start in range(0, len(group), rows_per_chunk):
+            rows = group[start:start + rows_per_chunk]
+            chunk_inputs = {key: value[rows] for key, value in inputs.items()}
+            chunk_benefits, chunk_yearly_inputs = calculate_yearly_benefits(chunk_inputs, int(years))
+            for key, value in chunk_benefits.items():
+                benefits.setdefault(key, np.empty(n_rows))[rows] = np.broadcast_to(value[..., 0], (len(rows),))
+            scenario_inputs = _scenario_cash_flow_inputs(
+                chunk_inputs,
+                np.broadcast_to(chunk_benefits['total_annual_benefits'], (len(rows), int(years))),
+                chunk_yearly_inputs['platform_cost'], np.arange(len(rows)), arrays
+            )
+            grid = evaluate_cash_flows(
+                scenario_inputs['annual_benefits'],
+                scenario_inputs['platform_cost'],
+                scenario_inputs['services_cost'],
+                scenario_inputs['implementation_delay'],
+                scenario_inputs['ramp_up_months'],
+                int(years),
+                inputs['discount_rate'][rows, np.newaxis] / 100,
+                inputs['mid_period_discounting'][rows, np.newaxis],
+                rates_of_return,
+                yearly_values=True
+            )
+            for name in results:
+                results[name][rows] = grid[name]
+
+    results['payback_years'] = results['payback_months'] / 12
+    return {
+        'scenarios': list(scenarios.keys()),
+        'inputs': inputs,
+        'benefits': benefits,
+        **results
+    }
@@ -0,0 +1,157 @@
+# Goal seek: solve for the input value at which a scenario metric reaches a target
+
+import numpy as np
+
+from bva_config import INPUT_BOUNDS, MODEL_INPUT_KEYS, YEARLY_SCHEDULE_KEYS, complete_input_values
+from bva_engine import DEFAULT_SCENARIOS, evaluate_configurations
+
+GOAL_SEEK_METRICS = {
+    'npv': 'NPV',
+    'roi': 'ROI',
+    'payback_months': 'Payback (Months)'
+}
+
+# Unbounded search ranges are widened by doubling until the target is bracketed
+_MAX_EXPANSIONS = 64
+
+def _evaluate_metric(columns, rows, key, values, metric, scenario):
+    """Scenario metric for the given configuration rows with input key set to values"""
+    subset = {name: column[rows] for name, column in columns.items()}
+    subset[key] = values
+    return evaluate_configurations(subset, scenario, rates_of_return=False)[metric][:, 0]
+
+def solve_break_even_columns(columns, key, metric='npv', target=0.0, scenario_name='Expected',
+                             search_range=None, scenarios=None, max_iterations=100, xtol=1e-9):
+    """Vectorized goal seek over many configurations given as column arrays
+
+    Finds, per configuration, the value of input key at which metric ('npv', 'roi' or
+    'payback_months') of the scenario equals target. The root is first bracketed within
+    search_range (default: the input's bounds, widened by doubling when unbounded above),
+    then refined with Newton steps on finite-difference slopes, falling back to bisection
+    whenever a step leaves the bracket or converges slower than bisection (payback and
+    the whole-month inputs are only piecewise smooth; for the latter the threshold where
+    the metric crosses the target is returned). Returns arrays of value, status and direction
+    (+1 if the metric rises with the input) plus the metric at both ends of the range.
+    """
+    scenarios = DEFAULT_SCENARIOS if scenarios is None else scenarios
+    scenario = {scenario_name: scenarios[scenario_name]}
+    defaults = complete_input_values({})
+    n_rows = len(next(iter(columns.values())))
+    columns = {**{name: np.broadcast_to(np.asarray(columns.get(name, defaults[name]), dtype=float), (n_rows,))
+                  for name in MODEL_INPUT_KEYS},
+               **{name: np.broadcast_to(np.asarray(columns.get(name, defaults[name]), dtype=str), (n_rows,))
+                  for name in YEARLY_SCHEDULE_KEYS}}
+    all_rows = np.arange(n_rows)
+
+    def gap(rows, values):
+        return _evaluate_metric(columns, rows, key, values, metric, scenario) - target
+
+    low, high = search_range if search_range is not None else INPUT_BOUNDS.get(key, (0, None))
+    a = np.full(n_rows, float(low))
+    fa = gap(all_rows, a)
+    if high is None:
+        # Widen the upper end from the current value until the sign of the gap changes
+        b = np.maximum(2 * np.abs(columns[key]), 1.0)
+        fb = gap(all_rows, b)
+        for _ in range(_MAX_EXPANSIONS):
+            unbracketed = np.flatnonzero(np.sign(fa) == np.sign(fb))
+            if len(unbracketed) == 0:
+                break
+            b[unbracketed] *= 2
+            fb[unbracketed] = gap(unbracketed, b[unbracketed])
+    else:
+        b = np.full(n_rows, float(high))
+        fb = gap(all_rows, b)
+
+    metric_at_low, metric_at_high = fa + target, fb + target
+    with np.errstate(invalid='ignore'):
+        direction = np.where(metric_at_high >= metric_at_low, 1, -1)
+    bracketed = (np.sign(fa) != np.sign(fb)) & ~np.isnan(fa) & ~np.isnan(fb)
+    value = np.where(fa == 0, a, np.where(fb == 0, b, np.nan))
+    solved = (fa == 0) | (fb == 0)
+
+    # Start from the midpoint; a is always the end whose gap has the sign of fa
+    x = (a + b) / 2
+    step_before_last = np.abs(b - a)
+    last_step = np.abs(b - a)
+    iterations = np.zeros(n_rows, dtype=int)
+    for _ in range(max_iterations):
+        active = np.flatnonzero(bracketed & ~solved)
+        if len(active) == 0:
+            break
+        iterations[active] += 1
+        xs = x[active]
+        step = 1e-6 * np.maximum(np.abs(xs), 1.0)
+        both = gap(np.concatenate([active, active]), np.concatenate([xs, xs + step]))
+        fx, fx_step = both[:len(active)], both[len(active):]
+
+        # Shrink the bracket around the root
+        same_side = np.sign(fx) == np.sign(fa[active])
+        a[active] = np.where(same_side, xs, a[active])
+        fa[active] = np.where(same_side, fx, fa[active])
+        b[active] = np.where(same_side, b[active], xs)
+        fb[active] = np.where(same_side, fb[active], fx)
+
+        # Newton step if it stays inside the bracket and shrinks faster than bisection would
+        lower = np.minimum(a[active], b[active])
+        upper = np.maximum(a[active], b[active])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            newton = xs - fx * step / (fx_step - fx)
+        accept = (np.isfinite(newton) & (newton > lower) & (newton < upper)
+                  & (np.abs(newton - xs) <= step_before_last[active] / 2))
+        next_x = np.where(accept, newton, (lower + upper) / 2)
+
+        tolerance = xtol * np.maximum(np.abs(xs), 1.0)
+        done = (fx == 0) | (upper - lower <= tolerance) | (accept & (np.abs(newton - xs) <= tolerance))
+        value[active[done]] = np.where(fx[done] == 0, xs[done], next_x[done])
+        solved[active[done]] = True
+
+        step_before_last[active] = last_step[active]
+        last_step[active] = np.abs(next_x - xs)
+        x[active] = next_x
+
+    # Rows still open after max_iterations report the bracket midpoint
+    unfinished = bracketed & ~solved
+    value[unfinished] = (a[unfinished] + b[unfinished]) / 2
+
+    status = np.where(solved | unfinished, 'solved', 'not_bracketed')
+    return {
+        'value': value,
+        'status': status,
+        'direction': direction,
+        'iterations': iterations,
+        'metric_at_low': metric_at_low,
+        'metric_at_high': metric_at_high
+    }
+
+def solve_break_even_batch(configurations, key, metric='npv', target=0.0, scenario_name='Expected',
+                           search_range=None, scenarios=None):
+    """Goal seek the same target across a list of configuration dicts in one vectorized call"""
+    inputs = [complete_input_values(configuration) for configuration in configurations]
+    columns = {name: np.array([float(values[name]) for values in inputs]) for name in MODEL_INPUT_KEYS}
+    columns.update({name: np.array([values[name] for values in inputs], dtype=str) for name in YEARLY_SCHEDULE_KEYS})
+    return solve_break_even_columns(columns, key, metric, target, scenario_name, search_range, scenarios)
+
+def solve_break_even(input_values, key, metric='npv', target=0.0, scenario_name='Expected',
+                     search_range=None, scenarios=None):
+    """Input value at which a scenario metric reaches target for one configuration
+
+    For example solve_break_even(config, 'platform_cost', 'npv', 0, 'Conservative') gives
+    the highest subscription cost that keeps Conservative NPV non-negative. Returns
+    value (None when the target is not reached within the search range), status,
+    direction (+1 if the metric rises with the input) and the metric at the range ends.
+    """
+    result = solve_break_even_batch([input_values], key, metric, target, scenario_name, search_range, scenarios)
+    value = float(result['value'][0])
+    return {
+        'key': key,
+        'metric': metric,
+        'target': target,
+        'scenario': scenario_name,
+        'value': value if np.isfinite(value) else None,
+        'status': str(result['status'][0]),
+        'direction': int(result['direction'][0]),
+        'iterations': int(result['iterations'][0]),
+        'metric_at_low': float(result['metric_at_low'][0]),
+        'metric_at_high': float(result['metric_at_high'][0])
+    }
@@ -0,0 +1,89 @@
+# Startup import cost report: per-package import time and resident memory of a fresh interpreter
+#
+# Usage: python bva_importtime.py [MODULE ...] [--top N]
+#
+# Each module set is imported in a new interpreter with -X importtime; self times are summed
+# per top-level package. The default report covers what a Streamlit worker loads at startup
+# and, separately, the reporting stack that is only loaded when a PDF is first generated.
+
+import argparse
+import os
+import subprocess
+import sys
+
+# Modules the app imports on every worker start
+STARTUP_MODULES = [
+    'streamlit', 'numpy', 'pandas', 'plotly.graph_objects',
+    'bva_config', 'bva_engine', 'bva_simulation', 'bva_portfolio', 'bva_sensitivity', 'bva_goalseek', 'bva_report'
+]
+
+# Modules loaded on first use (PDF generation)
+ON_DEMAND_MODULES = ['reportlab.platypus', 'reportlab.lib.styles', 'reportlab.graphics.charts.barcharts']
+
+_MEMORY_PROBE = (
+    "import resource, sys; "
+    "sys.stdout.write(str(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss))"
+)
+
+def measure_imports(modules, preloaded=()):
+    """Import cost of modules in a fresh interpreter, after importing (but not counting) preloaded
+
+    Returns {'packages': {top-level package: self microseconds}, 'total_us': ...,
+    'max_rss_kb': peak resident memory of the interpreter (None where unsupported)}.
+    """
+    code = "; ".join(
+        [f"import {module}" for module in preloaded]
+        + ["import sys; sys.stderr.write('--- measured ---\\n')"]
+        + [f"import {module}" for module in modules]
+        + [_MEMORY_PROBE if sys.platform != 'win32' else "pass"]
+    )
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+
+    packages = {}
+    measured = False
+    for line in completed.stderr.splitlines():
+        if line.startswith('--- measured ---'):
+            measured = True
+            continue
+        if not measured or not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        package = name.strip().split('.')[0]
+        packages[package] = packages.get(package, 0) + int(self_us)
+
+    return {
+        'packages': dict(sorted(packages.items(), key=lambda item: item[1], reverse=True)),
+        'total_us': sum(packages.values()),
+        'max_rss_kb': int(completed.stdout) if completed.stdout.strip().isdigit() else None
+    }
+
+def format_report(title, measurement, top=15):
+    """Text table of the most expensive packages in a measurement"""
+    lines = [f"{title}: {measurement['total_us'] / 1e6:.3f}s"
+             + (f", peak RSS {measurement['max_rss_kb'] / 1024:.0f} MB" if measurement['max_rss_kb'] else "")]
+    for package, self_us in list(measurement['packages'].items())[:top]:
+        lines.append(f"  {package:<28}{self_us / 1e3:>10.1f} ms  {self_us / measurement['total_us'] * 100:5.1f}%")
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report per-package import cost of the BVA app")
+    parser.add_argument("modules", nargs="*", help="Modules to measure (default: app startup and on-demand report stack)")
+    parser.add_argument("--top", type=int, default=15, help="Packages listed per report")
+    args = parser.parse_args(argv)
+
+    if args.modules:
+        print(format_report("Import cost", measure_imports(args.modules), args.top))
+        return 0
+
+    print(format_report("Startup imports", measure_imports(STARTUP_MODULES), args.top))
+    print()
+    print(format_report("On first PDF (loaded lazily)", measure_imports(ON_DEMAND_MODULES, STARTUP_MODULES), args.top))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
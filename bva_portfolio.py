@@ -0,0 +1,112 @@
+# Portfolio scoring: many customer configurations in one CSV, evaluated as column arrays
+
+import csv
+from io import StringIO
+
+import numpy as np
+
+from bva_config import (INPUT_KEYS, INPUT_SCHEMA, MODEL_INPUT_KEYS, YEARLY_SCHEDULE_KEYS, get_default_value,
+                        validate_input_columns)
+from bva_engine import evaluate_configurations
+
+# Optional column naming each customer row (row numbers are used when it is absent)
+CUSTOMER_COLUMN = 'customer'
+
+# Text columns kept as labels; per-year schedules are passed to the model as text and every
+# other input key is parsed as a number
+LABEL_KEYS = [key for key in INPUT_KEYS if key not in MODEL_INPUT_KEYS + YEARLY_SCHEDULE_KEYS]
+
+def portfolio_template_csv(input_values=None, rows=1):
+    """CSV with one column per input key, pre-filled with the given (or default) values"""
+    input_values = input_values or {}
+    output = StringIO()
+    writer = csv.writer(output)
+    writer.writerow([CUSTOMER_COLUMN] + INPUT_KEYS)
+    for row in range(rows):
+        writer.writerow([f"Customer {row + 1}"] + [input_values.get(key, get_default_value(key)) for key in INPUT_KEYS])
+    return output.getvalue()
+
+def parse_portfolio_csv(csv_content):
+    """Parse a portfolio CSV (one row per customer, columns named after the input keys)
+
+    Returns (customers, labels, columns, warnings, invalid_rows): customer names, label columns
+    and typed column arrays of every model input and per-year schedule for the valid rows,
+    messages about ignored or missing columns, and a message per row that is not scored (its
+    file line, customer and every invalid field). Every cell is checked against the input
+    schema; missing columns and blank cells take the default value.
+    """
+    reader = csv.reader(StringIO(csv_content))
+    try:
+        header = [name.strip() for name in next(reader)]
+    except StopIteration:
+        raise ValueError("The portfolio file is empty")
+    rows, line_numbers = [], []
+    for row in reader:
+        if any(cell.strip() for cell in row):
+            rows.append(row)
+            line_numbers.append(reader.line_num)
+    if not rows:
+        raise ValueError("The portfolio file has no customer rows")
+
+    # Transpose to columns once; short rows are padded with blanks
+    width = len(header)
+    raw_columns = dict(zip(header, zip(*(row[:width] + [''] * (width - len(row)) for row in rows))))
+    warnings = []
+
+    unknown = [name for name in header if name not in INPUT_KEYS and name != CUSTOMER_COLUMN]
+    if unknown:
+        warnings.append(f"Ignored unknown columns: {', '.join(unknown)}")
+    missing = [key for key in MODEL_INPUT_KEYS if key not in raw_columns]
+    if missing:
+        warnings.append(f"Using default values for missing columns: {', '.join(missing)}")
+
+    if CUSTOMER_COLUMN in raw_columns:
+        customers = [name.strip() or f"Customer {i + 1}" for i, name in enumerate(raw_columns[CUSTOMER_COLUMN])]
+    else:
+        customers = [f"Customer {i + 1}" for i in range(len(rows))]
+
+    input_columns = {}
+    for key in INPUT_KEYS:
+        if key in raw_columns:
+            cells = np.char.strip(np.asarray(raw_columns[key], dtype=str))
+            input_columns[key] = np.where(cells == '', str(INPUT_SCHEMA[key].default), cells)
+    typed, errors = validate_input_columns(input_columns, len(rows))
+
+    invalid_rows = [f"Line {line_numbers[row]} ({customers[row]}): {'; '.join(messages.values())}"
+                    for row, messages in errors.items()]
+    valid = np.ones(len(rows), dtype=bool)
+    valid[list(errors)] = False
+    if not valid.any():
+        raise ValueError(f"No valid customer rows ({invalid_rows[0]})")
+
+    customers = [customer for customer, keep in zip(customers, valid) if keep]
+    labels = {key: typed[key][valid].tolist() for key in LABEL_KEYS}
+    columns = {key: typed[key][valid] for key in MODEL_INPUT_KEYS + YEARLY_SCHEDULE_KEYS}
+    return customers, labels, columns, warnings, invalid_rows
+
+def score_portfolio(csv_content, scenarios=None):
+    """Parse a portfolio CSV and score every valid customer row under every scenario
+
+    Returns a dict with the parsed customers and labels, per-customer annual benefits and
+    customers x scenarios arrays of NPV, ROI, IRR, MIRR and payback (see evaluate_configurations),
+    plus the warnings and a message per invalid row that was not scored.
+    """
+    customers, labels, columns, warnings, invalid_rows = parse_portfolio_csv(csv_content)
+    results = evaluate_configurations(columns, scenarios)
+    return dict(results, customers=customers, labels=labels, warnings=warnings, invalid_rows=invalid_rows)
+
+def portfolio_table(portfolio):
+    """Flat results table (column name -> list) with one row per customer and metrics per scenario"""
+    table = {
+        'Customer': portfolio['customers'],
+        'Industry Template': portfolio['labels']['industry_template'],
+        'Currency': portfolio['labels']['currency'],
+        'Annual Benefits': portfolio['benefits']['total_annual_benefits']
+    }
+    for index, scenario_name in enumerate(portfolio['scenarios']):
+        table[f"{scenario_name} NPV"] = portfolio['npv'][:, index]
+        table[f"{scenario_name} ROI (%)"] = portfolio['roi'][:, index] * 100
+        table[f"{scenario_name} IRR (%)"] = portfolio['irr'][:, index] * 100
+        table[f"{scenario_name} MIRR (%)"] = portfolio['mirr'][:, index] * 100
+        table[f"{scenario_name} Payback (Months)"] = portfolio['payback_months'][:, index]
+    return table
@@ -0,0 +1,391 @@
+# Consolidated portfolio report: one PDF with a ranked overview and a summary page per account
+#
+# Usage: python bva_portfolio_report.py PORTFOLIO.csv OUTPUT.pdf [--organization NAME] [--scenarios SCENARIOS.json]
+#                                       [--workers N]
+#
+# Every account (row) of a portfolio CSV is scored in one vectorized pass (see bva_portfolio) and ranked
+# by reference-scenario NPV. The document is laid out from a story generated while it is built and written
+# to OUTPUT.pdf with compressed pages, so only a few pages of flowables exist at a time. Account charts are
+# built in a process pool a bounded window ahead of layout and stitched in as flattened vector drawings.
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from xml.sax.saxutils import escape
+
+import numpy as np
+
+from bva_batch import new_file_mode
+from bva_engine import DEFAULT_SCENARIOS, SCENARIO_COLORS, format_payback, format_rate, reference_scenario_name
+from bva_portfolio import score_portfolio
+from bva_report import (REPORT_DEPENDENCIES_AVAILABLE, create_scenario_chart_for_pdf, create_timeline_chart_for_pdf,
+                        flatten_drawing)
+
+# Ranked overview rows per page (each page's table repeats the header)
+OVERVIEW_ROWS_PER_PAGE = 34
+
+# Accounts whose charts a worker builds per task, and tasks in flight per worker
+CHART_BATCH_SIZE = 16
+CHART_TASKS_PER_WORKER = 2
+
+# Flowables the streamed story keeps ahead of layout
+STORY_WINDOW = 64
+
+def _portfolio_reference_scenario(scenarios):
+    """Headline scenario of a portfolio (chosen from the definitions, as for a single assessment)"""
+    return reference_scenario_name({
+        name: {'benefits_mult': params['benefits_multiplier'], 'delay_mult': params['implementation_delay_multiplier']}
+        for name, params in scenarios.items()
+    })
+
+def _portfolio_downside_scenario(portfolio):
+    """Downside scenario of a portfolio: 'Conservative' when defined, otherwise the lowest median NPV"""
+    if 'Conservative' in portfolio['scenarios']:
+        return 'Conservative'
+    return portfolio['scenarios'][int(np.argmin(np.median(portfolio['npv'], axis=0)))]
+
+def rank_accounts(portfolio, scenario_index):
+    """Account row indexes ordered by NPV under a scenario, highest first (ties keep file order)"""
+    return np.argsort(-portfolio['npv'][:, scenario_index], kind='stable')
+
+def account_chart_specs(portfolio, rows, scenarios):
+    """Picklable chart inputs of the given accounts: (scenario NPVs and colors, currency, timeline)"""
+    colors = [params.get('color') or SCENARIO_COLORS[index % len(SCENARIO_COLORS)]
+              for index, params in enumerate(scenarios.values())]
+    inputs = portfolio['inputs']
+    return [
+        (
+            {name: {'npv': float(portfolio['npv'][row, index]), 'color': colors[index]}
+             for index, name in enumerate(portfolio['scenarios'])},
+            portfolio['labels']['currency'][row],
+            int(inputs['implementation_delay'][row]),
+            int(inputs['benefits_ramp_up'][row]),
+            int(inputs['evaluation_years'][row])
+        )
+        for row in rows
+    ]
+
+def render_account_charts(specs):
+    """Flattened (scenario chart, timeline chart) drawings for account chart specs (runs in a worker process)"""
+    return [
+        (flatten_drawing(create_scenario_chart_for_pdf(scenario_npvs, currency)),
+         flatten_drawing(create_timeline_chart_for_pdf(delay, ramp_up, years)))
+        for scenario_npvs, currency, delay, ramp_up, years in specs
+    ]
+
+def _prefetched(function, tasks, executor, window):
+    """function(task) for each task in order, computed in the executor at most window tasks ahead"""
+    if executor is None:
+        for task in tasks:
+            yield function(task)
+        return
+    pending = deque()
+    for task in tasks:
+        pending.append(executor.submit(function, task))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+class _StreamedStory(list):
+    """A story list topped up from an iterator of flowables while the document is built
+
+    BaseDocTemplate.build takes flowables from the front of its story until it is empty and
+    checks the length before each one, so the list never holds more than a window of them.
+    """
+
+    def __init__(self, flowables, window=STORY_WINDOW):
+        super().__init__()
+        self._flowables = iter(flowables)
+        self._window = window
+
+    def __len__(self):
+        while self._flowables is not None and super().__len__() < self._window:
+            try:
+                self.append(next(self._flowables))
+            except StopIteration:
+                self._flowables = None
+        return super().__len__()
+
+def _page_compressing_canvas():
+    """Canvas class that compresses each page's content stream when the page is finished
+
+    ReportLab keeps every finished page in memory until the file is saved and only compresses
+    the page streams while writing it; compressing them as they are finished keeps the pages
+    held for a large document several times smaller.
+    """
+    from reportlab.pdfbase.pdfdoc import PDFArray, PDFName, PDFStream, PDFZCompress
+    from reportlab.pdfgen.canvas import Canvas
+
+    class PageCompressingCanvas(Canvas):
+        def showPage(self):
+            super().showPage()
+            page = self._doc.Pages.pages[-1]
+            contents = PDFStream(content=PDFZCompress.encode(page.stream))
+            contents.dictionary["Filter"] = PDFArray([PDFName(PDFZCompress.pdfname)])  # Not compressed again
+            page.Contents, page.stream = contents, None
+
+    return PageCompressingCanvas
+
+def _report_styles():
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+
+    styles = getSampleStyleSheet()
+    return {
+        'title': ParagraphStyle('PortfolioTitle', parent=styles['Heading1'], fontSize=24, spaceAfter=30,
+                                alignment=TA_CENTER, textColor=colors.darkblue),
+        'heading': ParagraphStyle('PortfolioHeading', parent=styles['Heading2'], fontSize=16, spaceAfter=12,
+                                  textColor=colors.darkblue, borderWidth=1, borderColor=colors.darkblue,
+                                  borderPadding=5),
+        'header': ParagraphStyle('PortfolioHeader', parent=styles['Normal'], textColor=colors.white,
+                                 fontName='Helvetica-Bold', fontSize=8, leading=10),
+        'cell': ParagraphStyle('PortfolioCell', parent=styles['Normal'], fontSize=8, leading=10),
+        'normal': styles['Normal'],
+        'subtitle': styles['Heading2']
+    }
+
+def _table_style(font_size):
+    from reportlab.lib import colors
+    from reportlab.platypus import TableStyle
+
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('FONTSIZE', (0, 0), (-1, -1), font_size),
+        ('TOPPADDING', (0, 0), (-1, -1), 3),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 3),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.beige]),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.black)
+    ])
+
+def _overview_story(portfolio, order, reference, downside, organization_name, styles):
+    """Title, portfolio totals and the ranked account table (one table per page)"""
+    from reportlab.lib.units import inch
+    from reportlab.platypus import PageBreak, Paragraph, Spacer, Table
+
+    reference_index = portfolio['scenarios'].index(reference)
+    downside_index = portfolio['scenarios'].index(downside)
+    currencies = np.asarray(portfolio['labels']['currency'])
+    reference_npvs = portfolio['npv'][:, reference_index]
+
+    yield Paragraph("Portfolio Business Value Assessment", styles['title'])
+    yield Paragraph(f"Prepared for: {escape(organization_name)}", styles['subtitle'])
+    yield Paragraph(f"Date: {datetime.now().strftime('%B %d, %Y')}", styles['normal'])
+    yield Spacer(1, 0.3 * inch)
+
+    totals = "".join(
+        f"• Total {escape(reference)} NPV ({escape(currency)} accounts): "
+        f"{escape(currency)}{reference_npvs[currencies == currency].sum():,.0f}<br/>"
+        for currency in np.unique(currencies)
+    )
+    payback = portfolio['payback_months'][:, reference_index]
+    yield Paragraph(
+        f"<b>Accounts:</b> {len(order):,} scored under {len(portfolio['scenarios'])} scenarios<br/>"
+        f"• Accounts with positive {escape(reference)} NPV: {(reference_npvs > 0).mean() * 100:.1f}%<br/>"
+        f"• Median {escape(reference)} payback: {format_payback(float(np.median(payback)), 'months')}<br/>"
+        f"{totals}<br/>"
+        f"Accounts are ranked by {escape(reference)} NPV and amounts are in each account's own currency. "
+        f"Each account has a summary page after this overview.",
+        styles['normal']
+    )
+    for warning in portfolio['warnings']:
+        yield Paragraph(f"<i>{escape(warning)}</i>", styles['normal'])
+    if portfolio['invalid_rows']:
+        yield Spacer(1, 0.2 * inch)
+        yield Paragraph(f"<b>{len(portfolio['invalid_rows']):,} row(s) with invalid values were not scored:</b>",
+                        styles['normal'])
+        for message in portfolio['invalid_rows']:
+            yield Paragraph(f"• {escape(message)}", styles['cell'])
+    yield PageBreak()
+
+    header = [Paragraph(f"<b>{escape(text)}</b>", styles['header']) for text in
+              ('Rank', 'Account', 'Industry', f'{reference} NPV', f'{reference} ROI', f'{reference} Payback',
+               f'{downside} NPV')]
+    widths = [0.4 * 72, 1.6 * 72, 1.0 * 72, 0.95 * 72, 0.6 * 72, 0.75 * 72, 0.95 * 72]
+    for start in range(0, len(order), OVERVIEW_ROWS_PER_PAGE):
+        rows = [header]
+        for rank, row in enumerate(order[start:start + OVERVIEW_ROWS_PER_PAGE], start=start + 1):
+            currency = portfolio['labels']['currency'][row]
+            rows.append([
+                str(rank),
+                Paragraph(escape(portfolio['customers'][row]), styles['cell']),
+                Paragraph(escape(portfolio['labels']['industry_template'][row]), styles['cell']),
+                f"{currency}{portfolio['npv'][row, reference_index]:,.0f}",
+                f"{portfolio['roi'][row, reference_index] * 100:.1f}%",
+                format_payback(portfolio['payback_months'][row, reference_index], "months"),
+                f"{currency}{portfolio['npv'][row, downside_index]:,.0f}"
+            ])
+        if start == 0:
+            yield Paragraph("Ranked Accounts", styles['heading'])
+        table = Table(rows, colWidths=widths, repeatRows=1)
+        table.setStyle(_table_style(8))
+        yield table
+        yield PageBreak()
+
+def _account_story(portfolio, row, rank, reference, charts, styles):
+    """Summary page of one account: scenario metrics, key assumptions and its two charts"""
+    from reportlab.lib.units import inch
+    from reportlab.platypus import PageBreak, Paragraph, Spacer, Table
+
+    inputs = portfolio['inputs']
+    currency = portfolio['labels']['currency'][row]
+    evaluation_years = int(inputs['evaluation_years'][row])
+
+    yield Paragraph(f"#{rank} {escape(portfolio['customers'][row])}", styles['heading'])
+    yield Paragraph(
+        f"{escape(portfolio['labels']['solution_name'][row])} · {escape(portfolio['labels']['industry_template'][row])} · "
+        f"Year 1 annual benefits {currency}{portfolio['benefits']['total_annual_benefits'][row]:,.0f} · "
+        f"Implementation {int(inputs['implementation_delay'][row])} months, ramp-up {int(inputs['benefits_ramp_up'][row])} "
+        f"months over {evaluation_years} years",
+        styles['normal']
+    )
+    yield Spacer(1, 0.15 * inch)
+
+    rows = [[Paragraph(f"<b>{header}</b>", styles['header']) for header in
+             ('Scenario', 'Net Present Value', 'ROI', 'IRR', 'MIRR', 'Payback (Months)')]]
+    for index, scenario_name in enumerate(portfolio['scenarios']):
+        name = f"<b>{escape(scenario_name)}</b>" if scenario_name == reference else escape(scenario_name)
+        rows.append([
+            Paragraph(name, styles['cell']),
+            f"{currency}{portfolio['npv'][row, index]:,.0f}",
+            f"{portfolio['roi'][row, index] * 100:.1f}%",
+            format_rate(portfolio['irr'][row, index]),
+            format_rate(portfolio['mirr'][row, index]),
+            format_payback(portfolio['payback_months'][row, index], "months", evaluation_years * 12)
+        ])
+    table = Table(rows, colWidths=[1.5 * inch, 1.3 * inch, 0.75 * inch, 0.75 * inch, 0.75 * inch, 1.45 * inch])
+    table.setStyle(_table_style(9))
+    yield table
+    yield Spacer(1, 0.2 * inch)
+    yield from charts
+    yield PageBreak()
+
+def generate_portfolio_report_pdf(csv_content, path, organization_name="Your Organization", scenarios=None,
+                                  workers=None, progress=None):
+    """Write the consolidated report of a portfolio CSV to path; returns a summary of the run
+
+    The story is generated while ReportLab lays it out, so flowables are only created a window
+    ahead of the page being built, and charts are built by `workers` processes (0 builds them
+    in this process; default one per spare core) a bounded number of accounts ahead. ReportLab keeps each finished page
+    until the file is saved, compressed, which is a few KB per account. The PDF is written to a
+    temporary file next to path and moved into place when complete. progress(done, total) is
+    called after each account page.
+    """
+    if not REPORT_DEPENDENCIES_AVAILABLE:
+        raise RuntimeError("The portfolio report needs reportlab (pip install reportlab)")
+
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate
+
+    started = time.perf_counter()
+    scenarios = DEFAULT_SCENARIOS if scenarios is None else scenarios
+    portfolio = score_portfolio(csv_content, scenarios)
+    reference = _portfolio_reference_scenario(scenarios)
+    downside = _portfolio_downside_scenario(portfolio)
+    order = rank_accounts(portfolio, portfolio['scenarios'].index(reference))
+    styles = _report_styles()
+    workers = max((os.cpu_count() or 1) - 1, 0) if workers is None else workers
+
+    def story(executor):
+        yield from _overview_story(portfolio, order, reference, downside, organization_name, styles)
+        batches = (account_chart_specs(portfolio, order[start:start + CHART_BATCH_SIZE], scenarios)
+                   for start in range(0, len(order), CHART_BATCH_SIZE))
+        rank = 0
+        for charts in _prefetched(render_account_charts, batches, executor, workers * CHART_TASKS_PER_WORKER):
+            for account_charts in charts:
+                yield from _account_story(portfolio, order[rank], rank + 1, reference, account_charts, styles)
+                rank += 1
+                if progress:
+                    progress(rank, len(order))
+
+    def page_footer(canvas, doc):
+        canvas.saveState()
+        canvas.setFont('Helvetica', 8)
+        canvas.drawRightString(doc.pagesize[0] - doc.rightMargin, doc.bottomMargin / 2,
+                               f"{organization_name} portfolio report · page {doc.page}")
+        canvas.restoreState()
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    os.close(fd)
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 0 else None
+    try:
+        doc = SimpleDocTemplate(tmp_path, pagesize=A4, pageCompression=1,
+                                title="Portfolio Business Value Assessment", author=organization_name)
+        doc.build(_StreamedStory(story(executor)), onFirstPage=page_footer, onLaterPages=page_footer,
+                  canvasmaker=_page_compressing_canvas())
+        os.chmod(tmp_path, new_file_mode())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    return {
+        'accounts': len(order),
+        'pages': doc.page,
+        'bytes': os.path.getsize(path),
+        'reference_scenario': reference,
+        'downside_scenario': downside,
+        'warnings': portfolio['warnings'],
+        'invalid_rows': portfolio['invalid_rows'],
+        'wall_seconds': round(time.perf_counter() - started, 3)
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write one consolidated PDF report for every account in a portfolio CSV")
+    parser.add_argument("portfolio", help="Portfolio CSV (one row per account, columns named after the input keys)")
+    parser.add_argument("output", help="PDF file to write")
+    parser.add_argument("--organization", default="Your Organization", help="Organization name in the report")
+    parser.add_argument("--scenarios", metavar="PATH",
+                        help="JSON object of scenario name -> parameters to score instead of the default scenarios")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Chart worker processes (default: one per spare core, 0: build charts in this process)")
+    parser.add_argument("--quiet", action="store_true", help="Do not report progress on stderr")
+    args = parser.parse_args(argv)
+
+    if not REPORT_DEPENDENCIES_AVAILABLE:
+        print("reportlab is required (pip install reportlab)", file=sys.stderr)
+        return 2
+
+    scenarios = None
+    if args.scenarios:
+        from bva_cli import load_scenarios
+        try:
+            scenarios = load_scenarios(args.scenarios)
+        except (OSError, ValueError) as e:
+            print(f"{args.scenarios}: {e}", file=sys.stderr)
+            return 2
+    try:
+        with open(args.portfolio, encoding='utf-8-sig') as f:
+            csv_content = f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"{args.portfolio}: {e}", file=sys.stderr)
+        return 2
+
+    def progress(done, total):
+        if done % 500 == 0 or done == total:
+            print(f"[{done}/{total}] account pages", file=sys.stderr)
+
+    try:
+        summary = generate_portfolio_report_pdf(csv_content, args.output, args.organization, scenarios,
+                                                args.workers, None if args.quiet else progress)
+    except ValueError as e:
+        print(f"{args.portfolio}: {e}", file=sys.stderr)
+        return 1
+    for message in summary['warnings'] + summary['invalid_rows']:
+        print(f"{args.portfolio}: {message}", file=sys.stderr)
+    print(f"Wrote {args.output}: {summary['accounts']:,} accounts, {summary['pages']:,} pages, "
+          f"{summary['bytes'] / 1024:,.0f} KB in {summary['wall_seconds']:.1f}s", file=sys.stderr)
+    return 1 if summary['invalid_rows'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
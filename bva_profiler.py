@@ -0,0 +1,152 @@
+# Rerun profiling: opt-in timing of the stages of each app rerun, exportable as a Chrome trace
+
+import contextvars
+import os
+import platform
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+# Set to 1 to profile every session; a single session is profiled by opening the app with ?profile=1
+PROFILE_ENV_VAR = 'BVA_PROFILE'
+
+# Profiler receiving stages in the current script run (each rerun runs in its own thread/context)
+_ACTIVE_PROFILER = contextvars.ContextVar('bva_active_profiler', default=None)
+
+class RerunProfiler:
+    """Timed stages of a session's recent reruns, kept for the last max_runs runs
+
+    A run is a full script rerun or a fragment rerun. Stages may nest and are recorded as
+    complete trace events with microsecond timestamps relative to the profiler's creation.
+    """
+
+    def __init__(self, max_runs=50):
+        self.max_runs = max_runs
+        self.runs = deque(maxlen=max_runs)
+        self._origin_ns = time.perf_counter_ns()
+        self._open_run = None
+        self._open_stages = {}
+
+    def _now_us(self):
+        return (time.perf_counter_ns() - self._origin_ns) / 1000
+
+    def start_run(self, name):
+        """Begin recording a run, closing a run left open by an interrupted rerun"""
+        self.end_run()
+        self._open_run = {'name': name, 'ts': self._now_us(), 'events': []}
+
+    def end_run(self):
+        """Finish the open run (and any stages still open in it) and keep it among the recent runs"""
+        if self._open_run is None:
+            return
+        for name in list(self._open_stages):
+            self.end_stage(name)
+        self._open_run['dur'] = self._now_us() - self._open_run['ts']
+        self.runs.append(self._open_run)
+        self._open_run = None
+
+    def begin_stage(self, name, category='stage'):
+        """Start a stage that is ended by name (for script regions that cannot be wrapped in a block)"""
+        if self._open_run is not None:
+            self._open_stages[name] = (self._now_us(), category)
+
+    def end_stage(self, name):
+        """End a stage started with begin_stage"""
+        if self._open_run is None or name not in self._open_stages:
+            return
+        start, category = self._open_stages.pop(name)
+        self._open_run['events'].append({'name': name, 'cat': category, 'ts': start, 'dur': self._now_us() - start})
+
+    @contextmanager
+    def stage(self, name, category='stage'):
+        """Time a block as a stage of the open run (nothing is recorded outside a run)"""
+        start = self._now_us()
+        try:
+            yield
+        finally:
+            if self._open_run is not None:
+                self._open_run['events'].append({'name': name, 'cat': category, 'ts': start, 'dur': self._now_us() - start})
+
+    @contextmanager
+    def run(self, name):
+        """Record a block as its own run, or as a stage of the run already open (a fragment in a full rerun)"""
+        if self._open_run is not None:
+            with self.stage(name, 'fragment'):
+                yield
+            return
+        self.start_run(name)
+        try:
+            yield
+        finally:
+            self.end_run()
+
+    def stage_table(self, run=None):
+        """Stages of a run (default: the latest) in start order, with milliseconds and share of the run"""
+        run = run if run is not None else (self.runs[-1] if self.runs else None)
+        if run is None:
+            return []
+        return [
+            {
+                'stage': event['name'],
+                'category': event['cat'],
+                'start_ms': (event['ts'] - run['ts']) / 1000,
+                'duration_ms': event['dur'] / 1000,
+                'share_pct': event['dur'] / run['dur'] * 100 if run['dur'] else 0.0
+            }
+            for event in sorted(run['events'], key=lambda event: event['ts'])
+        ]
+
+    def chrome_trace(self):
+        """Recent runs as a Chrome trace (open in chrome://tracing or ui.perfetto.dev)"""
+        events = []
+        for index, run in enumerate(self.runs):
+            events.append({'name': run['name'], 'cat': 'run', 'ph': 'X', 'ts': run['ts'], 'dur': run['dur'],
+                           'pid': 1, 'tid': 1, 'args': {'run': index}})
+            events.extend(dict(event, ph='X', pid=1, tid=1) for event in run['events'])
+        return {
+            'traceEvents': events,
+            'displayTimeUnit': 'ms',
+            'otherData': {'python': platform.python_version(), 'runs': len(self.runs)}
+        }
+
+def profiling_requested(query_params=None):
+    """Whether profiling is switched on by the environment or by ?profile=1 in the app URL"""
+    if os.environ.get(PROFILE_ENV_VAR) == '1':
+        return True
+    return query_params is not None and query_params.get('profile') == '1'
+
+def activate(profiler):
+    """Route stages recorded in the current script run to profiler (None switches profiling off)"""
+    _ACTIVE_PROFILER.set(profiler)
+
+def active_profiler():
+    """Profiler of the current script run, or None when profiling is off"""
+    return _ACTIVE_PROFILER.get()
+
+@contextmanager
+def stage(name, category='stage'):
+    """Time a block in the active profiler (a no-op when profiling is off)"""
+    profiler = _ACTIVE_PROFILER.get()
+    if profiler is None:
+        yield
+        return
+    with profiler.stage(name, category):
+        yield
+
+def profiled_run(name, get_profiler):
+    """Decorator recording each call as a run of get_profiler() (e.g. a fragment rerun)
+
+    get_profiler is called at the start of every call and may return None to skip profiling.
+    """
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            profiler = get_profiler()
+            activate(profiler)
+            if profiler is None:
+                return function(*args, **kwargs)
+            with profiler.run(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,476 @@
+# Executive PDF report generation (ReportLab, with vector charts) with a content-addressed artifact cache
+
+import importlib.util
+import math
+import os
+from datetime import datetime
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+from bva_cache import ArtifactCache, fingerprint
+from bva_engine import (SCENARIO_COLORS, downside_scenario_name, format_payback, format_rate, model_fingerprint,
+                        reference_scenario_name, run_assessment_cached)
+from bva_profiler import stage
+
+# Executive Report Dependencies
+# Detected without importing: reportlab is loaded on first use, since most sessions never
+# render a PDF and it dominates cold start time and memory
+REPORT_DEPENDENCIES_AVAILABLE = importlib.util.find_spec("reportlab") is not None
+
+# Bump whenever the report layout or charts change (invalidates cached charts and PDFs)
+REPORT_VERSION = "1.3"
+
+# Finished PDFs; set BVA_REPORT_CACHE_DIR to persist them on disk and share them between
+# worker processes
+REPORT_CACHE = ArtifactCache(
+    max_bytes=64 * 1024 * 1024,
+    directory=os.environ.get("BVA_REPORT_CACHE_DIR") or None
+)
+
+def artifact_key(kind, *parts):
+    """Content address for a rendered artifact"""
+    return fingerprint({'kind': kind, 'report_version': REPORT_VERSION, 'parts': parts})
+
+# --- EXECUTIVE REPORT GENERATOR FUNCTIONS ---
+
+def create_executive_summary_data(scenario_results, currency_symbol, benefits, inputs):
+    """Create data structure for executive summary
+
+    Headline ('expected_*') metrics come from the reference scenario and the downside case from
+    the downside scenario (Expected and Conservative when defined, see bva_engine), so any set
+    of scenarios can be reported.
+    """
+    implementation_delay_months = inputs['implementation_delay']
+    benefits_ramp_up_months = inputs['benefits_ramp_up']
+    evaluation_years = inputs['evaluation_years']
+    alert_reduction_savings = benefits['alert_reduction_savings']
+    alert_triage_savings = benefits['alert_triage_savings']
+    incident_reduction_savings = benefits['incident_reduction_savings']
+    incident_triage_savings = benefits['incident_triage_savings']
+    major_incident_savings = benefits['major_incident_savings']
+    reference = reference_scenario_name(scenario_results)
+    downside = downside_scenario_name(scenario_results)
+    npvs = [result['npv'] for result in scenario_results.values()]
+    return {
+        'investment_summary': {
+            'reference_scenario': reference,
+            'downside_scenario': downside,
+            'scenario_count': len(scenario_results),
+            'min_npv': min(npvs),
+            'max_npv': max(npvs),
+            'expected_npv': scenario_results[reference]['npv'],
+            'expected_roi': scenario_results[reference]['roi'],
+            'expected_irr': scenario_results[reference]['irr'],
+            'expected_mirr': scenario_results[reference]['mirr'],
+            'payback_period': format_payback(scenario_results[reference]['payback'], "years", evaluation_years),
+            'currency': currency_symbol,
+            'expected_payback_months': format_payback(scenario_results[reference]['payback_months'], "months", evaluation_years * 12),
+            'downside_roi': scenario_results[downside]['roi'],
+            'downside_payback_months': format_payback(scenario_results[downside]['payback_months'], "months", evaluation_years * 12),
+            'downside_description': scenario_results[downside].get('description')
+        },
+        'key_benefits': {
+            'alert_reduction_savings': alert_reduction_savings,
+            'alert_triage_savings': alert_triage_savings,
+            'incident_reduction_savings': incident_reduction_savings,
+            'incident_triage_savings': incident_triage_savings,
+            'major_incident_savings': major_incident_savings,
+            'total_operational_savings': alert_reduction_savings + alert_triage_savings + incident_reduction_savings + incident_triage_savings + major_incident_savings,
+            'additional_benefits': inputs['tool_savings'] + inputs['people_efficiency'] + inputs['fte_avoidance'] + inputs['revenue_growth']
+        },
+        'implementation': {
+            'delay_months': implementation_delay_months,
+            'ramp_up_months': benefits_ramp_up_months,
+            'full_benefits_month': implementation_delay_months + benefits_ramp_up_months,
+            'evaluation_years': evaluation_years
+        },
+        'reallocation_and_fte': {
+            'total_cost_savings_for_reallocation': benefits['total_operational_savings_from_time_saved'],
+            'equivalent_ftes_from_savings': benefits['equivalent_ftes_from_savings']
+        }
+    }
+
+# Chart sizes in points (the width of the report's text column)
+CHART_WIDTH = 6 * 72
+TIMELINE_CHART_HEIGHT = 2.4 * 72
+SCENARIO_CHART_HEIGHT = 3.6 * 72
+
+def _axis_step(span, max_ticks=8):
+    """Round tick spacing (1, 2, 2.5 or 5 times a power of ten) giving at most max_ticks intervals"""
+    raw = max(span, 1e-9) / max_ticks
+    magnitude = 10 ** math.floor(math.log10(raw))
+    return next(m * magnitude for m in (1, 2, 2.5, 5, 10) if m * magnitude >= raw)
+
+def _chart_title(drawing, text):
+    from reportlab.graphics.shapes import String
+    drawing.add(String(drawing.width / 2, drawing.height - 14, text, fontName='Helvetica-Bold', fontSize=11,
+                       textAnchor='middle'))
+
+def create_timeline_chart_for_pdf(implementation_delay_months, benefits_ramp_up_months, evaluation_years):
+    """Create implementation timeline chart for PDF (a vector Drawing flowable)"""
+    if not REPORT_DEPENDENCIES_AVAILABLE:
+        return None
+
+    from reportlab.graphics.shapes import Drawing, Line, Rect, String
+    from reportlab.lib import colors
+
+    drawing = Drawing(CHART_WIDTH, TIMELINE_CHART_HEIGHT)
+    _chart_title(drawing, 'Implementation Timeline & Benefit Realization')
+    left, right, bottom, top = 10, CHART_WIDTH - 10, 38, TIMELINE_CHART_HEIGHT - 26
+    total_months = evaluation_years * 12
+    scale = (right - left) / total_months
+
+    # Month grid and axis
+    step = _axis_step(total_months)
+    for index in range(int(total_months // step) + 1):
+        x = left + index * step * scale
+        drawing.add(Line(x, bottom, x, top, strokeColor=colors.lightgrey, strokeWidth=0.5))
+        drawing.add(String(x, bottom - 11, f"{index * step:g}", fontName='Helvetica', fontSize=8, textAnchor='middle'))
+    drawing.add(Line(left, bottom, right, bottom, strokeColor=colors.black, strokeWidth=0.8))
+    drawing.add(String((left + right) / 2, 6, 'Months from Project Start', fontName='Helvetica', fontSize=9,
+                       textAnchor='middle'))
+
+    # Gantt bars (clipped to the evaluation period), first phase at the bottom
+    phases = ['Implementation', 'Ramp-up', 'Full Benefits']
+    starts = [0, implementation_delay_months, implementation_delay_months + benefits_ramp_up_months]
+    ends = [implementation_delay_months, implementation_delay_months + benefits_ramp_up_months, total_months]
+    colors_list = ['#ff6b6b', '#ffa500', '#4ecdc4']
+    row_height = (top - bottom) / len(phases)
+    for i, (phase, start, end, color) in enumerate(zip(phases, starts, ends, colors_list)):
+        start, end = min(start, total_months), min(end, total_months)
+        if end <= start:
+            continue
+        y = bottom + (i + 0.2) * row_height
+        fill = colors.HexColor(color)
+        fill.alpha = 0.7
+        drawing.add(Rect(left + start * scale, y, (end - start) * scale, 0.6 * row_height,
+                         fillColor=fill, strokeColor=None))
+        drawing.add(String(left + (start + end) / 2 * scale, y + 0.3 * row_height - 3, phase,
+                           fontName='Helvetica-Bold', fontSize=9, textAnchor='middle'))
+    return drawing
+
+def _scenario_colors(scenario_results):
+    """Chart color of each scenario: its own, or the palette color for its position"""
+    return [result.get('color') or SCENARIO_COLORS[index % len(SCENARIO_COLORS)]
+            for index, result in enumerate(scenario_results.values())]
+
+def create_scenario_chart_for_pdf(scenario_results, currency_symbol):
+    """Create scenario NPV comparison chart for PDF (a vector Drawing flowable)"""
+    if not REPORT_DEPENDENCIES_AVAILABLE:
+        return None
+
+    from reportlab.graphics.charts.barcharts import HorizontalBarChart, VerticalBarChart
+    from reportlab.graphics.shapes import Drawing, Group, String
+    from reportlab.lib import colors
+
+    scenarios_list = list(scenario_results.keys())
+    npvs = [float(scenario_results[scenario]['npv']) for scenario in scenarios_list]
+    drawing = Drawing(CHART_WIDTH, SCENARIO_CHART_HEIGHT)
+    _chart_title(drawing, 'Scenario Analysis - NPV Comparison')
+    axis_title = f'Net Present Value ({currency_symbol})'
+
+    # Horizontal bars (first scenario on top) keep many scenario names and value labels legible
+    horizontal = len(scenarios_list) > 5
+    if horizontal:
+        chart = HorizontalBarChart()
+        chart.x, chart.y, chart.width, chart.height = 110, 36, CHART_WIDTH - 130, SCENARIO_CHART_HEIGHT - 62
+        chart.categoryAxis.reverseDirection = 1
+        chart.categoryAxis.labels.boxAnchor = 'e'
+        chart.categoryAxis.labels.dx = -4
+        chart.valueAxis.labels.fontSize = 8
+        drawing.add(String(chart.x + chart.width / 2, 6, axis_title, fontName='Helvetica', fontSize=9,
+                           textAnchor='middle'))
+    else:
+        chart = VerticalBarChart()
+        chart.x, chart.y, chart.width, chart.height = 62, 24, CHART_WIDTH - 76, SCENARIO_CHART_HEIGHT - 50
+        chart.categoryAxis.labels.dy = -4
+        drawing.add(Group(String(0, 0, axis_title, fontName='Helvetica', fontSize=9, textAnchor='middle'),
+                          transform=(0, 1, -1, 0, 10, chart.y + chart.height / 2)))
+    chart.data = [npvs]
+    chart.categoryAxis.categoryNames = scenarios_list
+    chart.categoryAxis.labels.fontSize = 8 if horizontal else 9
+    chart.categoryAxis.visibleTicks = 0
+    chart.categoryAxis.joinAxisMode = 'left' if horizontal else 'bottom'  # Names stay clear of negative bars
+    chart.barWidth = 10
+    chart.groupSpacing = 6
+
+    # Value axis through zero with headroom for the value labels
+    low, high = min(npvs + [0.0]), max(npvs + [0.0])
+    headroom = (high - low) * (0.25 if horizontal else 0.12) or 1000.0
+    chart.valueAxis.valueMin = low - headroom if low < 0 else 0
+    chart.valueAxis.valueMax = high + headroom if high > 0 or low == 0 else 0
+    step = _axis_step(chart.valueAxis.valueMax - chart.valueAxis.valueMin)
+    decimals = min(2, max(0, -math.floor(math.log10(step / 1000))))  # Enough to tell small ticks apart
+    chart.valueAxis.valueStep = step
+    chart.valueAxis.labelTextFormat = lambda value: f'{currency_symbol}{value / 1000:,.{decimals}f}K'
+    chart.valueAxis.visibleGrid = 1
+    chart.valueAxis.gridStrokeColor = colors.lightgrey
+    chart.valueAxis.gridStrokeWidth = 0.5
+
+    for index, color in enumerate(_scenario_colors(scenario_results)):
+        fill = colors.HexColor(color)
+        fill.alpha = 0.8
+        chart.bars[(0, index)].fillColor = fill
+        chart.bars[(0, index)].strokeColor = None
+
+    chart.barLabelFormat = lambda value: f'{currency_symbol}{value:,.0f}'
+    chart.barLabels.fontName = 'Helvetica-Bold'
+    chart.barLabels.fontSize = 7 if horizontal else 9
+    # Labels sit just outside the end of each bar (reportlab mirrors the anchor for negative bars)
+    chart.barLabels.boxAnchor = 'w' if horizontal else 's'
+    chart.barLabels.nudge = 4
+    drawing.add(chart)
+    return drawing
+
+def flatten_drawing(drawing):
+    """Expand the chart widgets of a Drawing (in place) into plain shapes and return it
+
+    A flattened drawing renders identically, can be pickled (so charts can be built in worker
+    processes) and is several times cheaper to draw onto a page.
+    """
+    from reportlab.graphics.shapes import Group, UserNode
+
+    def expand(node):
+        while isinstance(node, UserNode):
+            node = node.provideNode()
+        if isinstance(node, Group):
+            node.contents = [expand(child) for child in node.contents]
+        return node
+
+    return expand(drawing)
+
+def generate_executive_report_pdf(summary_data, scenario_results, solution_name, organization_name="Your Organization"):
+    """Generate comprehensive executive report PDF"""
+    
+    if not REPORT_DEPENDENCIES_AVAILABLE:
+        return None
+
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+    from reportlab.lib.units import inch
+    from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+    
+    implementation_delay_months = summary_data['implementation']['delay_months']
+    benefits_ramp_up_months = summary_data['implementation']['ramp_up_months']
+    evaluation_years = summary_data['implementation']['evaluation_years']
+    
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4)
+    story = []
+    styles = getSampleStyleSheet()
+    
+    # Custom styles
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        spaceAfter=30,
+        alignment=TA_CENTER,
+        textColor=colors.darkblue
+    )
+    
+    heading_style = ParagraphStyle(
+        'CustomHeading',
+        parent=styles['Heading2'],
+        fontSize=16,
+        spaceAfter=12,
+        textColor=colors.darkblue,
+        borderWidth=1,
+        borderColor=colors.darkblue,
+        borderPadding=5
+    )
+    
+    subheading_style = ParagraphStyle(
+        'CustomSubheading',
+        parent=styles['Heading3'],
+        fontSize=14,
+        spaceAfter=8,
+        textColor=colors.darkblue
+    )
+    
+    # Title Page
+    story.append(Paragraph(f"Business Value Assessment", title_style))
+    story.append(Paragraph(f"{solution_name} Implementation", styles['Title']))
+    story.append(Spacer(1, 0.5*inch))
+    story.append(Paragraph(f"Prepared for: {organization_name}", styles['Heading2']))
+    story.append(Paragraph(f"Date: {datetime.now().strftime('%B %d, %Y')}", styles['Normal']))
+    story.append(Spacer(1, 0.5*inch))
+    
+    # Custom style for white header text
+    header_style = ParagraphStyle(
+        'HeaderStyle',
+        parent=styles['Normal'],
+        textColor=colors.white,
+        fontName='Helvetica-Bold'
+    )
+    
+    # Executive Summary Box: one row per scenario, with proper column widths and white headers
+    currency = summary_data['investment_summary']['currency']
+    exec_summary_data = [[Paragraph(f'<b>{header}</b>', header_style) for header in
+                          ('Scenario', 'Net Present Value', 'ROI', 'IRR', 'MIRR', 'Payback (Years)', 'Payback (Months)')]]
+    for scenario_name, result in scenario_results.items():
+        exec_summary_data.append([
+            Paragraph(f"<b>{escape(scenario_name)}</b>", styles['Normal']),
+            Paragraph(f"{currency}{result['npv']:,.0f}", styles['Normal']),
+            Paragraph(f"{result['roi']*100:.1f}%", styles['Normal']),
+            Paragraph(format_rate(result['irr']), styles['Normal']),
+            Paragraph(format_rate(result['mirr']), styles['Normal']),
+            Paragraph(format_payback(result['payback'], "years", evaluation_years), styles['Normal']),
+            Paragraph(format_payback(result['payback_months'], "months", evaluation_years * 12), styles['Normal'])
+        ])
+    
+    exec_table = Table(exec_summary_data, colWidths=[1.3*inch, 1.2*inch, 0.7*inch, 0.7*inch, 0.7*inch, 0.9*inch, 0.9*inch],
+                       repeatRows=1)
+    exec_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('TOPPADDING', (0, 0), (-1, -1), 8),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+    
+    story.append(exec_table)
+    story.append(Spacer(1, 0.2*inch))
+    
+    # Add overall cost reallocation and FTE equivalency to Executive Summary (optional, can be its own section)
+    story.append(Paragraph("Operational Savings for Reallocation:", subheading_style))
+    story.append(Paragraph(
+        f"Annually, **{summary_data['investment_summary']['currency']}{summary_data['reallocation_and_fte']['total_cost_savings_for_reallocation']:,.0f}** can be reallocated to higher-margin projects. "
+        f"This represents **{summary_data['reallocation_and_fte']['equivalent_ftes_from_savings']:,.1f}** equivalent full-time employees (FTEs) in savings.",
+        styles['Normal']
+    ))
+    story.append(PageBreak())
+    
+    # 1. Executive Summary
+    story.append(Paragraph("Executive Summary", heading_style))
+    reference = escape(summary_data['investment_summary']['reference_scenario'])
+    downside = escape(summary_data['investment_summary']['downside_scenario'])
+    downside_description = summary_data['investment_summary']['downside_description']
+    downside_assumptions = f" ({escape(downside_description.lower())})" if downside_description else ""
+    
+    exec_text = f"""
+    This Business Value Assessment demonstrates the financial and operational benefits of implementing {solution_name} at {organization_name}. Our analysis shows strong positive returns across all scenarios: 
+    <b>Key Financial Highlights:</b><br/> 
+    • {reference} NPV: {currency}{summary_data['investment_summary']['expected_npv']:,.0f}<br/> 
+    • {reference} ROI: {summary_data['investment_summary']['expected_roi']*100:.1f}%<br/> 
+    • {reference} IRR: {format_rate(summary_data['investment_summary']['expected_irr'])} (MIRR {format_rate(summary_data['investment_summary']['expected_mirr'])})<br/> 
+    • Payback Period: {summary_data['investment_summary']['payback_period']} ({summary_data['investment_summary']['expected_payback_months']})<br/> 
+    • NPV Range: {currency}{summary_data['investment_summary']['min_npv']:,.0f} to {currency}{summary_data['investment_summary']['max_npv']:,.0f} across {summary_data['investment_summary']['scenario_count']} scenarios<br/><br/> 
+    <b>Primary Value Drivers:</b><br/> 
+    • Alert Management Optimization: {summary_data['investment_summary']['currency']}{summary_data['key_benefits']['alert_reduction_savings'] + summary_data['key_benefits']['incident_reduction_savings']:,.0f} annually<br/> 
+    • Incident Management Efficiency: {summary_data['investment_summary']['currency']}{summary_data['key_benefits']['incident_reduction_savings'] + summary_data['key_benefits']['incident_triage_savings']:,.0f} annually<br/> 
+    • Major Incident Impact Reduction: {summary_data['investment_summary']['currency']}{summary_data['key_benefits']['major_incident_savings']:,.0f} annually<br/><br/> 
+    <b>Operational Savings for Reallocation:</b><br/>
+    • Total Annual Cost Savings from A&I Management: {summary_data['investment_summary']['currency']}{summary_data['reallocation_and_fte']['total_cost_savings_for_reallocation']:,.0f}<br/>
+    • Equivalent FTEs from Savings: {summary_data['reallocation_and_fte']['equivalent_ftes_from_savings']:,.1f} FTEs<br/><br/>
+    <b>Implementation Timeline:</b><br/> 
+    • Implementation Phase: {summary_data['implementation']['delay_months']} months<br/> 
+    • Ramp-up to Full Benefits: {summary_data['implementation']['ramp_up_months']} months<br/> 
+    • Full ROI Realization: Month {summary_data['implementation']['full_benefits_month']}<br/><br/> 
+    Even in the {downside} scenario{downside_assumptions}, the investment delivers **{summary_data['investment_summary']['downside_roi']*100:.1f}% ROI** with a **{summary_data['investment_summary']['downside_payback_months']}** payback period. 
+    """ 
+    story.append(Paragraph(exec_text, styles['Normal'])) 
+    story.append(Spacer(1, 0.3*inch)) 
+    # Add scenario chart 
+    with stage('pdf: scenario chart', 'report'):
+        scenario_chart = create_scenario_chart_for_pdf(scenario_results, summary_data['investment_summary']['currency'])
+    if scenario_chart: 
+        story.append(scenario_chart) 
+    story.append(PageBreak()) 
+    # 2. Implementation Roadmap with wrapped text and white headers 
+    story.append(Paragraph("Implementation Roadmap & Milestones", heading_style)) 
+    roadmap_data = [ 
+        [Paragraph('<b>Phase</b>', header_style), Paragraph('<b>Duration</b>', header_style), Paragraph('<b>Key Activities</b>', header_style), Paragraph('<b>Benefits Realization</b>', header_style)], 
+        [Paragraph('Planning & Setup', styles['Normal']), Paragraph(f"Months 1-2", styles['Normal']), Paragraph('Environment setup, integration planning, team training', styles['Normal']), Paragraph('0%', styles['Normal'])], 
+        [Paragraph('Core Implementation', styles['Normal']), Paragraph(f"Months 3-{implementation_delay_months}", styles['Normal']), Paragraph('Data integration, alert configuration, dashboard creation', styles['Normal']), Paragraph('0%', styles['Normal'])], 
+        [Paragraph('Go-Live & Ramp-up', styles['Normal']), Paragraph(f"Months {implementation_delay_months+1}-{implementation_delay_months + benefits_ramp_up_months}", styles['Normal']), Paragraph('Deployment, user adoption, process optimization', styles['Normal']), Paragraph('0% → 100%', styles['Normal'])], 
+        [Paragraph('Full Operation', styles['Normal']), Paragraph(f"Month {implementation_delay_months + benefits_ramp_up_months}+", styles['Normal']), Paragraph('Business as usual, continuous improvement', styles['Normal']), Paragraph('100%', styles['Normal'])], 
+    ] 
+    roadmap_table = Table(roadmap_data, colWidths=[1.3*inch, 1.1*inch, 3*inch, 1.3*inch]) 
+    roadmap_table.setStyle(TableStyle([ 
+        ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue), 
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke), 
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'), 
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'), 
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'), 
+        ('FONTSIZE', (0, 0), (-1, -1), 9), 
+        ('TOPPADDING', (0, 0), (-1, -1), 8), 
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 8), 
+        ('LEFTPADDING', (0, 0), (-1, -1), 6), 
+        ('RIGHTPADDING', (0, 0), (-1, -1), 6), 
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]), 
+        ('GRID', (0, 0), (-1, -1), 1, colors.black) 
+    ])) 
+    story.append(roadmap_table) 
+    story.append(Spacer(1, 0.3*inch)) 
+    # Add timeline chart 
+    with stage('pdf: timeline chart', 'report'):
+        timeline_chart = create_timeline_chart_for_pdf(implementation_delay_months, benefits_ramp_up_months, evaluation_years)
+    if timeline_chart: 
+        story.append(timeline_chart) 
+    story.append(Spacer(1, 0.3*inch)) 
+    # Key Milestones 
+    story.append(Paragraph("Key Success Milestones", subheading_style)) 
+    milestones_text = f""" 
+    <b>Month {implementation_delay_months}: Go-Live Milestone</b><br/> 
+    • Solution deployed and operational<br/> 
+    • Initial benefits begin to materialize<br/> 
+    • User training completed<br/><br/> 
+    <b>Month {implementation_delay_months + benefits_ramp_up_months}: Full Benefits Milestone</b><br/> 
+    • 100% benefit realization achieved<br/> 
+    • All processes optimized<br/> 
+    • ROI tracking established<br/><br/> 
+    <b>Month {evaluation_years * 12}: Final Review & Optimization</b><br/>
+    • Comprehensive review of benefits realization<br/>
+    • Identify areas for further optimization<br/>
+    • Plan for future initiatives and expansion
+    """
+    story.append(Paragraph(milestones_text, styles['Normal']))
+    story.append(Spacer(1, 0.3*inch))
+
+    # Add a concluding statement
+    story.append(Paragraph(
+        "By implementing the proposed solution, " + organization_name + " can expect to achieve significant financial benefits and operational efficiencies, driving enhanced business value.",
+        styles['Normal']
+    ))
+
+    # Build the PDF
+    with stage('pdf: layout and rendering', 'report'):
+        doc.build(story)
+    buffer.seek(0)
+    return buffer
+
+def render_report_pdf(input_values, organization_name="Your Organization", scenarios=None, cache=REPORT_CACHE):
+    """Executive report PDF bytes for a configuration, served from the artifact cache when unchanged
+
+    The cache key covers the model fingerprint, the report labels, the organization name,
+    the report date and REPORT_VERSION, so an identical request returns instantly.
+    """
+    if not REPORT_DEPENDENCIES_AVAILABLE:
+        return None
+
+    assessment = run_assessment_cached(input_values, scenarios)
+    inputs = assessment['inputs']
+    key = artifact_key(
+        'report_pdf', model_fingerprint(inputs, scenarios), inputs['solution_name'], inputs['currency'],
+        organization_name, datetime.now().strftime('%Y-%m-%d')
+    )
+
+    def build_pdf():
+        summary_data = create_executive_summary_data(
+            assessment['scenario_results'], inputs['currency'], assessment['benefits'], inputs
+        )
+        pdf_buffer = generate_executive_report_pdf(
+            summary_data, assessment['scenario_results'], inputs['solution_name'], organization_name
+        )
+        return pdf_buffer.getvalue()
+
+    return cache.get_or_compute(key, build_pdf)
@@ -0,0 +1,133 @@
+# Sensitivity analysis: one-at-a-time input perturbations evaluated as a single batch
+
+import numpy as np
+
+from bva_cache import LRUCache, fingerprint
+from bva_config import INPUT_BOUNDS, MODEL_INPUT_KEYS, YEARLY_SCHEDULE_KEYS, complete_input_values
+from bva_engine import DEFAULT_SCENARIOS, evaluate_configurations, model_fingerprint, run_assessment_cached
+
+SENSITIVITY_INPUTS = MODEL_INPUT_KEYS
+
+# Inputs the model reads as whole months or years (or a 0/1 switch); perturbed values are rounded
+_WHOLE_NUMBER_INPUTS = ('implementation_delay', 'benefits_ramp_up', 'evaluation_years', 'mid_period_discounting')
+
+def perturbation_ranges(input_values, pct=10.0, custom_ranges=None, keys=SENSITIVITY_INPUTS):
+    """Low/high test values per input: +/- pct% of the current value unless a (low, high) override is given"""
+    inputs = complete_input_values(input_values)
+    custom_ranges = custom_ranges or {}
+    ranges = {}
+    for key in keys:
+        if key in custom_ranges:
+            low, high = custom_ranges[key]
+        else:
+            value = float(inputs[key])
+            low, high = value * (1 - pct / 100), value * (1 + pct / 100)
+        min_value, max_value = INPUT_BOUNDS.get(key, (0, None))
+        low, high = np.clip([low, high], min_value, max_value)
+        if key in _WHOLE_NUMBER_INPUTS:
+            low, high = np.round([low, high])
+        ranges[key] = (float(low), float(high))
+    return ranges
+
+def run_tornado(input_values, pct=10.0, custom_ranges=None, keys=SENSITIVITY_INPUTS,
+                scenario_name='Expected', scenarios=None):
+    """NPV and payback of one scenario with each input moved to its low and high value
+
+    All 2 x len(keys) perturbed configurations are scored in one evaluate_configurations
+    call around the cached base case. Rows are ranked by NPV swing (largest first).
+    """
+    scenarios = DEFAULT_SCENARIOS if scenarios is None else scenarios
+    inputs = complete_input_values(input_values)
+    base = run_assessment_cached(inputs, scenarios)['scenario_results'][scenario_name]
+    ranges = perturbation_ranges(inputs, pct, custom_ranges, keys)
+
+    # Row 2i holds input i at its low value, row 2i+1 at its high value; all else at base
+    n_cases = 2 * len(keys)
+    columns = {key: np.full(n_cases, float(inputs[key])) for key in MODEL_INPUT_KEYS}
+    for index, key in enumerate(keys):
+        columns[key][2 * index:2 * index + 2] = ranges[key]
+    columns.update({key: inputs[key] for key in YEARLY_SCHEDULE_KEYS})
+    results = evaluate_configurations(columns, {scenario_name: scenarios[scenario_name]}, rates_of_return=False)
+    npv = results['npv'][:, 0].reshape(-1, 2)
+    payback_months = results['payback_months'][:, 0].reshape(-1, 2)
+
+    rows = [
+        {
+            'key': key,
+            'base_value': float(inputs[key]),
+            'low_value': ranges[key][0],
+            'high_value': ranges[key][1],
+            'npv_low': float(npv[index, 0]),
+            'npv_high': float(npv[index, 1]),
+            'npv_swing': float(abs(npv[index, 1] - npv[index, 0])),
+            'payback_months_low': float(payback_months[index, 0]),
+            'payback_months_high': float(payback_months[index, 1])
+        }
+        for index, key in enumerate(keys)
+    ]
+    rows.sort(key=lambda row: row['npv_swing'], reverse=True)
+    return {
+        'scenario': scenario_name,
+        'base_npv': float(base['npv']),
+        'base_payback_months': float(base['payback_months']),
+        'evaluation_years': int(inputs['evaluation_years']),
+        'rows': rows
+    }
+
+# --- TWO-DIMENSIONAL PARAMETER SWEEPS ---
+
+SWEEP_CACHE = LRUCache(max_entries=32)
+
+def sweep_values(key, low, high, steps):
+    """Evenly spaced grid values for one sweep axis (whole months/years are rounded and deduplicated)"""
+    min_value, max_value = INPUT_BOUNDS.get(key, (0, None))
+    values = np.clip(np.linspace(low, high, steps), min_value, max_value)
+    if key in _WHOLE_NUMBER_INPUTS:
+        values = np.unique(np.round(values))
+    return values
+
+def run_parameter_sweep(input_values, x_key, x_values, y_key, y_values, scenario_name='Expected', scenarios=None):
+    """NPV, ROI and payback of one scenario over a grid of two inputs, all other inputs fixed
+
+    The len(y_values) x len(x_values) grid is flattened into configuration columns and
+    scored in one evaluate_configurations call; result arrays have shape (len(y), len(x)).
+    """
+    if x_key == y_key:
+        raise ValueError("Choose two different inputs to sweep")
+    scenarios = DEFAULT_SCENARIOS if scenarios is None else scenarios
+    inputs = complete_input_values(input_values)
+    x_values = np.asarray(x_values, dtype=float)
+    y_values = np.asarray(y_values, dtype=float)
+    x_grid, y_grid = np.meshgrid(x_values, y_values)
+
+    columns = {key: float(inputs[key]) for key in MODEL_INPUT_KEYS}
+    columns[x_key] = x_grid.ravel()
+    columns[y_key] = y_grid.ravel()
+    n_cases = x_grid.size
+    columns = {key: np.broadcast_to(np.asarray(value, dtype=float), (n_cases,)) for key, value in columns.items()}
+    columns.update({key: inputs[key] for key in YEARLY_SCHEDULE_KEYS})
+    results = evaluate_configurations(columns, {scenario_name: scenarios[scenario_name]}, rates_of_return=False)
+
+    return {
+        'scenario': scenario_name,
+        'x_key': x_key,
+        'y_key': y_key,
+        'x_values': x_values,
+        'y_values': y_values,
+        **{metric: results[metric][:, 0].reshape(x_grid.shape) for metric in ('npv', 'roi', 'payback_months')}
+    }
+
+def run_parameter_sweep_cached(input_values, x_key, x_values, y_key, y_values, scenario_name='Expected',
+                               scenarios=None, cache=SWEEP_CACHE):
+    """run_parameter_sweep served from an LRU cache keyed on the base model and the grid definition
+
+    Cached results are shared between callers and must be treated as read-only.
+    """
+    key = fingerprint({
+        'model': model_fingerprint(input_values, scenarios),
+        'scenario': scenario_name,
+        'x': [x_key, list(np.asarray(x_values, dtype=float))],
+        'y': [y_key, list(np.asarray(y_values, dtype=float))]
+    })
+    return cache.get_or_compute(key, lambda: run_parameter_sweep(
+        input_values, x_key, x_values, y_key, y_values, scenario_name, scenarios))
@@ -0,0 +1,303 @@
+# Local HTTP scoring service: scenario metrics and executive PDFs for exported configurations
+#
+# Usage: python bva_service.py [--host 127.0.0.1] [--port 8765] [--pdf-workers N] [--max-batch N] [--max-wait-ms MS]
+#
+# Endpoints (request bodies use the export_to_json schema, or a bare configuration object):
+#   POST /score             scenario NPV/ROI/IRR/payback and cash flows as JSON (a JSON array scores many)
+#   POST /report?organization=NAME    executive report PDF
+#   GET  /health            liveness and model version
+#   GET  /metrics           latency percentiles per endpoint, micro-batch sizes and model cache statistics
+#
+# Concurrent /score requests are coalesced into micro-batches evaluated by run_assessments in one
+# vectorized pass; PDFs are rendered in a process pool whose workers import the report stack at startup.
+
+import argparse
+import json
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from bva_config import complete_input_values, parse_configuration_json, validated_input_values
+from bva_engine import (ASSESSMENT_CACHE, DEFAULT_SCENARIOS, MODEL_VERSION, model_fingerprint, run_assessments,
+                        summarize_assessment)
+from bva_report import REPORT_DEPENDENCIES_AVAILABLE, render_report_pdf
+
+# Largest request body accepted (a configuration is a few KB)
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+LATENCY_PERCENTILES = (50, 90, 95, 99)
+
+class MicroBatcher:
+    """Coalesces concurrent scoring requests into batches evaluated together by run_assessments
+
+    A batch is closed when it holds max_batch_size requests or max_wait_seconds after its first
+    request arrived. Results are shared with the process-wide assessment cache.
+    """
+
+    def __init__(self, max_batch_size=256, max_wait_seconds=0.002, scenarios=None, cache=ASSESSMENT_CACHE):
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_seconds
+        self.scenarios = DEFAULT_SCENARIOS if scenarios is None else scenarios
+        self.cache = cache
+        self.batch_sizes = deque(maxlen=10_000)
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="bva-micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, input_values):
+        """Queue a configuration for scoring; returns a Future of its assessment"""
+        future = Future()
+        self._queue.put((input_values, future))
+        return future
+
+    def close(self):
+        """Stop the batching thread after the queued requests are scored"""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait_seconds
+        while batch[-1] is not None and len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            requests = [request for request in batch if request is not None]
+            if requests:
+                self._evaluate(requests)
+            if len(requests) < len(batch):
+                return
+
+    def _evaluate(self, requests):
+        self.batch_sizes.append(len(requests))
+        pending = []
+        for input_values, future in requests:
+            key = model_fingerprint(input_values, self.scenarios)
+            assessment = self.cache.get(key)
+            if assessment is None:
+                pending.append((key, input_values, future))
+            else:
+                future.set_result(dict(assessment, inputs=complete_input_values(input_values)))
+        if not pending:
+            return
+
+        try:
+            assessments = run_assessments([input_values for _, input_values, _ in pending], self.scenarios)
+        except Exception as e:
+            for _, _, future in pending:
+                future.set_exception(e)
+            return
+        for (key, _, future), assessment in zip(pending, assessments):
+            self.cache.put(key, assessment)
+            future.set_result(assessment)
+
+class LatencyTracker:
+    """Recent request latencies per endpoint (bounded) and their percentiles"""
+
+    def __init__(self, max_samples=10_000):
+        self.max_samples = max_samples
+        self._samples = {}
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, seconds):
+        with self._lock:
+            self._samples.setdefault(endpoint, deque(maxlen=self.max_samples)).append(seconds)
+            self._counts[endpoint] = self._counts.get(endpoint, 0) + 1
+
+    def summary(self):
+        """Request count and latency percentiles (ms) over the recent samples of each endpoint"""
+        with self._lock:
+            samples = {endpoint: np.array(values) * 1000 for endpoint, values in self._samples.items()}
+            counts = dict(self._counts)
+        return {
+            endpoint: {
+                'requests': counts[endpoint],
+                **{f"p{p}_ms": float(np.percentile(values, p)) for p in LATENCY_PERCENTILES},
+                'max_ms': float(values.max())
+            }
+            for endpoint, values in samples.items()
+        }
+
+def _warm_report_worker():
+    """Process pool initializer: import the report stack once per worker instead of per request"""
+    import reportlab.graphics.charts.barcharts as _barcharts
+    import reportlab.platypus as _platypus
+    return _platypus, _barcharts
+
+def _worker_ready():
+    return True
+
+class ScoringService:
+    """Shared state of the HTTP service: the micro-batcher, the PDF process pool and latency statistics"""
+
+    def __init__(self, pdf_workers=2, max_batch_size=256, max_wait_seconds=0.002, request_timeout=60):
+        self.latencies = LatencyTracker()
+        self.request_timeout = request_timeout
+        self.pdf_pool = None
+        if REPORT_DEPENDENCIES_AVAILABLE and pdf_workers > 0:
+            self.pdf_pool = ProcessPoolExecutor(max_workers=pdf_workers, initializer=_warm_report_worker)
+            # Start every worker now (before the batching thread exists) so the first PDF request
+            # does not pay for process start and imports
+            wait([self.pdf_pool.submit(_worker_ready) for _ in range(pdf_workers)])
+        self.batcher = MicroBatcher(max_batch_size, max_wait_seconds)
+
+    def score(self, configurations):
+        """Scenario summaries for a list of configuration objects, scored in the shared micro-batches"""
+        futures = [self.batcher.submit(validated_input_values(configuration)) for configuration in configurations]
+        return [summarize_assessment(future.result(self.request_timeout)) for future in futures]
+
+    def report(self, configuration, organization_name):
+        """Executive report PDF bytes rendered in the warm process pool"""
+        if self.pdf_pool is None:
+            raise RuntimeError("PDF rendering needs reportlab (pip install reportlab)")
+        inputs = validated_input_values(configuration)
+        return self.pdf_pool.submit(render_report_pdf, inputs, organization_name).result(self.request_timeout)
+
+    def metrics(self):
+        batch_sizes = np.array(self.batcher.batch_sizes) if self.batcher.batch_sizes else np.zeros(1)
+        return {
+            'latency': self.latencies.summary(),
+            'batches': {
+                'recent': len(self.batcher.batch_sizes),
+                'mean_size': float(batch_sizes.mean()),
+                'max_size': int(batch_sizes.max())
+            },
+            'model_cache': ASSESSMENT_CACHE.stats()
+        }
+
+    def close(self):
+        self.batcher.close()
+        if self.pdf_pool is not None:
+            self.pdf_pool.shutdown()
+
+class ScoringRequestHandler(BaseHTTPRequestHandler):
+    """Routes requests to the server's ScoringService and records their latency"""
+
+    server_version = "BVAScoringService/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def _send(self, status, body, content_type="application/json"):
+        if content_type == "application/json":
+            body = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        """The request body as text; a body that is not read closes the connection after the response"""
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if "Transfer-Encoding" in self.headers or length < 0 or length > MAX_BODY_BYTES:
+            self.close_connection = True
+            if length > MAX_BODY_BYTES:
+                raise ValueError(f"Request body larger than {MAX_BODY_BYTES} bytes")
+            raise ValueError("Request body needs a valid Content-Length")
+        return self.rfile.read(length).decode('utf-8')
+
+    def _handle(self, endpoint, handler):
+        started = time.perf_counter()
+        try:
+            status, body, content_type = handler()
+        except (ValueError, UnicodeDecodeError) as e:
+            status, body, content_type = 400, {'error': str(e)}, "application/json"
+        except Exception as e:
+            status, body, content_type = 500, {'error': f"{type(e).__name__}: {e}"}, "application/json"
+        self._send(status, body, content_type)
+        self.server.service.latencies.record(endpoint, time.perf_counter() - started)
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == "/health":
+            self._handle(path, lambda: (200, {'status': 'ok', 'model_version': MODEL_VERSION}, "application/json"))
+        elif path == "/metrics":
+            self._handle(path, lambda: (200, self.server.service.metrics(), "application/json"))
+        else:
+            self._send(404, {'error': f"Unknown endpoint {path}"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path == "/score":
+            self._handle(url.path, self._score)
+        elif url.path == "/report":
+            organization_name = parse_qs(url.query).get('organization', ["Your Organization"])[0]
+            self._handle(url.path, lambda: self._report(organization_name))
+        else:
+            self.close_connection = True  # The body is not read
+            self._send(404, {'error': f"Unknown endpoint {url.path}"})
+
+    def _score(self):
+        content = self._read_json()
+        data = json.loads(content)
+        if isinstance(data, list):
+            configurations = [parse_configuration_json(json.dumps(item)) for item in data]
+            return 200, self.server.service.score(configurations), "application/json"
+        return 200, self.server.service.score([parse_configuration_json(content)])[0], "application/json"
+
+    def _report(self, organization_name):
+        configuration = parse_configuration_json(self._read_json())
+        return 200, self.server.service.report(configuration, organization_name), "application/pdf"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+class ScoringHTTPServer(ThreadingHTTPServer):
+    """Threaded HTTP server with a listen backlog sized for bursts of concurrent scoring requests"""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+def make_server(host="127.0.0.1", port=8765, service=None, verbose=False):
+    """Threaded HTTP server bound to host:port serving the given (or a new) ScoringService"""
+    server = ScoringHTTPServer((host, port), ScoringRequestHandler)
+    server.service = service or ScoringService()
+    server.verbose = verbose
+    return server
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve BVA scenario metrics and executive PDFs over local HTTP")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: localhost only)")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    parser.add_argument("--pdf-workers", type=int, default=2, help="Warm worker processes for PDF rendering (0 disables /report)")
+    parser.add_argument("--max-batch", type=int, default=256, help="Largest micro-batch of scoring requests")
+    parser.add_argument("--max-wait-ms", type=float, default=2.0, help="How long a micro-batch waits for more requests")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args(argv)
+
+    service = ScoringService(args.pdf_workers, args.max_batch, args.max_wait_ms / 1000)
+    server = make_server(args.host, args.port, service, args.verbose)
+    print(f"BVA scoring service on http://{args.host}:{server.server_port} (model version {MODEL_VERSION})", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+# Monte Carlo simulation of NPV, ROI and payback over uncertain model inputs
+
+import math
+
+import numpy as np
+
+from bva_config import INPUT_BOUNDS, MODEL_INPUT_KEYS, complete_input_values
+from bva_engine import calculate_yearly_benefits, evaluate_cash_flows, get_scenario_impl_delay
+
+DISTRIBUTIONS = ["triangular", "uniform", "normal", "lognormal"]
+
+# Inputs that can be given a distribution (evaluation_years fixes the month grid and the
+# discounting convention is a switch, so both stay fixed)
+SIMULATION_INPUTS = [key for key in MODEL_INPUT_KEYS if key not in ('evaluation_years', 'mid_period_discounting')]
+
+SIMULATION_PERCENTILES = [5, 10, 25, 50, 75, 90, 95]
+
+# z-score width of a central 95% interval (low/high ranges for normal and lognormal)
+_Z_95_WIDTH = 2 * 1.959964
+
+def distribution_from_range(distribution, low, high, mode=None):
+    """Build a distribution spec from a low/high range (a 95% interval for normal and lognormal)"""
+    if high < low:
+        raise ValueError(f"High value ({high}) is below low value ({low})")
+
+    if distribution == "triangular":
+        mode = (low + high) / 2 if mode is None else min(max(mode, low), high)
+        return {'distribution': 'triangular', 'low': low, 'mode': mode, 'high': high}
+    if distribution == "uniform":
+        return {'distribution': 'uniform', 'low': low, 'high': high}
+    if distribution == "normal":
+        return {'distribution': 'normal', 'mean': (low + high) / 2, 'std': (high - low) / _Z_95_WIDTH}
+    if distribution == "lognormal":
+        if low <= 0:
+            raise ValueError("Lognormal ranges must be positive")
+        return {
+            'distribution': 'lognormal',
+            'mu': (math.log(low) + math.log(high)) / 2,
+            'sigma': (math.log(high) - math.log(low)) / _Z_95_WIDTH
+        }
+    raise ValueError(f"Unknown distribution: {distribution}")
+
+def sample_distribution(spec, n_draws, rng):
+    """Draw n_draws values from a distribution spec"""
+    distribution = spec['distribution']
+    if distribution == "triangular":
+        if spec['low'] == spec['high']:
+            return np.full(n_draws, float(spec['low']))
+        return rng.triangular(spec['low'], spec['mode'], spec['high'], n_draws)
+    if distribution == "uniform":
+        return rng.uniform(spec['low'], spec['high'], n_draws)
+    if distribution == "normal":
+        return rng.normal(spec['mean'], spec['std'], n_draws)
+    if distribution == "lognormal":
+        return rng.lognormal(spec['mu'], spec['sigma'], n_draws)
+    raise ValueError(f"Unknown distribution: {distribution}")
+
+def run_simulation(input_values, distributions, n_draws=100_000, seed=None, chunk_size=20_000):
+    """Run the cost and cash-flow model over n_draws sampled input sets
+
+    distributions maps input keys to specs from distribution_from_range; all other inputs
+    keep their configured value. Draws are clipped to the sidebar bounds (money and volume
+    inputs to >= 0) and evaluated in vectorized chunks to keep memory bounded. Sampled
+    year 1 values grow at the configured rates unless a per-year schedule replaces them.
+    """
+    inputs = complete_input_values(input_values)
+    rng = np.random.default_rng(seed)
+    evaluation_years = inputs['evaluation_years']
+
+    npv = np.empty(n_draws)
+    roi = np.empty(n_draws)
+    payback_months = np.empty(n_draws)
+
+    for start in range(0, n_draws, chunk_size):
+        size = min(chunk_size, n_draws - start)
+        draws = dict(inputs)
+        for key, spec in distributions.items():
+            low, high = INPUT_BOUNDS.get(key, (0, None))
+            draws[key] = np.clip(sample_distribution(spec, size, rng), low, high)
+
+        benefits, yearly_inputs = calculate_yearly_benefits(draws, evaluation_years)
+        grid = evaluate_cash_flows(
+            benefits['total_annual_benefits'], yearly_inputs['platform_cost'], draws['services_cost'],
+            get_scenario_impl_delay(draws['implementation_delay'], 1.0), np.trunc(draws['benefits_ramp_up']),
+            evaluation_years, np.asarray(draws['discount_rate'], dtype=float) / 100,
+            draws['mid_period_discounting'], yearly_values=True
+        )
+        npv[start:start + size] = grid['npv']
+        roi[start:start + size] = grid['roi']
+        payback_months[start:start + size] = grid['payback_months']
+
+    return {
+        'npv': npv,
+        'roi': roi,
+        'payback_months': payback_months,
+        'evaluation_years': evaluation_years
+    }
+
+def _percentiles(values, percentiles):
+    """Map each requested percentile to its value"""
+    return {p: float(v) for p, v in zip(percentiles, np.percentile(values, percentiles))}
+
+def summarize_simulation(simulation, percentiles=SIMULATION_PERCENTILES):
+    """Percentiles and probabilities for a run_simulation result"""
+    npv = simulation['npv']
+    roi = simulation['roi']
+    payback_months = simulation['payback_months']
+    paid_back = np.isfinite(payback_months)
+    horizon_months = simulation['evaluation_years'] * 12
+
+    return {
+        'n_draws': len(npv),
+        'npv_mean': float(npv.mean()),
+        'roi_mean': float(roi.mean()),
+        'npv_percentiles': _percentiles(npv, percentiles),
+        'roi_percentiles': _percentiles(roi, percentiles),
+        'payback_months_percentiles': (
+            _percentiles(payback_months[paid_back], percentiles) if paid_back.any() else {}
+        ),
+        'probability_positive_npv': float((npv > 0).mean()),
+        'probability_payback_within_horizon': float((payback_months <= horizon_months).mean())
+    }
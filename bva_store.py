@@ -0,0 +1,230 @@
+# Local assessment store: named configurations and their computed results in SQLite
+
+import json
+import os
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+
+from bva_config import validated_input_values
+from bva_engine import ASSESSMENT_CACHE, MODEL_VERSION, model_fingerprint, run_assessment_cached
+
+# Set BVA_STORE_PATH to keep the store elsewhere. Keep it on a local disk: SQLite's file locking is not
+# reliable on network drives
+DEFAULT_STORE_PATH = os.environ.get("BVA_STORE_PATH") or os.path.join(
+    os.path.expanduser("~"), ".bva", "assessments.sqlite3"
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS assessments (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    customer TEXT NOT NULL,
+    industry_template TEXT NOT NULL,
+    currency TEXT NOT NULL,
+    solution_name TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    expected_npv REAL,
+    model_version TEXT NOT NULL,
+    model_fingerprint TEXT NOT NULL,
+    configuration TEXT NOT NULL,
+    results BLOB NOT NULL,
+    UNIQUE (customer, name)
+);
+CREATE INDEX IF NOT EXISTS assessments_customer ON assessments (customer);
+CREATE INDEX IF NOT EXISTS assessments_industry_template ON assessments (industry_template);
+CREATE INDEX IF NOT EXISTS assessments_currency ON assessments (currency);
+CREATE INDEX IF NOT EXISTS assessments_updated_at ON assessments (updated_at);
+CREATE INDEX IF NOT EXISTS assessments_expected_npv ON assessments (expected_npv);
+"""
+
+# Columns returned by list_assessments (the configuration and results are only read on load)
+SUMMARY_COLUMNS = ['id', 'name', 'customer', 'industry_template', 'currency', 'solution_name',
+                   'created_at', 'updated_at', 'expected_npv', 'model_version']
+
+SORT_ORDERS = {
+    'updated_at': 'updated_at DESC',
+    'expected_npv': 'expected_npv DESC',
+    'customer': 'customer, name',
+    'name': 'name, customer'
+}
+
+def _encode_results(value):
+    """JSON-safe copy of an assessment: numpy arrays become tagged lists, numpy scalars plain numbers"""
+    if isinstance(value, dict):
+        return {key: _encode_results(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode_results(item) for item in value]
+    if isinstance(value, np.ndarray):
+        return {'__ndarray__': value.tolist(), 'dtype': value.dtype.str}
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+def _decode_array(obj):
+    if '__ndarray__' not in obj:
+        return obj
+    dtype = np.dtype(obj['dtype'])
+    if dtype.kind not in 'biuf':
+        raise ValueError(f"Unexpected array type {obj['dtype']} in stored results")
+    return np.array(obj['__ndarray__'], dtype=dtype)
+
+def _dump_results(assessment):
+    return json.dumps(_encode_results(assessment))
+
+def _load_results(text):
+    """A stored assessment, or None when the stored results cannot be read (e.g. written by an older version)"""
+    try:
+        return json.loads(text, object_hook=_decode_array)
+    except (ValueError, TypeError, KeyError):
+        return None
+
+def _expected_npv(assessment):
+    result = assessment['scenario_results'].get('Expected')
+    return float(result['npv']) if result is not None else None
+
+class AssessmentStore:
+    """Saved assessments in a local SQLite file: inputs, scenario results and indexed summary columns
+
+    Results are stored with the model fingerprint they were computed under (model version,
+    inputs and scenarios), so loading reuses them until the model changes. The store opens a
+    short-lived connection per call, so it can be shared between Streamlit sessions and threads.
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connection() as connection:
+            connection.execute("PRAGMA journal_mode=DELETE")  # Also converts stores created in WAL mode
+            connection.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connection(self):
+        connection = sqlite3.connect(self.path, timeout=10)
+        connection.row_factory = sqlite3.Row
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def save(self, name, customer, input_values, scenarios=None, assessment=None):
+        """Save (or overwrite) the assessment called name for customer; returns its id
+
+        The assessment is computed (or taken from the model cache) when not given.
+        """
+        name, customer = name.strip(), customer.strip()
+        if not name or not customer:
+            raise ValueError("An assessment needs a name and a customer")
+        inputs = validated_input_values(input_values)
+        if assessment is None:
+            assessment = run_assessment_cached(inputs, scenarios)
+        now = datetime.now().isoformat(timespec='seconds')
+        row = {
+            'name': name,
+            'customer': customer,
+            'industry_template': inputs['industry_template'],
+            'currency': inputs['currency'],
+            'solution_name': inputs['solution_name'],
+            'created_at': now,
+            'updated_at': now,
+            'expected_npv': _expected_npv(assessment),
+            'model_version': MODEL_VERSION,
+            'model_fingerprint': model_fingerprint(inputs, scenarios),
+            'configuration': json.dumps(inputs),
+            'results': _dump_results(assessment)
+        }
+        with self._connection() as connection:
+            connection.execute(
+                f"INSERT INTO assessments ({', '.join(row)}) VALUES ({', '.join(':' + key for key in row)}) "
+                "ON CONFLICT (customer, name) DO UPDATE SET "
+                + ", ".join(f"{key} = excluded.{key}" for key in row if key not in ('name', 'customer', 'created_at')),
+                row
+            )
+            return connection.execute(
+                "SELECT id FROM assessments WHERE customer = ? AND name = ?", (customer, name)
+            ).fetchone()['id']
+
+    def list_assessments(self, customer=None, industry_template=None, currency=None, since=None, until=None,
+                         min_expected_npv=None, search=None, order_by='updated_at', limit=500):
+        """Summary rows of the saved assessments matching every given filter
+
+        since/until bound the last update date (ISO date strings); search matches the name or
+        customer. Filters and sort orders use the indexed summary columns.
+        """
+        conditions, parameters = [], []
+        for column, value in (('customer', customer), ('industry_template', industry_template), ('currency', currency)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                parameters.append(value)
+        if since is not None:
+            conditions.append("updated_at >= ?")
+            parameters.append(str(since))
+        if until is not None:
+            conditions.append("updated_at < ?")
+            parameters.append(f"{until}T99")  # Includes the whole until day
+        if min_expected_npv is not None:
+            conditions.append("expected_npv >= ?")
+            parameters.append(float(min_expected_npv))
+        if search:
+            conditions.append("(name LIKE ? OR customer LIKE ?)")
+            parameters.extend([f"%{search}%"] * 2)
+
+        query = f"SELECT {', '.join(SUMMARY_COLUMNS)} FROM assessments"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += f" ORDER BY {SORT_ORDERS[order_by]} LIMIT ?"
+        with self._connection() as connection:
+            return [dict(row) for row in connection.execute(query, parameters + [int(limit)])]
+
+    def distinct_values(self, column):
+        """Sorted distinct values of an indexed summary column (for filter choices)"""
+        if column not in ('customer', 'industry_template', 'currency'):
+            raise ValueError(f"Cannot list values of {column}")
+        with self._connection() as connection:
+            return [row[0] for row in connection.execute(f"SELECT DISTINCT {column} FROM assessments ORDER BY {column}")]
+
+    def load(self, assessment_id, scenarios=None, cache=ASSESSMENT_CACHE):
+        """A saved assessment's summary columns, 'inputs' and 'assessment' (plus 'recomputed')
+
+        Stored results are reused while the model fingerprint is unchanged and they can be
+        read; otherwise the assessment is recomputed and saved back. Either way it is put in the model cache, so
+        the app shows the reopened inputs without recomputing.
+        """
+        with self._connection() as connection:
+            row = connection.execute("SELECT * FROM assessments WHERE id = ?", (assessment_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"No saved assessment with id {assessment_id}")
+
+        inputs = json.loads(row['configuration'])
+        key = model_fingerprint(inputs, scenarios)
+        assessment = _load_results(row['results']) if row['model_fingerprint'] == key else None
+        recomputed = assessment is None
+        if recomputed:
+            assessment = run_assessment_cached(inputs, scenarios, cache)
+            with self._connection() as connection:
+                connection.execute(
+                    "UPDATE assessments SET expected_npv = ?, model_version = ?, model_fingerprint = ?, results = ? "
+                    "WHERE id = ?",
+                    (_expected_npv(assessment), MODEL_VERSION, key,
+                     _dump_results(assessment), assessment_id)
+                )
+        else:
+            cache.put(key, assessment)
+
+        summary = {column: row[column] for column in SUMMARY_COLUMNS}
+        if recomputed:
+            summary.update(expected_npv=_expected_npv(assessment), model_version=MODEL_VERSION)
+        return dict(summary, inputs=inputs, assessment=assessment, recomputed=recomputed)
+
+    def delete(self, assessment_id):
+        with self._connection() as connection:
+            connection.execute("DELETE FROM assessments WHERE id = ?", (assessment_id,))
+
+    def count(self):
+        with self._connection() as connection:
+            return connection.execute("SELECT COUNT(*) FROM assessments").fetchone()[0]
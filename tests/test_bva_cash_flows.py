@@ -0,0 +1,71 @@
+# Regression checks of the monthly cash-flow series and the solvers that read it
+
+import numpy as np
+
+from bva_config import INDUSTRY_TEMPLATES
+from bva_engine import calculate_payback_months, run_assessment
+from bva_goalseek import solve_break_even
+
+RETAIL = dict(INDUSTRY_TEMPLATES['Retail'], industry_template='Retail', alert_ftes=10, incident_ftes=8,
+              avg_major_incident_cost=20000, avg_mttr_hours=4.0, platform_cost=250000, services_cost=150000,
+              discount_rate=10, evaluation_years=3, implementation_delay=6, benefits_ramp_up=3)
+
+def expected_result(**changes):
+    return run_assessment(dict(RETAIL, **changes))['scenario_results']['Expected']
+
+def present_value(flows, rate, mid_period=0):
+    months = np.maximum(np.arange(len(flows)) - 0.5 * mid_period, 0.0)
+    return float(np.sum(flows * (1 + rate) ** (-months / 12)))
+
+def test_retail_npv_and_payback_are_pinned():
+    month_end = expected_result(mid_period_discounting=0)
+    mid_month = expected_result(mid_period_discounting=1)
+    assert np.isclose(month_end['npv'], 7703349.283048342, rtol=1e-9)
+    assert np.isclose(mid_month['npv'], 7734598.964420785, rtol=1e-9)
+    assert np.isclose(month_end['payback_months'], 7.849970648254271, rtol=1e-9)
+    assert mid_month['payback_months'] == month_end['payback_months']
+
+def test_npv_discounts_the_monthly_series():
+    for mid_period in (0, 1):
+        result = expected_result(mid_period_discounting=mid_period)
+        assert np.isclose(result['npv'], present_value(result['monthly_net_cash_flow'], 0.10, mid_period), rtol=1e-12)
+
+def test_yearly_rollups_sum_to_the_monthly_series():
+    result = expected_result(mid_period_discounting=1)
+    monthly = result['monthly_net_cash_flow']
+    yearly = result['cash_flows']
+    assert len(yearly) == 3 and len(monthly) == 37
+    assert np.isclose(sum(year['net_cash_flow'] for year in yearly), monthly.sum(), rtol=1e-12)
+    assert np.isclose(yearly[0]['net_cash_flow'], monthly[:13].sum(), rtol=1e-12)
+    assert np.isclose(sum(year['present_value'] for year in yearly), result['npv'], rtol=1e-12)
+    for year in yearly:
+        assert np.isclose(year['benefits'] - year['platform_cost'] - year['services_cost'], year['net_cash_flow'])
+    assert np.allclose(np.cumsum(monthly), result['monthly_cumulative_cash_flow'])
+
+def test_payback_matches_calculate_payback_months():
+    for delay, ramp in ((0, 0), (6, 3), (12, 12)):
+        result = expected_result(implementation_delay=delay, benefits_ramp_up=ramp)
+        payback = calculate_payback_months(result['annual_benefits'], RETAIL['platform_cost'], RETAIL['services_cost'],
+                                           delay, ramp)
+        assert np.isclose(result['payback_months'], payback, rtol=1e-12)
+        # The cumulative series crosses zero in the month payback falls in
+        cumulative = result['monthly_cumulative_cash_flow']
+        month = int(np.ceil(payback))
+        assert cumulative[month - 1] < 0 <= cumulative[month]
+
+def test_irr_is_a_root_of_the_series():
+    for mid_period in (0, 1):
+        result = expected_result(mid_period_discounting=mid_period, services_cost=4_000_000)
+        assert np.isfinite(result['irr'])
+        flows = result['monthly_net_cash_flow']
+        assert abs(present_value(flows, result['irr'], mid_period)) < 1e-6 * np.abs(flows).sum()
+
+def test_goal_seek_reaches_the_target():
+    solved = solve_break_even(RETAIL, 'platform_cost', 'npv', 0, 'Conservative')
+    assert solved['status'] == 'solved'
+    npv = run_assessment(dict(RETAIL, platform_cost=solved['value']))['scenario_results']['Conservative']['npv']
+    assert abs(npv) < 1e-3 * solved['value']
+
+    solved = solve_break_even(RETAIL, 'services_cost', 'payback_months', 12)
+    assert solved['status'] == 'solved'
+    assert np.isclose(expected_result(services_cost=solved['value'])['payback_months'], 12, atol=1e-6)
@@ -0,0 +1,17 @@
+# Regression checks of the financial model
+
+import numpy as np
+
+from bva_engine import run_assessment, solve_irr
+
+def test_irr_needs_an_outflow_and_an_inflow():
+    flows = np.array([[0.0, 0.0, 0.0], [100.0, 100.0, 100.0], [-100.0, -100.0, -100.0], [-100.0, 0.0, 121.0]])
+    irr = solve_irr(flows, np.array([0.0, 1.0, 2.0]))
+    assert np.isnan(irr[:3]).all()
+    assert np.isclose(irr[3], 0.1)
+
+def test_all_zero_assessment_has_no_irr():
+    assessment = run_assessment({'alert_volume': 0, 'incident_volume': 0, 'major_incident_volume': 0,
+                                 'platform_cost': 0, 'services_cost': 0})
+    for result in assessment['scenario_results'].values():
+        assert np.isnan(result['irr'])